@@ -0,0 +1,330 @@
+# backend\app\cache.py
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from cachetools import TTLCache
+
+
+def make_cache_key(*parts: str) -> str:
+    """Content-addressed key: a SHA-256 over the given parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+# --- Cache Backends ---
+
+class CacheBackend(ABC):
+    """Interface shared by every cache tier. Values must be JSON-serializable.
+
+    `get`/`set` may block on I/O; async callers use `aget`/`aset`, which tiers backed by disk run on a
+    worker thread so the event loop never waits on them.
+    """
+
+    name = "cache"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        ...
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any) -> None:
+        self.set(key, value)
+
+    def _record(self, value: Optional[Any]) -> Optional[Any]:
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache with a size bound and per-entry TTL."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        super().__init__()
+        self._store = TTLCache(maxsize=max_entries, ttl=ttl_seconds)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return self._record(self._store.get(key))
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._store[key] = value
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "entries": len(self._store)}
+
+
+class SQLiteCache(CacheBackend):
+    """On-disk cache that survives restarts; expired and overflow rows are pruned on write.
+
+    A hit refreshes the row's LRU access time only when it is older than `touch_interval_seconds`,
+    so repeated reads of a hot key don't each cost a write and a commit.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: float, touch_interval_seconds: float = 300):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.touch_interval_seconds = touch_interval_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at, accessed_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] < now:
+                return self._record(None)
+            if now - row[2] >= self.touch_interval_seconds:
+                self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+        return self._record(json.loads(row[0]))
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any) -> None:
+        await asyncio.to_thread(self.set, key, value)
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + self.ttl_seconds, now),
+            )
+            self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+            # Least-recently-used rows go first once the table outgrows its bound.
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return {**super().stats(), "entries": entries}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TieredCache(CacheBackend):
+    """Checks each tier in order and promotes hits from slower tiers into the faster ones."""
+
+    name = "tiered"
+
+    def __init__(self, tiers: List[CacheBackend]):
+        super().__init__()
+        self.tiers = tiers
+
+    def get(self, key: str) -> Optional[Any]:
+        for index, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for faster in self.tiers[:index]:
+                    faster.set(key, value)
+                return self._record(value)
+        return self._record(None)
+
+    def set(self, key: str, value: Any) -> None:
+        for tier in self.tiers:
+            tier.set(key, value)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        for index, tier in enumerate(self.tiers):
+            value = await tier.aget(key)
+            if value is not None:
+                for faster in self.tiers[:index]:
+                    await faster.aset(key, value)
+                return self._record(value)
+        return self._record(None)
+
+    async def aset(self, key: str, value: Any) -> None:
+        for tier in self.tiers:
+            await tier.aset(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "tiers": [tier.stats() for tier in self.tiers]}
+
+    def close(self) -> None:
+        for tier in self.tiers:
+            tier.close()
+
+
+def build_cache(backend: str, max_entries: int, ttl_seconds: float, db_path: Optional[str] = None) -> CacheBackend:
+    """Builds a cache from configuration: 'memory', 'sqlite' or 'tiered' (memory in front of sqlite)."""
+    if backend == "memory":
+        return MemoryCache(max_entries, ttl_seconds)
+    if not db_path:
+        raise ValueError(f"Cache backend '{backend}' requires a database path.")
+    if backend == "sqlite":
+        return SQLiteCache(db_path, max_entries, ttl_seconds)
+    if backend == "tiered":
+        return TieredCache([MemoryCache(max_entries, ttl_seconds), SQLiteCache(db_path, max_entries * 10, ttl_seconds)])
+    raise ValueError(f"Unknown cache backend: '{backend}'.")
+
+
+# --- Request Coalescing ---
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into a single in-flight computation.
+
+    By default a computation runs to completion even if every caller goes away (so its result can
+    still be cached); with `cancel_when_abandoned` it is cancelled once its last waiter is.
+    """
+
+    def __init__(self, cancel_when_abandoned: bool = False):
+        self.cancel_when_abandoned = cancel_when_abandoned
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._waiters: Dict[str, int] = {}
+        self.coalesced = 0
+        self.abandoned = 0
+
+    async def do(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(compute())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            # Shielded so one disconnected caller can't cancel the work the other waiters depend on.
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if self.cancel_when_abandoned and self._waiters[key] == 1 and not future.done():
+                self.abandoned += 1
+                future.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": len(self._inflight), "coalesced": self.coalesced, "abandoned": self.abandoned}
+
+
+async def get_or_compute(cache: CacheBackend, flights: SingleFlight, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """Returns the cached value for `key`, or runs `compute` once across concurrent callers and caches it."""
+    cached = await cache.aget(key)
+    if cached is not None:
+        return cached
+
+    async def compute_and_store():
+        value = await compute()
+        await cache.aset(key, value)
+        return value
+
+    return await flights.do(key, compute_and_store)
+
+
+# --- Stale-While-Revalidate ---
+
+class StaleWhileRevalidateCache:
+    """Async cache whose entries are fresh for `fresh_seconds`, then served stale for up to `stale_seconds`
+    more while a single background load refreshes them. Concurrent misses share one load, which
+    `cancel_abandoned_loads` cancels if every caller waiting on it is cancelled."""
+
+    def __init__(self, max_entries: int, fresh_seconds: float, stale_seconds: float, cancel_abandoned_loads: bool = False):
+        self.fresh_seconds = fresh_seconds
+        self._entries = TTLCache(maxsize=max_entries, ttl=fresh_seconds + stale_seconds)
+        self._flights = SingleFlight(cancel_when_abandoned=cancel_abandoned_loads)
+        self._refresh_tasks: set = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_errors = 0
+
+    async def get(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if time.monotonic() - stored_at < self.fresh_seconds:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._refresh_in_background(key, load)
+            return value
+        self.misses += 1
+        return await self._flights.do(key, lambda: self._load(key, load))
+
+    async def _load(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        value = await load()
+        self._entries[key] = (time.monotonic(), value)
+        return value
+
+    def _refresh_in_background(self, key: str, load: Callable[[], Awaitable[Any]]) -> None:
+        async def refresh():
+            try:
+                await self._flights.do(key, lambda: self._load(key, load))
+            except Exception as e:
+                self.refresh_errors += 1
+                print(f"Background cache refresh failed: {e}")
+
+        task = asyncio.ensure_future(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "backend": "stale-while-revalidate",
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "refresh_errors": self.refresh_errors,
+            "entries": len(self._entries),
+            **self._flights.stats(),
+        }
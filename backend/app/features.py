@@ -0,0 +1,239 @@
+# backend\app\features.py
+"""Deterministic custom features for the ATS model: keyword_score and experience_gap.
+
+The training pipeline (ml_model/3_feature_engineer.py) and the API compute these with the same
+functions, so the values the model sees at serve time match the ones it was trained on.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+# Skills a posting can ask for, written as they appear in text. Covers the UpdatedResumeDataSet.csv categories.
+# Names that are also everyday words or single letters ("c level", "go-getter", "rest of the team") are
+# not listed here; SKILL_ALIASES matches them only in unambiguous phrasings.
+SKILLS_VOCABULARY = [
+    # Languages
+    "python", "java", "javascript", "typescript", "c++", "c#", "golang", "rust", "scala", "kotlin",
+    "swift", "php", "ruby", "perl", "matlab", "bash", "shell scripting", "powershell", "vba", "cobol",
+    "abap", "solidity", "groovy",
+    # Web
+    "html", "html5", "css", "css3", "sass", "bootstrap", "jquery", "react", "angular", "vue", "node.js", "nodejs",
+    "django", "flask", "fastapi", "spring boot", "hibernate", "struts", "jsp", "servlets",
+    "asp.net", "mvc", ".net", "entity framework", "restful", "graphql", "soap", "web services",
+    "microservices", "wordpress", "photoshop", "illustrator", "coreldraw", "figma", "ui", "ux", "web design",
+    # Data and ML
+    "sql", "mysql", "postgresql", "oracle", "sql server", "mongodb", "cassandra", "redis", "sqlite", "pl/sql",
+    "nosql", "database design", "data modeling", "data warehousing", "etl", "informatica", "talend", "ssis",
+    "ssrs", "power bi", "tableau", "qlikview", "excel", "hadoop", "hdfs", "hive", "pig", "spark", "pyspark",
+    "kafka", "sqoop", "hbase", "mapreduce", "airflow", "pandas", "numpy", "scipy", "scikit-learn",
+    "tensorflow", "keras", "pytorch", "machine learning", "deep learning", "nlp", "natural language processing",
+    "computer vision", "statistics", "data analysis", "data visualization", "regression", "classification",
+    "clustering", "time series",
+    # Cloud and operations
+    "aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "jenkins", "ansible", "terraform",
+    "puppet", "git", "github", "gitlab", "bitbucket", "svn", "maven", "gradle", "ci/cd", "devops", "linux",
+    "unix", "windows server", "nagios", "splunk", "networking", "tcp/ip", "firewall", "vpn", "cyber security",
+    "network security", "penetration testing", "vulnerability assessment", "siem", "ccna",
+    # Testing
+    "selenium", "testng", "junit", "cucumber", "jmeter", "loadrunner", "qtp", "uft", "manual testing",
+    "automation testing", "regression testing", "functional testing", "api testing", "postman", "jira",
+    "bugzilla", "test cases", "sdlc", "stlc", "agile", "scrum", "kanban",
+    # Enterprise and blockchain
+    "sap", "sap hana", "sap fico", "sap mm", "sap sd", "salesforce", "erp", "crm", "blockchain", "ethereum",
+    "hyperledger", "smart contracts", "bitcoin",
+    # Engineering
+    "autocad", "solidworks", "catia", "ansys", "creo", "staad pro", "revit", "plc", "scada", "matlab simulink",
+    "cnc", "hvac", "six sigma", "lean manufacturing", "quality control", "project management", "pmp", "prince2",
+    "ms project", "primavera", "estimation", "site supervision",
+    # Business and people
+    "recruitment", "talent acquisition", "onboarding", "payroll", "employee engagement", "performance management",
+    "training", "sales", "business development", "lead generation", "negotiation", "marketing",
+    "digital marketing", "seo", "social media", "customer service", "accounting", "tally", "budgeting",
+    "forecasting", "supply chain", "logistics", "procurement", "inventory management", "operations management",
+    "vendor management", "stakeholder management", "requirement gathering", "business analysis", "uml",
+    "litigation", "legal drafting", "contract drafting", "nutrition", "fitness training", "yoga",
+]
+
+# Skill -> the phrasings that count as a mention of it. The skill's bare name only counts if it is listed too.
+SKILL_ALIASES = {
+    "c": ["c/c++", "c programming", "c language", "embedded c", "ansi c"],
+    "r": ["r programming", "r language", "rstudio", "r studio"],
+    "golang": ["go programming", "go language", "go lang"],
+    "restful": ["rest api", "rest apis", "rest services", "rest web services"],
+    "spring": ["spring framework", "spring mvc"],
+    "express": ["express.js", "expressjs"],
+    "chef": ["chef automation", "chef cookbooks", "chef infra"],
+}
+
+# Characters skill names are made of (c++, c#, node.js, asp.net, ci/cd, pl/sql); everything else separates
+# tokens. Translating bytes and splitting runs in C, several times faster than a tokenizing regex.
+_SKILL_CHARACTERS = set(b"abcdefghijklmnopqrstuvwxyz0123456789+#./")
+_SKILL_TOKEN_TABLE = bytes(code if code in _SKILL_CHARACTERS else 32 for code in range(256))
+_WORD_TOKEN_TABLE = _SKILL_TOKEN_TABLE.translate(bytes.maketrans(b"./", b"  "))
+
+
+def _skill_tokens(lowered: str) -> List[str]:
+    text = (lowered + " ").encode("ascii", "replace").translate(_SKILL_TOKEN_TABLE)
+    # Sentence punctuation: "python." and "java/" are the bare words
+    return text.replace(b". ", b"  ").replace(b"/ ", b"  ").decode("ascii").split()
+
+
+def _word_tokens(lowered: str) -> List[str]:
+    """Tokens with "." and "/" as separators too, so "end.python" or "java/j2ee" yield their parts."""
+    return lowered.encode("ascii", "replace").translate(_WORD_TOKEN_TABLE).decode("ascii").split()
+
+
+def _build_skill_index(skills: Iterable[str], aliases: Dict[str, List[str]]) -> Dict[str, int]:
+    """Surface form -> skill id; the phrasings of an aliased skill share its id."""
+    index: Dict[str, int] = {}
+    skill_ids: Dict[str, int] = {}
+    for skill in skills:
+        skill_ids.setdefault(skill, len(skill_ids))
+        index.setdefault(" ".join(_skill_tokens(skill.lower())), skill_ids[skill])
+    for skill, phrasings in aliases.items():
+        skill_ids.setdefault(skill, len(skill_ids))
+        for phrasing in phrasings:
+            index.setdefault(" ".join(_skill_tokens(phrasing.lower())), skill_ids[skill])
+    return index
+
+
+_SKILL_IDS = _build_skill_index(SKILLS_VOCABULARY, SKILL_ALIASES)
+SKILL_COUNT = len(set(_SKILL_IDS.values()))
+_SINGLE_WORD_SKILLS = {skill for skill in _SKILL_IDS if " " not in skill}
+# Multi-word skills with the words that must all be present before the phrase is worth looking for
+_PHRASE_SKILLS = [(skill, set(skill.split())) for skill in _SKILL_IDS if " " in skill]
+
+# Experience periods are found by their unit, then the number is read from the text just before it.
+# Ranges ("5-7 years") count their lower bound, "8+ years" counts 8. A period only counts when the
+# same clause calls it experience ("5 years of experience", "Experience: 3 years", the dataset's
+# "Exprience - 6 months"), and never as an age ("Age 25 years", "a 10 years old company").
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "eleven": 11, "twelve": 12, "fifteen": 15, "twenty": 20,
+}
+_EXPERIENCE_UNIT_PATTERN = re.compile(r"(?:year|yr|month)s?\b")
+_EXPERIENCE_NUMBER_PATTERN = re.compile(
+    r"\b(\d{1,3}(?:\.\d+)?|" + "|".join(_NUMBER_WORDS) + r")\s*\+?\s*"
+    r"(?:(?:-|–|to)\s*\d{1,3}(?:\.\d+)?\s*\+?\s*)?$"
+)
+_NUMBER_WINDOW = 32
+_CONTEXT_WINDOW = 48
+_EXPERIENCE_WORD_PATTERN = re.compile(r"\b(?:experience[ds]?|exprience|exp|duration)\b")
+_CLAUSE_BREAK_PATTERN = re.compile(r"\.\s|[;\n]")
+_AGE_BEFORE_PATTERN = re.compile(r"\bage[ds]?\b\W*$")
+_AGE_AFTER_PATTERN = re.compile(r"\W*old\b")
+# Anything beyond this is a company age or a date, not a career length
+MAX_EXPERIENCE_YEARS = 40
+DEFAULT_KEYWORD_SCORE = 50
+TEXT_FEATURE_CACHE_SIZE = 1024
+# Column order of compute_custom_features; the model bundle manifest records it (see app.model_bundle)
+CUSTOM_FEATURE_NAMES = ("keyword_score", "experience_gap")
+
+
+def extract_years_experience(text: str) -> int:
+    """Longest experience period the text mentions, in whole years; 0 when none is mentioned."""
+    if not isinstance(text, str):
+        return 0
+    lowered = text.lower()
+    best = 0.0
+    for unit in _EXPERIENCE_UNIT_PATTERN.finditer(lowered):
+        start = unit.start()
+        window_start = max(0, start - _NUMBER_WINDOW)
+        number = _EXPERIENCE_NUMBER_PATTERN.search(lowered[window_start:start])
+        if number is None:
+            continue
+        number_start = window_start + number.start()
+        before = _CLAUSE_BREAK_PATTERN.split(lowered[max(0, number_start - _CONTEXT_WINDOW):number_start])[-1]
+        after = _CLAUSE_BREAK_PATTERN.split(lowered[unit.end():unit.end() + _CONTEXT_WINDOW])[0]
+        if _AGE_BEFORE_PATTERN.search(before) or _AGE_AFTER_PATTERN.match(after):
+            continue
+        if not (_EXPERIENCE_WORD_PATTERN.search(before) or _EXPERIENCE_WORD_PATTERN.search(after)):
+            continue
+        value = float(_NUMBER_WORDS.get(number.group(1)) or number.group(1))
+        if unit.group().startswith("m"):
+            value /= 12
+        if best < value <= MAX_EXPERIENCE_YEARS:
+            best = value
+    return int(best)
+
+
+def extract_skill_ids(text: str) -> List[int]:
+    """Vocabulary ids of every skill mentioned in the text (sorted, unique)."""
+    if not isinstance(text, str):
+        return []
+    lowered = text.lower()
+    tokens = _skill_tokens(lowered)
+    present = set(tokens)
+    present.update(_word_tokens(lowered))
+    found = present & _SINGLE_WORD_SKILLS
+    joined = None
+    for phrase, words in _PHRASE_SKILLS:
+        if words <= present:
+            joined = joined or " " + " ".join(tokens) + " "
+            if " " + phrase + " " in joined:
+                found.add(phrase)
+    return sorted({_SKILL_IDS[skill] for skill in found})
+
+
+@lru_cache(maxsize=TEXT_FEATURE_CACHE_SIZE)
+def text_features(text: str) -> Tuple[int, Tuple[int, ...]]:
+    """(years of experience, skill ids) of one text. Memoized: a resume scored against many JDs is read once."""
+    return extract_years_experience(text), tuple(extract_skill_ids(text))
+
+
+def _skill_csr(rows: Sequence[Sequence[int]]) -> sp.csr_matrix:
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(row) for row in rows])
+    indices = np.fromiter((skill_id for row in rows for skill_id in row), dtype=np.int32, count=int(indptr[-1]))
+    return sp.csr_matrix((np.ones(len(indices), dtype=np.float32), indices, indptr), shape=(len(rows), SKILL_COUNT))
+
+
+def skill_matrix(texts: List[str]) -> sp.csr_matrix:
+    """Binary document-by-skill matrix, one row per text."""
+    return _skill_csr([text_features(text)[1] for text in texts])
+
+
+def _pair_keys(skills: sp.csr_matrix, rows: np.ndarray) -> np.ndarray:
+    """Nonzeros of `skills[rows]` encoded as pair * SKILL_COUNT + skill, gathered straight from the CSR arrays."""
+    counts = np.diff(skills.indptr)[rows]
+    pairs = np.repeat(np.arange(len(rows)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(skills.indptr[rows], counts)
+    return pairs * SKILL_COUNT + skills.indices[offsets]
+
+
+def keyword_scores(resume_skills: sp.csr_matrix, jd_skills: sp.csr_matrix, resume_rows: np.ndarray, jd_rows: np.ndarray) -> np.ndarray:
+    """Percentage of each pair's JD skills that its resume mentions.
+
+    Pair i matches row `resume_rows[i]` of `resume_skills` with row `jd_rows[i]` of `jd_skills`. The
+    overlap is the row-wise sparse product, computed without materializing the row-aligned matrices.
+    """
+    required = np.diff(jd_skills.indptr)[jd_rows]
+    common = np.intersect1d(_pair_keys(resume_skills, resume_rows), _pair_keys(jd_skills, jd_rows), assume_unique=True)
+    found = np.bincount(common // SKILL_COUNT, minlength=len(jd_rows))
+    scores = np.full(len(jd_rows), DEFAULT_KEYWORD_SCORE, dtype=np.int64)
+    has_skills = required > 0
+    scores[has_skills] = found[has_skills] * 100 // required[has_skills]
+    return scores
+
+
+def _unique_rows(texts: List[str]) -> Tuple[List[str], np.ndarray]:
+    positions: Dict[str, int] = {}
+    rows = np.fromiter((positions.setdefault(text, len(positions)) for text in texts), dtype=np.int64, count=len(texts))
+    return list(positions), rows
+
+
+def compute_custom_features(resume_texts: List[str], jd_texts: List[str]) -> np.ndarray:
+    """[keyword_score, experience_gap] for each resume/JD pair, as an (n, 2) float array.
+
+    Every distinct text is analyzed once, so a few JDs shared across many resumes cost almost nothing.
+    """
+    unique_resumes, resume_rows = _unique_rows(resume_texts)
+    unique_jds, jd_rows = _unique_rows(jd_texts)
+    resume_years, resume_skills = zip(*map(text_features, unique_resumes)) if resume_texts else ((), ())
+    jd_years, jd_skills = zip(*map(text_features, unique_jds)) if jd_texts else ((), ())
+    scores = keyword_scores(_skill_csr(resume_skills), _skill_csr(jd_skills), resume_rows, jd_rows)
+    gaps = np.array(resume_years, dtype=np.int64)[resume_rows] - np.array(jd_years, dtype=np.int64)[jd_rows]
+    return np.column_stack((scores, gaps)).astype(np.float64)
@@ -0,0 +1,93 @@
+# backend\app\http_client.py
+import asyncio
+import os
+import random
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.metrics import OUTBOUND_IN_FLIGHT, OUTBOUND_RETRIES
+
+# --- Outbound HTTP Configuration ---
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.environ.get("HTTP_MAX_CONNECTIONS_PER_HOST", "20"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+HTTP_TIMEOUT_SECONDS = float(os.environ.get("HTTP_TIMEOUT_SECONDS", "15"))
+HTTP_MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_SECONDS = float(os.environ.get("HTTP_BACKOFF_SECONDS", "0.25"))
+HTTP_MAX_BACKOFF_SECONDS = float(os.environ.get("HTTP_MAX_BACKOFF_SECONDS", "5"))
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class PooledHTTPClient:
+    """Shared async HTTP client: one keep-alive connection pool, per-host limits and retry with backoff."""
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_connections_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_connections: int = HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        timeout: float = HTTP_TIMEOUT_SECONDS,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff: float = HTTP_BACKOFF_SECONDS,
+        max_backoff: float = HTTP_MAX_BACKOFF_SECONDS,
+    ):
+        self.max_connections_per_host = max_connections_per_host
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = httpx.URL(url).host
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return self._host_semaphores[host]
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            # Exponential backoff with full jitter so synchronized clients don't retry in lockstep.
+            delay = random.uniform(0, self.backoff * (2 ** attempt))
+        # A server asking for `Retry-After: 3600` must not park the request (and its caller) for an hour
+        return min(delay, self.max_backoff)
+
+    async def _attempt(self, url: str, params: Optional[Dict[str, Any]], host: str) -> httpx.Response:
+        # The per-host slot is held only while a request is on the wire, never while backing off
+        async with self._host_semaphore(url):
+            with OUTBOUND_IN_FLIGHT.track_inprogress(host=host):
+                return await self.client.get(url, params=params)
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """GETs `url`, retrying transport errors and retryable status codes; raises httpx.HTTPError on failure."""
+        host = httpx.URL(url).host
+        for attempt in range(self.max_retries):
+            response: Optional[httpx.Response] = None
+            try:
+                response = await self._attempt(url, params, host)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    response.raise_for_status()
+                    return response
+            except httpx.TransportError:
+                pass
+            OUTBOUND_RETRIES.inc(host=host)
+            await asyncio.sleep(self._retry_delay(attempt, response))
+        response = await self._attempt(url, params, host)
+        response.raise_for_status()
+        return response
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,205 @@
+# backend\app\job_index.py
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from app.models import JobPosting, JobSearchFilters
+from app.ranking import JobRankingEngine, top_k_indices
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> Set[str]:
+    return set(TOKEN_PATTERN.findall(text.lower()))
+
+
+def area_key(location: Optional[str], distance_km: Optional[int]) -> Optional[str]:
+    """The geographic scope of a provider query (its location and radius), or None for a nationwide one."""
+    if not location or not location.strip():
+        return None
+    return f"{' '.join(location.lower().split())}|{distance_km or ''}"
+
+
+class IndexedJob:
+    """A stored posting plus the structured fields the provider gave us for filtering."""
+
+    __slots__ = ("posting", "row", "tokens", "areas", "salary_min", "salary_max", "contract_types", "ingested_at")
+
+    def __init__(self, posting: JobPosting, row: int, tokens: Set[str], metadata: Dict[str, Any], areas: Set[str]):
+        self.posting = posting
+        self.row = row
+        self.tokens = tokens
+        self.areas = areas  # area_key of every location search the provider returned this posting for
+        self.salary_min = metadata.get("salary_min")
+        self.salary_max = metadata.get("salary_max")
+        self.contract_types = {value.replace("_", "").lower() for value in metadata.get("contract_types", []) if value}
+        self.ingested_at = time.time()
+
+    def matches(self, area: Optional[str], filters: Optional[JobSearchFilters]) -> bool:
+        """Approximates the provider's filters using what it returned for this posting.
+
+        - location: the index has no coordinates, so a posting matches a location and radius only if the
+          provider returned it for a search with that same location and radius. Postings ingested from
+          nationwide searches never match a location search.
+        - salary: the posting's advertised range must reach `salary_min` and start at or below
+          `salary_max`. A posting without a salary fails `salary_min` and passes `salary_max`, which
+          may not be what the provider does with it.
+        """
+        if area is not None and area not in self.areas:
+            return False
+        if not filters:
+            return True
+        if filters.employment_type and filters.employment_type.replace("_", "").lower() not in self.contract_types:
+            return False
+        if filters.salary_min and (self.salary_max or self.salary_min or 0) < filters.salary_min:
+            return False
+        if filters.salary_max and (self.salary_min or self.salary_max or 0) > filters.salary_max:
+            return False
+        return True
+
+
+class JobIndex:
+    """In-memory job store fed incrementally from job providers.
+
+    Postings are deduplicated by `JobPosting.id`. A posting expires `ttl_seconds` after the provider
+    last returned it, so withdrawn listings age out even while the index is below `max_jobs`. The index keeps sparse TF-IDF rows (one per posting)
+    and an inverted index over title/company/description tokens, so keyword search, filtering and
+    ranking never leave the process. Each ingested batch is appended as a row block and merged with
+    the blocks before it only while they are no more than twice its size, so an ingest costs
+    amortized O(rows added x log(index size)) instead of a copy of the whole matrix. Rows of
+    replaced/evicted postings are dropped once they outnumber the live ones.
+
+    Ingest and search do CPU work (TF-IDF transforms, a sparse product over the candidates) and are
+    thread-safe; async callers run them off the event loop.
+    """
+
+    def __init__(self, ranker: JobRankingEngine, max_jobs: int, ttl_seconds: float):
+        self.ranker = ranker
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, IndexedJob] = {}  # insertion-ordered, oldest first
+        self._postings_by_token: Dict[str, Set[str]] = defaultdict(set)
+        self._blocks: List[sp.csr_matrix] = []
+        self._block_starts: List[int] = []  # global row number of each block's first row
+        self._row_count = 0
+        self._dead_rows = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def ingest(self, entries: List[Tuple[JobPosting, Dict[str, Any]]], area: Optional[str] = None) -> int:
+        """Adds or replaces postings returned by one provider search (`area` is its `area_key`); returns how many were new."""
+        if not entries:
+            return 0
+        # Last write wins for duplicates within a batch as well as across batches.
+        unique = {posting.id: (posting, metadata) for posting, metadata in entries}
+        vectors = self.ranker.vectorizer.transform([self.ranker.job_text(posting) for posting, _ in unique.values()])
+        added = 0
+        with self._lock:
+            first_row = self._row_count
+            self._blocks.append(vectors.tocsr())
+            self._block_starts.append(first_row)
+            self._row_count += vectors.shape[0]
+            # Merging adjacent blocks keeps global row numbers, so only the block count changes
+            while len(self._blocks) > 1 and self._blocks[-2].shape[0] <= 2 * self._blocks[-1].shape[0]:
+                last = self._blocks.pop()
+                self._block_starts.pop()
+                self._blocks[-1] = sp.vstack((self._blocks[-1], last), format="csr")
+            for offset, (job_id, (posting, metadata)) in enumerate(unique.items()):
+                areas = {area} if area is not None else set()
+                if job_id in self._jobs:
+                    areas |= self._jobs[job_id].areas
+                    self._remove(job_id)
+                else:
+                    added += 1
+                tokens = tokenize(self.ranker.job_text(posting))
+                self._jobs[job_id] = IndexedJob(posting.model_copy(), first_row + offset, tokens, metadata, areas)
+                for token in tokens:
+                    self._postings_by_token[token].add(job_id)
+            while len(self._jobs) > self.max_jobs:
+                self._remove(next(iter(self._jobs)))
+            self._evict_expired(time.time())
+        return added
+
+    def _evict_expired(self, now: float) -> None:
+        # Jobs are kept in ingest order (a re-ingested posting moves to the end), so expired ones are at the front
+        while self._jobs:
+            oldest = next(iter(self._jobs.values()))
+            if now - oldest.ingested_at < self.ttl_seconds:
+                break
+            self._remove(oldest.posting.id)
+        if self._dead_rows > len(self._jobs):
+            self._compact()
+
+    def _remove(self, job_id: str) -> None:
+        job = self._jobs.pop(job_id)
+        for token in job.tokens:
+            ids = self._postings_by_token.get(token)
+            if ids is not None:
+                ids.discard(job_id)
+                if not ids:
+                    del self._postings_by_token[token]
+        self._dead_rows += 1
+
+    def _rows(self, rows: List[int]) -> sp.csr_matrix:
+        """The matrix rows with the given (ascending) global row numbers, gathered from their blocks."""
+        rows = np.asarray(rows, dtype=np.int64)
+        block_ids = np.searchsorted(self._block_starts, rows, side="right") - 1
+        parts = [
+            self._blocks[block_id][rows[block_ids == block_id] - self._block_starts[block_id]]
+            for block_id in np.unique(block_ids)
+        ]
+        return sp.vstack(parts, format="csr")
+
+    def _compact(self) -> None:
+        """Merges the row blocks into one, dropping rows of replaced/evicted postings."""
+        live = list(self._jobs.values())
+        if live:
+            self._blocks = [self._rows([job.row for job in live])]
+            self._block_starts = [0]
+        else:
+            self._blocks, self._block_starts = [], []
+        for row, job in enumerate(live):
+            job.row = row
+        self._row_count = len(live)
+        self._dead_rows = 0
+
+    def search(
+        self,
+        resume_text: str,
+        keywords: str,
+        location: Optional[str],
+        filters: Optional[JobSearchFilters],
+        limit: int,
+        resume_vector: Optional[sp.csr_matrix] = None,
+    ) -> Tuple[List[JobPosting], int]:
+        """Jobs containing every keyword and passing the filters, ranked against the resume; plus the match count."""
+        query_tokens = tokenize(keywords)
+        with self._lock:
+            self._evict_expired(time.time())
+            if query_tokens:
+                postings = [self._postings_by_token.get(token, set()) for token in query_tokens]
+                candidate_ids = set.intersection(*sorted(postings, key=len))
+                candidates = sorted((self._jobs[job_id] for job_id in candidate_ids), key=lambda job: job.row)
+            else:
+                candidates = list(self._jobs.values())
+            area = area_key(location, filters.distance_km if filters else None)
+            candidates = [job for job in candidates if job.matches(area, filters)]
+            if not candidates:
+                return [], 0
+            job_vectors = self._rows([job.row for job in candidates])
+
+        if resume_vector is None:
+            resume_vector = self.ranker.resume_vector(resume_text)
+        similarities = np.asarray((job_vectors @ resume_vector.T).todense()).ravel()
+        ranked = [
+            candidates[index].posting.model_copy(update={"similarity_score": round(float(similarities[index]), 3)})
+            for index in top_k_indices(similarities, limit)
+        ]
+        return ranked, len(candidates)
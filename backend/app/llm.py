@@ -0,0 +1,113 @@
+# backend\app\llm.py
+import asyncio
+import contextvars
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Optional
+
+from fastapi import HTTPException
+
+from app.metrics import LLM_CALLS_IN_FLIGHT, LLM_ERRORS, stage
+from app.profiling import call_profiled
+
+# --- LLM Client Configuration ---
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "256"))
+LLM_TIMEOUT_SECONDS = float(os.environ.get("LLM_TIMEOUT_SECONDS", "60"))
+LLM_EXECUTOR_THREADS = int(os.environ.get("LLM_EXECUTOR_THREADS", "32"))
+
+
+class AsyncLLMClient:
+    """Non-blocking wrapper around a Gemini-style model with a concurrency limit and per-call timeouts.
+
+    Models exposing `generate_content_async` are awaited natively; anything that only offers the
+    synchronous `generate_content` is run on a bounded thread pool so the event loop never blocks.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        timeout: float = LLM_TIMEOUT_SECONDS,
+        executor_threads: int = LLM_EXECUTOR_THREADS,
+    ):
+        self.model = model
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._executor_threads = executor_threads
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so the semaphore binds to the running event loop, not the import-time one.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._executor_threads, thread_name_prefix="llm")
+        return self._executor
+
+    async def _call_model(self, prompt: str, generation_config: Any) -> Any:
+        if hasattr(self.model, "generate_content_async"):
+            return await self.model.generate_content_async(prompt, generation_config=generation_config)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(),
+            functools.partial(contextvars.copy_context().run, call_profiled,
+                              self.model.generate_content, prompt, generation_config=generation_config),
+        )
+
+    async def generate_text(self, prompt: str, generation_config: Any = None, timeout: Optional[float] = None) -> str:
+        """Runs one generation and returns the response text, raising HTTPException(504) on timeout."""
+        async with self.semaphore:
+            with LLM_CALLS_IN_FLIGHT.track_inprogress(), stage("llm_call"):
+                try:
+                    response = await asyncio.wait_for(
+                        self._call_model(prompt, generation_config),
+                        timeout=timeout or self.timeout,
+                    )
+                except asyncio.TimeoutError:
+                    LLM_ERRORS.inc(kind="timeout")
+                    raise HTTPException(status_code=504, detail="The AI model took too long to respond.")
+                except Exception:
+                    LLM_ERRORS.inc(kind="error")
+                    raise
+        return response.text
+
+    async def stream_text(self, prompt: str, generation_config: Any = None, timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """Yields response text as the model generates it. The timeout bounds the whole generation."""
+        if not hasattr(self.model, "generate_content_async"):
+            # Sync-only models can't stream without blocking; deliver the whole response as one chunk.
+            yield await self.generate_text(prompt, generation_config, timeout)
+            return
+        async with self.semaphore:
+            deadline = time.monotonic() + (timeout or self.timeout)
+            # The stage covers the whole generation, including time the consumer spends between chunks
+            with LLM_CALLS_IN_FLIGHT.track_inprogress(), stage("llm_stream"):
+                try:
+                    response = await asyncio.wait_for(
+                        self.model.generate_content_async(prompt, generation_config=generation_config, stream=True),
+                        timeout=deadline - time.monotonic(),
+                    )
+                    chunks = response.__aiter__()
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), timeout=deadline - time.monotonic())
+                        except StopAsyncIteration:
+                            return
+                        yield chunk.text
+                except asyncio.TimeoutError:
+                    LLM_ERRORS.inc(kind="timeout")
+                    raise HTTPException(status_code=504, detail="The AI model took too long to respond.")
+                except Exception:
+                    LLM_ERRORS.inc(kind="error")
+                    raise
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,311 @@
+# backend\app\metrics.py
+"""In-process metrics served in the Prometheus text exposition format (version 0.0.4).
+
+Counters, gauges and histograms live in one registry and are rendered by the `/metrics` endpoint.
+Request latency and in-flight counts are recorded by `MetricsMiddleware` under the route template
+(e.g. `/api/v1/resumes/analyze-ats`), and `stage(...)` times one step of a request under that same
+endpoint label, so a slow endpoint can be broken down into model, LLM and provider time.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans in-memory stages (sub-millisecond) up to a slow LLM call
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Route template of the request being handled; stages observed outside a request are labelled "none"
+_current_endpoint: ContextVar[str] = ContextVar("metrics_endpoint", default="none")
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _format_sample(name: str, labels: Sequence[Tuple[str, str]], value: float) -> str:
+    if not labels:
+        return f"{name} {_format_value(value)}"
+    rendered = ",".join(f'{label}="{_escape(str(label_value))}"' for label, label_value in labels)
+    return f"{name}{{{rendered}}} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    """Ordered collection of metric families, rendered together for a scrape."""
+
+    def __init__(self):
+        self._metrics: List["Metric"] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: "Metric") -> None:
+        with self._lock:
+            if any(existing.name == metric.name for existing in self._metrics):
+                raise ValueError(f"Metric '{metric.name}' is already registered.")
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(_format_sample(*sample) for sample in metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class Metric:
+    """One metric family: a value (or histogram) per combination of label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Optional[MetricsRegistry] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, Any] = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if len(labels) != len(self.labelnames) or any(name not in labels for name in self.labelnames):
+            raise ValueError(f"Metric '{self.name}' takes labels {self.labelnames}, got {tuple(labels)}.")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues) -> List[Tuple[str, str]]:
+        return list(zip(self.labelnames, key))
+
+    def samples(self) -> Iterator[Tuple[str, List[Tuple[str, str]], float]]:
+        with self._lock:
+            values = dict(self._values)
+        for key, value in values.items():
+            yield self.name, self._labels(key), value
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels: Any) -> Iterator[None]:
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional[MetricsRegistry] = None):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        # Per-bucket (non-cumulative) counts; the last slot is the +Inf overflow
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> Iterator[Tuple[str, List[Tuple[str, str]], float]]:
+        with self._lock:
+            values = {key: (list(counts), total, count) for key, (counts, total, count) in self._values.items()}
+        for key, (counts, total, count) in values.items():
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", labels + [("le", _format_value(bound))], cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class CallbackMetric(Metric):
+    """A family whose values are read from `collect()` at scrape time, for state kept elsewhere."""
+
+    def __init__(self, name: str, documentation: str, kind: str, labelnames: Sequence[str],
+                 collect: Callable[[], Dict[LabelValues, float]], registry: Optional[MetricsRegistry] = None):
+        super().__init__(name, documentation, labelnames, registry)
+        self.kind = kind
+        self._collect = collect
+
+    def samples(self) -> Iterator[Tuple[str, List[Tuple[str, str]], float]]:
+        for key, value in self._collect().items():
+            yield self.name, self._labels(key), value
+
+
+# --- Application metrics ---
+
+HTTP_REQUESTS = Counter("nexthire_http_requests_total", "HTTP requests handled, by route and status.", ["endpoint", "method", "status"])
+HTTP_REQUEST_SECONDS = Histogram("nexthire_http_request_duration_seconds", "Time to handle a request, including streamed bodies.", ["endpoint", "method"])
+HTTP_REQUESTS_IN_FLIGHT = Gauge("nexthire_http_requests_in_flight", "Requests currently being handled.", ["endpoint"])
+STAGE_SECONDS = Histogram("nexthire_stage_duration_seconds", "Time spent in one processing stage of a request.", ["endpoint", "stage"])
+
+LLM_CALLS_IN_FLIGHT = Gauge("nexthire_llm_calls_in_flight", "LLM generations currently running.")
+LLM_ERRORS = Counter("nexthire_llm_errors_total", "Failed LLM calls: 'timeout', 'error' (the call raised) or 'invalid_json'.", ["kind"])
+OUTBOUND_RETRIES = Counter("nexthire_outbound_http_retries_total", "Outbound HTTP requests retried after a transport error or retryable status.", ["host"])
+OUTBOUND_IN_FLIGHT = Gauge("nexthire_outbound_http_requests_in_flight", "Outbound HTTP requests currently running.", ["host"])
+SCORING_BATCH_REQUESTS = Histogram("nexthire_scoring_batch_requests", "Requests merged into one ATS model predict call.",
+                                   buckets=(1, 2, 4, 8, 16, 32, 64, 128))
+SCORING_BATCH_PAIRS = Histogram("nexthire_scoring_batch_pairs", "Resume/JD pairs scored by one ATS model predict call.",
+                                buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 5000))
+ADZUNA_ERRORS = Counter("nexthire_adzuna_errors_total", "Adzuna searches that failed after retries.", ["kind"])
+
+
+def label_endpoint(endpoint: str) -> None:
+    """Labels stages observed from now on in this context (e.g. a pool worker thread) with `endpoint`."""
+    _current_endpoint.set(endpoint)
+
+
+def current_endpoint() -> str:
+    """The endpoint label of the current request, for handing to work that runs outside its context."""
+    return _current_endpoint.get()
+
+
+@contextmanager
+def endpoint_label(endpoint: str) -> Iterator[None]:
+    """Labels stages observed in the enclosed block with `endpoint`, e.g. pool work done for a request."""
+    token = _current_endpoint.set(endpoint)
+    try:
+        yield
+    finally:
+        _current_endpoint.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Times the enclosed block as stage `name` of the current request's endpoint."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - started, endpoint=_current_endpoint.get(), stage=name)
+
+
+def register_cache_metrics(collect_stats: Callable[[], Dict[str, Dict[str, Any]]], registry: Optional[MetricsRegistry] = None) -> None:
+    """Exposes the `stats()` of every cache returned by `collect_stats` (cache name -> stats dict)."""
+
+    def lookups() -> Dict[LabelValues, float]:
+        return {
+            (cache, result): stats[field]
+            for cache, stats in collect_stats().items()
+            for field, result in (("hits", "hit"), ("stale_hits", "stale_hit"), ("misses", "miss"))
+            if field in stats
+        }
+
+    def hit_ratios() -> Dict[LabelValues, float]:
+        ratios = {}
+        for cache, stats in collect_stats().items():
+            hits = stats.get("hits", 0) + stats.get("stale_hits", 0)
+            lookups_total = hits + stats.get("misses", 0)
+            ratios[(cache,)] = hits / lookups_total if lookups_total else 0.0
+        return ratios
+
+    def in_flight() -> Dict[LabelValues, float]:
+        return {(cache,): stats["in_flight"] for cache, stats in collect_stats().items() if "in_flight" in stats}
+
+    CallbackMetric("nexthire_cache_lookups_total", "Cache lookups by result.", "counter", ["cache", "result"], lookups, registry)
+    CallbackMetric("nexthire_cache_hit_ratio", "Share of cache lookups served from the cache (stale hits included).", "gauge", ["cache"], hit_ratios, registry)
+    CallbackMetric("nexthire_cache_computations_in_flight", "Cache misses currently being computed (coalesced callers share one).", "gauge", ["cache"], in_flight, registry)
+
+
+# --- Request middleware ---
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, so ids in the URL don't become separate label values."""
+    app = scope.get("app")
+    router = getattr(app, "router", None)
+    partial = None
+    for route in getattr(router, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-endpoint request counts, latency and in-flight requests."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = route_template(scope)
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = _current_endpoint.set(endpoint)
+        started = time.perf_counter()
+        try:
+            with HTTP_REQUESTS_IN_FLIGHT.track_inprogress(endpoint=endpoint):
+                await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint, method=method)
+            HTTP_REQUESTS.inc(endpoint=endpoint, method=method, status=status)
+            _current_endpoint.reset(token)
@@ -0,0 +1,207 @@
+# backend\app\model_bundle.py
+"""Versioned on-disk bundle of the ATS model artifacts.
+
+Layout of a bundle directory:
+
+    manifest.json          format version, feature layout, vectorizer settings, SHA-256 of every file
+    model.ubj              XGBoost native (UBJSON) model
+    resume_vocabulary.npy  TF-IDF terms in column order (fixed-width unicode array)
+    resume_idf.npy         IDF weight of each term
+    jd_vocabulary.npy
+    jd_idf.npy
+
+The vocabularies and IDF weights are memory-mapped, so uvicorn workers share one page-cache copy
+instead of each unpickling a Python dict of terms. Loading checks the manifest against the files and
+against the features this code computes, and raises ModelBundleError on any mismatch.
+
+The manifest's `feature_layout.custom_features_computed` records whether the model was trained on
+keyword_score/experience_gap computed by app.features. Models trained before that (on LLM-derived
+values) never split on those columns, so the API sends them the constants it always sent instead of
+computing features the model ignores.
+
+Writing a bundle from fitted objects (the training script does this after every run):
+
+    python -m app.model_bundle <bundle_dir> <ats_model.joblib> <tfidf_resume.joblib> <tfidf_jd.joblib>
+
+The command line converts pickled artifacts from older training runs, so it marks the custom features
+as not computed.
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from sklearn.preprocessing import normalize
+from xgboost import XGBRegressor
+
+from app.features import CUSTOM_FEATURE_NAMES
+
+FORMAT_VERSION = 1
+MANIFEST_FILENAME = "manifest.json"
+MODEL_FILENAME = "model.ubj"
+VECTORIZER_NAMES = ("resume", "jd")
+
+# TfidfVectorizer settings that BundledVectorizer reproduces; anything else is refused at export time
+_SUPPORTED_VECTORIZER_PARAMS = {
+    "analyzer": "word", "binary": False, "lowercase": True, "ngram_range": (1, 1), "norm": "l2",
+    "preprocessor": None, "strip_accents": None, "sublinear_tf": False, "tokenizer": None, "use_idf": True,
+}
+
+
+class ModelBundleError(RuntimeError):
+    """The bundle is missing, corrupt, or doesn't match the features this code computes."""
+
+
+class BundledVectorizer:
+    """Drop-in for a fitted word-level TfidfVectorizer's `transform`, backed by plain arrays.
+
+    Terms are looked up by binary search in the sorted vocabulary array (TfidfVectorizer numbers its
+    columns in sorted term order), so no per-process term dictionary is built.
+    """
+
+    def __init__(self, vocabulary: np.ndarray, idf: np.ndarray, token_pattern: str, stop_words: Iterable[str]):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.token_pattern = re.compile(token_pattern)
+        self.stop_words = frozenset(stop_words)
+
+    def transform(self, texts: Iterable[str]) -> sp.csr_matrix:
+        # Each distinct token in the batch is numbered once, so the vocabulary search runs on those alone
+        token_ids: Dict[str, int] = {}
+        ids: List[int] = []
+        rows: List[int] = []
+        row_count = 0
+        for row_count, text in enumerate(texts, start=1):
+            document = [token_ids.setdefault(token, len(token_ids))
+                        for token in self.token_pattern.findall(text.lower()) if token not in self.stop_words]
+            ids.extend(document)
+            rows.extend([row_count - 1] * len(document))
+        shape = (row_count, len(self.vocabulary))
+        if not ids:
+            return sp.csr_matrix(shape, dtype=np.float64)
+
+        distinct = np.array(list(token_ids))
+        positions = np.minimum(np.searchsorted(self.vocabulary, distinct), len(self.vocabulary) - 1)
+        # -1 marks tokens outside the vocabulary
+        token_columns = np.where(self.vocabulary[positions] == distinct, positions, -1)
+        columns = token_columns[np.asarray(ids)]
+        known = columns >= 0
+        counts = sp.csr_matrix(
+            (np.ones(int(known.sum())), (np.asarray(rows)[known], columns[known])), shape=shape, dtype=np.float64
+        )
+        counts.sum_duplicates()
+        counts.data *= self.idf[counts.indices]
+        return normalize(counts, norm="l2", copy=False)
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _vectorizer_settings(vectorizer: Any) -> Dict[str, Any]:
+    params = vectorizer.get_params()
+    unsupported = {name: params[name] for name, value in _SUPPORTED_VECTORIZER_PARAMS.items() if params[name] != value}
+    if unsupported or params["stop_words"] not in ("english", None):
+        raise ModelBundleError(f"Can't bundle a TfidfVectorizer with settings {unsupported or params['stop_words']!r}.")
+    return {"token_pattern": params["token_pattern"], "stop_words": params["stop_words"]}
+
+
+def uses_computed_features(manifest: Dict[str, Any]) -> bool:
+    """Whether the bundle's model was trained on custom features computed by app.features."""
+    return bool(manifest["feature_layout"].get("custom_features_computed", False))
+
+
+def write_model_bundle(directory: str, model: XGBRegressor, tfidf_resume: Any, tfidf_jd: Any,
+                       custom_features_computed: bool = True) -> Dict[str, Any]:
+    """Writes a bundle from fitted objects and returns its manifest. The manifest is written last."""
+    os.makedirs(directory, exist_ok=True)
+    vectorizers = {"resume": tfidf_resume, "jd": tfidf_jd}
+    settings = {name: _vectorizer_settings(vectorizer) for name, vectorizer in vectorizers.items()}
+
+    model.save_model(os.path.join(directory, MODEL_FILENAME))
+    terms = {}
+    for name, vectorizer in vectorizers.items():
+        vocabulary = np.array(vectorizer.get_feature_names_out(), dtype=str)
+        terms[name] = len(vocabulary)
+        np.save(os.path.join(directory, f"{name}_vocabulary.npy"), vocabulary)
+        np.save(os.path.join(directory, f"{name}_idf.npy"), np.asarray(vectorizer.idf_, dtype=np.float64))
+
+    files = [MODEL_FILENAME] + [f"{name}_{kind}.npy" for name in VECTORIZER_NAMES for kind in ("vocabulary", "idf")]
+    checksums = {filename: _sha256(os.path.join(directory, filename)) for filename in files}
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "bundle_id": hashlib.sha256("".join(checksums[f] for f in files).encode()).hexdigest()[:16],
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "feature_layout": {
+            "resume_terms": terms["resume"],
+            "jd_terms": terms["jd"],
+            "custom_features": list(CUSTOM_FEATURE_NAMES),
+            "custom_features_computed": custom_features_computed,
+            "n_features": terms["resume"] + terms["jd"] + len(CUSTOM_FEATURE_NAMES),
+        },
+        "vectorizers": settings,
+        "files": checksums,
+    }
+    if model.get_booster().num_features() != manifest["feature_layout"]["n_features"]:
+        raise ModelBundleError("The model's feature count doesn't match the vectorizers plus custom features.")
+    with open(os.path.join(directory, MANIFEST_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_model_bundle(directory: str) -> Dict[str, Any]:
+    """Verifies and loads a bundle into {'ats_model', 'tfidf_resume', 'tfidf_jd', 'manifest'}."""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILENAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ModelBundleError(f"Can't read the model bundle manifest in '{directory}': {e}") from e
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ModelBundleError(f"Model bundle format {manifest.get('format_version')} is not supported (expected {FORMAT_VERSION}).")
+
+    for filename, checksum in manifest["files"].items():
+        path = os.path.join(directory, filename)
+        if not os.path.exists(path) or _sha256(path) != checksum:
+            raise ModelBundleError(f"Model bundle file '{filename}' is missing or doesn't match its checksum.")
+
+    layout = manifest["feature_layout"]
+    if layout["custom_features"] != list(CUSTOM_FEATURE_NAMES):
+        raise ModelBundleError(f"Model bundle expects custom features {layout['custom_features']}, "
+                               f"but this server computes {list(CUSTOM_FEATURE_NAMES)}.")
+
+    artifacts: Dict[str, Any] = {"manifest": manifest}
+    for name in VECTORIZER_NAMES:
+        vocabulary = np.load(os.path.join(directory, f"{name}_vocabulary.npy"), mmap_mode="r")
+        idf = np.load(os.path.join(directory, f"{name}_idf.npy"), mmap_mode="r")
+        if not len(vocabulary) == len(idf) == layout[f"{name}_terms"]:
+            raise ModelBundleError(f"Model bundle {name} vocabulary and IDF sizes don't match the manifest.")
+        settings = manifest["vectorizers"][name]
+        stop_words = ENGLISH_STOP_WORDS if settings["stop_words"] == "english" else ()
+        artifacts[f"tfidf_{name}"] = BundledVectorizer(vocabulary, idf, settings["token_pattern"], stop_words)
+
+    model = XGBRegressor()
+    model.load_model(os.path.join(directory, MODEL_FILENAME))
+    if model.get_booster().num_features() != layout["n_features"]:
+        raise ModelBundleError(f"Model expects {model.get_booster().num_features()} features, "
+                               f"the bundle layout describes {layout['n_features']}.")
+    artifacts["ats_model"] = model
+    return artifacts
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 5:
+        sys.exit(__doc__)
+    import joblib
+
+    written = write_model_bundle(sys.argv[1], *(joblib.load(path) for path in sys.argv[2:]), custom_features_computed=False)
+    print(f"Wrote model bundle {written['bundle_id']} to '{sys.argv[1]}'.")
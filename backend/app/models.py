@@ -4,9 +4,20 @@ from typing import List, Optional, Dict
 
 # --- Resume Parsing Models ---
 
-class ResumeInput(BaseModel):
+class ResumeReference(BaseModel):
+    """A resume, sent either in full or as the id of an earlier upload to /api/v1/resumes/sessions."""
+    resume_text: Optional[str] = Field(None, example="John Doe\nAustin, TX\njohn.doe@email.com...")
+    resume_id: Optional[str] = Field(None, description="Id returned by POST /api/v1/resumes/sessions; replaces resume_text.")
+
+class ResumeInput(ResumeReference):
     """The input data sent from the frontend for initial parsing."""
-    resume_text: str = Field(..., example="John Doe\nAustin, TX\njohn.doe@email.com...")
+
+class ResumeSessionOutput(BaseModel):
+    """An uploaded resume that later requests can refer to by id."""
+    resume_id: str
+    expires_in_seconds: int = Field(..., description="The session expires after this long without use.")
+    primary_role: str
+    keywords: List[str]
 
 # --- NEW: Enhanced Data Structures ---
 
@@ -79,9 +90,8 @@ class KeywordAnalysis(BaseModel):
     matching_keywords: List[str] = Field([], description="Keywords found in both the resume and context.")
     missing_keywords: List[str] = Field([], description="Important keywords from the context that are missing in the resume.")
 
-class ATSAnalysisInput(BaseModel):
+class ATSAnalysisInput(ResumeReference):
     """The input data for the ATS analysis endpoint."""
-    resume_text: str
     job_description: Optional[str] = None
     career_level: Optional[str] = None
 
@@ -94,6 +104,44 @@ class ATSAnalysisOutput(BaseModel):
     keyword_analysis: KeywordAnalysis
     rewrite_suggestions: List[RewriteSuggestion] = []
 
+class ATSScoreOutput(BaseModel):
+    """The fast-path response: the custom model's score now, the LLM commentary later."""
+    match_score: int
+    analysis_id: str = Field(..., description="Poll /api/v1/resumes/analyze-ats/analysis/{analysis_id} for the commentary.")
+    analysis_status: str = Field(..., description="pending, complete or failed.")
+
+class ATSAnalysisJobStatus(BaseModel):
+    analysis_id: str
+    status: str = Field(..., description="pending, complete or failed.")
+    result: Optional[ATSAnalysisOutput] = None
+    error: Optional[str] = None
+
+class ATSBatchPair(BaseModel):
+    resume_text: str
+    job_description: Optional[str] = None
+    career_level: Optional[str] = None
+
+class ATSBatchInput(BaseModel):
+    """Batch ATS scoring. Send explicit `pairs`, one `resume_text` against many `job_descriptions`,
+    or many `resume_texts` against one `job_description`/`career_level`. `resume_id` may stand in for `resume_text`."""
+    pairs: List[ATSBatchPair] = []
+    resume_text: Optional[str] = None
+    resume_id: Optional[str] = None
+    resume_texts: List[str] = []
+    job_description: Optional[str] = None
+    job_descriptions: List[str] = []
+    career_level: Optional[str] = None
+    include_analysis: bool = Field(False, description="Also generate the LLM commentary for every pair (slow).")
+
+class ATSBatchResult(BaseModel):
+    index: int = Field(..., description="Position of the pair in the expanded input.")
+    match_score: int
+    analysis: Optional[ATSAnalysisOutput] = None
+
+class ATSBatchOutput(BaseModel):
+    """Results ranked by match_score, highest first."""
+    results: List[ATSBatchResult]
+
 # --- Jobs & Application Models ---
 
 class JobSearchFilters(BaseModel):
@@ -119,15 +167,16 @@ class JobPosting(BaseModel):
     required_fields: List[str] = Field([], description="Fields we may need to prompt the candidate for.")
 
 
-class JobSearchInput(BaseModel):
-    resume_text: str = Field(..., description="Raw resume text used for personalization.")
+class JobSearchInput(ResumeReference):
+    """The resume (text or session id) is used for personalization."""
     filters: Optional[JobSearchFilters] = None
-    limit: int = Field(10, ge=1, le=25)
+    # Adzuna pages hold at most 50 results, so limits above that are fetched as concurrent pages
+    limit: int = Field(10, ge=1, le=100)
 
 
 class JobSearchResponse(BaseModel):
     jobs: List[JobPosting]
-    total_results: int
+    total_results: int = Field(..., description="Matches the job provider reports for the query, whether or not the jobs were served from the local index.")
     filters_used: JobSearchFilters
 
 
@@ -140,8 +189,8 @@ class JobApplicationPayload(BaseModel):
     provided_fields: Dict[str, str] = {}
 
 
-class JobApplyInput(JobApplicationPayload):
-    resume_text: str
+class JobApplyInput(JobApplicationPayload, ResumeReference):
+    """The resume is optional: applying doesn't read it, but a client may identify the resume it applied with."""
 
 
 class JobApplyResponse(BaseModel):
@@ -151,8 +200,7 @@ class JobApplyResponse(BaseModel):
     message: Optional[str] = None
 
 
-class JobApplyAllInput(BaseModel):
-    resume_text: str
+class JobApplyAllInput(ResumeReference):
     jobs: List[JobApplicationPayload]
 
 
@@ -0,0 +1,236 @@
+# backend\app\profiling.py
+"""Opt-in profiling of single requests, for reproducing one slow request shape from production.
+
+Enabled only when PROFILING_ADMIN_TOKEN is set; otherwise the middleware is never installed and
+requests pay nothing. An admin profiles one request by sending
+
+    X-Profile: collapsed | pstats
+    X-Profile-Token: <PROFILING_ADMIN_TOKEN>
+
+The response carries `X-Profile-Id`, and the profile is stored under PROFILE_OUTPUT_DIR as
+`<id>.collapsed` or `<id>.pstats`. The id starts with the UTC time and the endpoint
+(e.g. `20250101T120000Z-POST_api_v1_jobs_search-1a2b3c4d`), and the file can be downloaded from
+`GET /api/v1/admin/profiles/{id}` with the same token header.
+
+- collapsed: a stack sampler records every thread doing work, every PROFILE_SAMPLE_INTERVAL_SECONDS.
+  It writes one `frame;frame;frame count` line per distinct stack, ready for flamegraph.pl or
+  speedscope. The first frame is the endpoint and the second the thread, so sync helpers running on
+  the LLM executor or other pools show up next to the event loop.
+- pstats: cProfile traces every call on the event loop thread, which is where the async handlers and
+  the sync helpers they call inline run. Work the request hands to the scoring pool's threads or the
+  LLM executor is traced too, each call under its own profiler (see `call_profiled`), and merged into
+  the same file. Coroutines such as `_adzuna_request` are counted once per resumption, so their
+  times cover the work between awaits, not the awaited I/O (in either format that shows up as the
+  event loop waiting). Open the file with `python -m pstats` or snakeviz.
+
+Model scoring and job ranking run on the scoring pool: with SCORING_EXECUTOR=thread they show up as
+`scoring_*` threads in collapsed profiles and in pstats profiles, but with `process` they run in
+other processes and neither profiler sees them (profile with `thread` or `inline` instead).
+
+Both profilers see everything else the worker does at the same time, so profile on a quiet instance.
+Only one request is profiled at a time; a request asking while another is being profiled is served
+without a profile.
+"""
+import cProfile
+import hmac
+import os
+import pstats
+import re
+import secrets
+import sys
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import route_template
+
+# --- Profiling Configuration ---
+PROFILING_ADMIN_TOKEN = os.environ.get("PROFILING_ADMIN_TOKEN", "")
+PROFILE_OUTPUT_DIR = os.environ.get("PROFILE_OUTPUT_DIR", "profiles")
+PROFILE_SAMPLE_INTERVAL_SECONDS = float(os.environ.get("PROFILE_SAMPLE_INTERVAL_SECONDS", "0.001"))
+
+PROFILE_HEADER = "x-profile"
+TOKEN_HEADER = "x-profile-token"
+PROFILE_FORMATS = {"collapsed": "collapsed", "pstats": "pstats"}  # format -> file extension
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{6}Z-[A-Za-z0-9_]+-[0-9a-f]{8}$")
+
+# A thread whose innermost Python frame is one of these is parked (waiting for work), not working
+_IDLE_MODULES = ("threading.py", "queue.py", "selectors.py", "socketserver.py")
+_IDLE_FUNCTIONS = {("thread.py", "_worker"), ("process.py", "_queue_management_worker")}
+
+
+class ThreadProfiles:
+    """cProfile profiles of calls that other threads ran for the request being profiled in pstats format."""
+
+    def __init__(self, request_thread: int):
+        self.request_thread = request_thread  # already traced by the request's own profiler
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def add(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def merge_into(self, stats: pstats.Stats) -> None:
+        with self._lock:
+            for profile in self._profiles:
+                stats.add(profile)
+
+
+_thread_profiles: ContextVar[Optional[ThreadProfiles]] = ContextVar("thread_profiles", default=None)
+
+
+def call_profiled(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Calls `fn(*args, **kwargs)`, under cProfile if it runs on a worker thread for a request being
+    profiled in pstats format. Executors must run it in a copy of the request's context
+    (`contextvars.copy_context().run`), which is how it knows the request."""
+    profiles = _thread_profiles.get()
+    if profiles is None or threading.get_ident() == profiles.request_thread:
+        return fn(*args, **kwargs)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profiler.disable()
+        profiles.add(profiler)
+
+
+def token_is_valid(token: Optional[str]) -> bool:
+    return bool(PROFILING_ADMIN_TOKEN) and hmac.compare_digest((token or "").encode(), PROFILING_ADMIN_TOKEN.encode())
+
+
+def profile_path(profile_id: str) -> Optional[str]:
+    """The stored profile for `profile_id`, or None if there is none (or the id is malformed)."""
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    for extension in PROFILE_FORMATS.values():
+        path = os.path.join(PROFILE_OUTPUT_DIR, f"{profile_id}.{extension}")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _is_idle(frame) -> bool:
+    module = os.path.basename(frame.f_code.co_filename)
+    return module in _IDLE_MODULES or (module, frame.f_code.co_name) in _IDLE_FUNCTIONS
+
+
+def _frame_label(code) -> str:
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples the stacks of all other threads on a background thread and counts identical stacks."""
+
+    def __init__(self, interval: float, busy_thread: int):
+        self.interval = interval
+        # The thread serving the request is always recorded, even while it waits in the event loop
+        self.busy_thread = busy_thread
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self) -> None:
+        thread_names: Dict[int, str] = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == self._thread.ident:
+                    continue
+                if ident != self.busy_thread and _is_idle(frame):
+                    continue
+                if ident not in thread_names:
+                    thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(thread_names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str, root: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{root};{stack} {count}\n")
+
+
+class ProfilingMiddleware:
+    """Runs requests asking for a profile (with a valid admin token) under a profiler and stores the result."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._busy = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if PROFILE_HEADER not in headers:
+            await self.app(scope, receive, send)
+            return
+
+        if not token_is_valid(headers.get(TOKEN_HEADER)):
+            await JSONResponse({"detail": "Invalid profiling token."}, status_code=403)(scope, receive, send)
+            return
+        profile_format = headers[PROFILE_HEADER].lower()
+        if profile_format not in PROFILE_FORMATS:
+            await JSONResponse({"detail": f"Unknown profile format '{profile_format}'."}, status_code=400)(scope, receive, send)
+            return
+        if not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            endpoint = f"{scope['method']} {route_template(scope)}"
+            profile_id = "-".join([
+                datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+                re.sub(r"[^A-Za-z0-9]+", "_", endpoint).strip("_"),
+                secrets.token_hex(4),
+            ])
+
+            async def send_with_profile_id(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [(b"x-profile-id", profile_id.encode())]
+                await send(message)
+
+            os.makedirs(PROFILE_OUTPUT_DIR, exist_ok=True)
+            path = os.path.join(PROFILE_OUTPUT_DIR, f"{profile_id}.{PROFILE_FORMATS[profile_format]}")
+            if profile_format == "pstats":
+                thread_profiles = ThreadProfiles(threading.get_ident())
+                token = _thread_profiles.set(thread_profiles)
+                profiler = cProfile.Profile()
+                profiler.enable()
+                try:
+                    await self.app(scope, receive, send_with_profile_id)
+                finally:
+                    profiler.disable()
+                    _thread_profiles.reset(token)
+                    stats = pstats.Stats(profiler)
+                    thread_profiles.merge_into(stats)
+                    stats.dump_stats(path)
+            else:
+                sampler = StackSampler(PROFILE_SAMPLE_INTERVAL_SECONDS, threading.get_ident())
+                sampler.start()
+                try:
+                    await self.app(scope, receive, send_with_profile_id)
+                finally:
+                    sampler.stop()
+                    sampler.write(path, endpoint)
+            print(f"Stored {profile_format} profile of {endpoint} as '{path}'.")
+        finally:
+            self._busy.release()
@@ -0,0 +1,48 @@
+# backend\app\ranking.py
+from typing import Any, List, Optional
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first, via partial selection instead of a full sort.
+
+    Equal scores keep their input order, exactly as a stable full sort would rank them.
+    """
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    # Everything tied with the k-th best score is a candidate, so the cut below keeps the earliest of them
+    threshold = -np.partition(-scores, k - 1)[k - 1]
+    candidates = np.flatnonzero(scores >= threshold)
+    return candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+
+
+class JobRankingEngine:
+    """Ranks job postings against a resume using an already-fitted TF-IDF vectorizer.
+
+    The vocabulary and IDF weights are reused across requests, so ranking costs one transform of
+    the resume, one transform of the jobs and a single sparse matrix-vector product.
+    """
+
+    def __init__(self, vectorizer: Any):
+        self.vectorizer = vectorizer
+
+    @staticmethod
+    def job_text(job: Any) -> str:
+        return f"{job.title} {job.company} {job.description or ''}"
+
+    def resume_vector(self, resume_text: str) -> sp.csr_matrix:
+        return self.vectorizer.transform([resume_text])
+
+    def similarities(self, resume_text: str, job_texts: List[str], resume_vector: Optional[sp.csr_matrix] = None) -> np.ndarray:
+        """Cosine similarity of every job text to the resume (rows are L2-normalized by the vectorizer).
+
+        Pass `resume_vector` (from `resume_vector`) to skip transforming a resume that was already seen.
+        """
+        if not job_texts:
+            return np.zeros(0)
+        if resume_vector is None:
+            resume_vector = self.resume_vector(resume_text)
+        job_matrix = self.vectorizer.transform(job_texts)
+        return np.asarray((job_matrix @ resume_vector.T).todense()).ravel()
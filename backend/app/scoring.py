@@ -0,0 +1,293 @@
+# backend\app\scoring.py
+"""CPU-bound scoring (ATS model predictions and job ranking) on a worker pool, off the event loop.
+
+`ScoringPool` runs the work on one of three executors (SCORING_EXECUTOR):
+
+    thread   (default) threads in the API process; TF-IDF, scipy and XGBoost release the GIL for
+             much of their work, and the event loop stays responsive
+    process  spawned worker processes, so one API process can use every core
+    inline   directly on the event loop, as before; useful for profiling and debugging
+
+Thread workers share one copy of the model bundle (the API process's own, when it has one loaded):
+the vectorizers, ranker and model are only read while scoring, so memory doesn't grow with the
+worker count. Process workers each load their own copy in the pool initializer. Either way `start`
+returns once every worker has its bundle. Concurrent small ATS requests are micro-batched: requests arriving within
+SCORING_BATCH_WINDOW_MS of each other (up to SCORING_MAX_BATCH_PAIRS pairs) are scored with a single
+TF-IDF transform and one `predict` call. If a merged batch fails, its requests are retried one by one,
+so a bad request fails only its own caller. Pool work is labelled in the stage metrics with the
+endpoint it was done for; a merged batch takes the endpoint of the request that opened it.
+
+CPU work on state that lives in the API process (the job index, resume sessions) can't move to worker
+processes; `run_local` runs it on the pool's threads (or, with `process`, a few local threads).
+"""
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import scipy.sparse as sp
+
+from app.features import DEFAULT_KEYWORD_SCORE, compute_custom_features
+from app.metrics import SCORING_BATCH_PAIRS, SCORING_BATCH_REQUESTS, current_endpoint, endpoint_label, label_endpoint, stage
+from app.model_bundle import load_model_bundle, uses_computed_features
+from app.profiling import call_profiled
+from app.ranking import JobRankingEngine
+from app.text_processing import clean_text
+
+# --- Scoring Pool Configuration ---
+SCORING_EXECUTOR = os.environ.get("SCORING_EXECUTOR", "thread")
+# A few workers keep the event loop free; more mostly add memory (process workers each hold a bundle)
+SCORING_WORKERS = int(os.environ.get("SCORING_WORKERS", str(min(4, os.cpu_count() or 1))))
+SCORING_BATCH_WINDOW_MS = float(os.environ.get("SCORING_BATCH_WINDOW_MS", "2"))
+SCORING_MAX_BATCH_PAIRS = int(os.environ.get("SCORING_MAX_BATCH_PAIRS", "256"))
+
+# keyword_score and experience_gap as sent to models trained before the features were computed here
+LEGACY_CUSTOM_FEATURES = (DEFAULT_KEYWORD_SCORE, 0)
+
+# (resume text per pair, JD text per pair, optional precomputed resume TF-IDF rows, one per pair)
+ScoringRequest = Tuple[List[str], List[str], Optional[sp.csr_matrix]]
+
+
+# --- Scoring functions (run wherever the artifacts live) ---
+
+def _dedupe_texts(texts: List[str]) -> Tuple[List[str], np.ndarray]:
+    """Returns the unique texts plus, for every input, the row index of its unique copy."""
+    positions: Dict[str, int] = {}
+    row_index = np.array([positions.setdefault(text, len(positions)) for text in texts], dtype=np.int64)
+    return list(positions), row_index
+
+
+def predict_batch(artifacts: Dict[str, Any], requests: Sequence[ScoringRequest]) -> List[List[int]]:
+    """Scores several requests' (resume, JD) pairs with one transform per vectorizer and a single predict call."""
+    resume_texts = [text for texts, _, _ in requests for text in texts]
+    jd_texts = [text for _, texts, _ in requests for text in texts]
+
+    # Repeated texts (one resume vs many JDs and vice versa) are cleaned and transformed only once;
+    # requests that bring their resume vectors skip the resume transform.
+    missing = [text for texts, _, vectors in requests if vectors is None for text in texts]
+    unique_resumes, resume_rows = _dedupe_texts(missing)
+    unique_jds, jd_rows = _dedupe_texts(jd_texts)
+    with stage("clean_text"):
+        cleaned_resumes = [clean_text(text) for text in unique_resumes]
+        cleaned_jds = [clean_text(text) for text in unique_jds]
+    with stage("tfidf_transform"):
+        computed = artifacts["tfidf_resume"].transform(cleaned_resumes)[resume_rows] if missing else None
+        jd_vectors = artifacts["tfidf_jd"].transform(cleaned_jds)[jd_rows]
+    blocks, offset = [], 0
+    for texts, _, vectors in requests:
+        if vectors is None:
+            vectors = computed[offset:offset + len(texts)]
+            offset += len(texts)
+        blocks.append(vectors)
+    resume_vectors = sp.vstack(blocks, format="csr")
+
+    # keyword_score and experience_gap, computed exactly as the training pipeline did -- unless the model
+    # predates that pipeline and never learned to use them
+    with stage("custom_features"):
+        if uses_computed_features(artifacts["manifest"]):
+            custom_features = compute_custom_features(resume_texts, jd_texts)
+        else:
+            custom_features = np.tile(np.array(LEGACY_CUSTOM_FEATURES, dtype=np.float64), (len(resume_texts), 1))
+
+    with stage("model_predict"):
+        X_pred = sp.hstack((resume_vectors, jd_vectors, custom_features), format='csr')
+        predicted_scores = np.clip(np.round(artifacts["ats_model"].predict(X_pred)), 0, 100).astype(int).tolist()
+
+    results, start = [], 0
+    for texts, _, _ in requests:
+        results.append(predicted_scores[start:start + len(texts)])
+        start += len(texts)
+    return results
+
+
+def rank_jobs(artifacts: Dict[str, Any], resume_text: str, job_texts: List[str],
+              resume_vector: Optional[sp.csr_matrix] = None) -> np.ndarray:
+    """Cosine similarity of every job text to the resume, in the job-ranking vocabulary."""
+    with stage("job_ranking"):
+        return artifacts["job_ranker"].similarities(resume_text, job_texts, resume_vector=resume_vector)
+
+
+# --- Pool worker ---
+
+_worker = threading.local()
+
+
+def _prepare_artifacts(artifacts: Dict[str, Any], ranking_vectorizer: str, model_threads: int) -> Dict[str, Any]:
+    # Workers split the cores between them instead of each predict using all of them
+    artifacts["ats_model"].set_params(n_jobs=model_threads)
+    if "job_ranker" not in artifacts:
+        artifacts["job_ranker"] = JobRankingEngine(artifacts[ranking_vectorizer])
+    return artifacts
+
+
+def _init_thread_worker(artifacts: Dict[str, Any]) -> None:
+    _worker.artifacts = artifacts
+    label_endpoint("scoring_worker")
+
+
+def _init_worker(bundle_path: str, ranking_vectorizer: str, model_threads: int, started: Any) -> None:
+    try:
+        artifacts = _prepare_artifacts(load_model_bundle(bundle_path), ranking_vectorizer, model_threads)
+    except BaseException:
+        started.abort()  # the other workers would otherwise wait for this one forever
+        raise
+    _worker.artifacts = artifacts
+    label_endpoint("scoring_worker")
+    # Executors start workers on demand, reusing an idle one instead; holding every worker here until
+    # all have started makes the startup pings create (and warm) the full pool
+    started.wait()
+
+
+def _call_in_worker(fn: Callable[..., Any], endpoint: str, *args: Any) -> Any:
+    # Executors don't carry the caller's context over, so its endpoint label travels with the work item
+    with endpoint_label(endpoint):
+        return call_profiled(fn, _worker.artifacts, *args)
+
+
+def _ping(artifacts: Dict[str, Any]) -> str:
+    return artifacts["manifest"]["bundle_id"]
+
+
+class ScoringPool:
+    """Runs predict_batch and rank_jobs on the configured executor, micro-batching ATS predictions."""
+
+    def __init__(
+        self,
+        bundle_path: str,
+        ranking_vectorizer: str,
+        executor: str = SCORING_EXECUTOR,
+        workers: int = SCORING_WORKERS,
+        batch_window_ms: float = SCORING_BATCH_WINDOW_MS,
+        max_batch_pairs: int = SCORING_MAX_BATCH_PAIRS,
+    ):
+        if executor not in ("thread", "process", "inline"):
+            raise ValueError(f"Unknown scoring executor: '{executor}'.")
+        self.executor_kind = executor
+        self.workers = max(1, workers)
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_pairs = max_batch_pairs
+        self._bundle_path = bundle_path
+        self._ranking_vectorizer = ranking_vectorizer
+        self._local_artifacts: Dict[str, Any] = {}
+        self._executor: Optional[Executor] = None
+        self._local_executor: Optional[Executor] = None
+        self._pending: List[Tuple[ScoringRequest, asyncio.Future]] = []
+        self._pending_pairs = 0
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._batches: set = set()
+
+    async def start(self, local_artifacts: Dict[str, Any]) -> None:
+        """Starts the workers and waits until they have the model. `inline` uses `local_artifacts`, and
+        `thread` shares them with its workers (loading the bundle once if they don't hold it)."""
+        self._local_artifacts = local_artifacts
+        if self.executor_kind == "inline":
+            return
+        model_threads = max(1, (os.cpu_count() or 1) // self.workers)
+        if self.executor_kind == "thread":
+            shared = local_artifacts if "ats_model" in local_artifacts else await asyncio.to_thread(load_model_bundle, self._bundle_path)
+            shared = _prepare_artifacts(shared, self._ranking_vectorizer, model_threads)
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="scoring",
+                                                initializer=_init_thread_worker, initargs=(shared,))
+        else:
+            # Spawned, not forked: forking a process that already runs an event loop and threads is unsafe
+            context = multiprocessing.get_context("spawn")
+            initargs = (self._bundle_path, self._ranking_vectorizer, model_threads, context.Barrier(self.workers))
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=context,
+                                                 initializer=_init_worker, initargs=initargs)
+            self._local_executor = ThreadPoolExecutor(self.workers, thread_name_prefix="scoring-local")
+        # One ping per worker: each starts a worker that gets the bundle, and a worker that can't load
+        # it fails startup rather than the first request
+        await asyncio.gather(*(self._run(_ping) for _ in range(self.workers)))
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._executor is None:
+            return fn(self._local_artifacts, *args)
+        call = functools.partial(_call_in_worker, fn, current_endpoint(), *args)
+        if self.executor_kind == "thread":
+            # Same process: the request's context comes along, e.g. for profiling (see app.profiling)
+            call = functools.partial(contextvars.copy_context().run, call)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def run_local(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Runs `fn(*args, **kwargs)` off the event loop but in this process, for work on in-process state."""
+        executor = self._executor if self.executor_kind == "thread" else self._local_executor
+        if executor is None:
+            return fn(*args, **kwargs)
+        # Run in a copy of the caller's context, so stages inside keep the request's endpoint label
+        call = functools.partial(contextvars.copy_context().run, call_profiled, fn, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+    async def predict(self, resume_texts: List[str], jd_texts: List[str],
+                      resume_vectors: Optional[sp.csr_matrix] = None) -> List[int]:
+        """Model scores for the (resume, JD) pairs; small requests share a predict call with concurrent ones."""
+        request: ScoringRequest = (resume_texts, jd_texts, resume_vectors)
+        if len(resume_texts) >= self.max_batch_pairs:
+            # Already a full batch: no reason to wait for company
+            return (await self._run_batch([request]))[0]
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((request, future))
+        self._pending_pairs += len(resume_texts)
+        if self._pending_pairs >= self.max_batch_pairs:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending, self._pending_pairs = self._pending, [], 0
+        if not batch:
+            return
+
+        def deliver(task: asyncio.Task) -> None:
+            self._batches.discard(task)
+            for index, (_, future) in enumerate(batch):
+                if future.done():  # the caller went away
+                    continue
+                if task.cancelled():
+                    future.cancel()
+                elif task.exception() is not None:
+                    future.set_exception(task.exception())
+                elif isinstance(task.result()[index], BaseException):
+                    future.set_exception(task.result()[index])
+                else:
+                    future.set_result(task.result()[index])
+
+        task = asyncio.ensure_future(self._run_isolated([request for request, _ in batch]))
+        self._batches.add(task)
+        task.add_done_callback(deliver)
+
+    async def _run_isolated(self, requests: List[ScoringRequest]) -> List[Union[List[int], Exception]]:
+        """Scores merged requests; if the batch fails, retries each alone and returns the failures in place."""
+        try:
+            return await self._run_batch(requests)
+        except Exception:
+            if len(requests) == 1:
+                raise
+        results = await asyncio.gather(*(self._run_batch([request]) for request in requests), return_exceptions=True)
+        return [result if isinstance(result, BaseException) else result[0] for result in results]
+
+    async def _run_batch(self, requests: List[ScoringRequest]) -> List[List[int]]:
+        SCORING_BATCH_REQUESTS.observe(len(requests))
+        SCORING_BATCH_PAIRS.observe(sum(len(texts) for texts, _, _ in requests))
+        return await self._run(predict_batch, requests)
+
+    async def rank(self, resume_text: str, job_texts: List[str], resume_vector: Optional[sp.csr_matrix] = None) -> np.ndarray:
+        """Similarity of each job text to the resume. A search ranks all its jobs in one call, so these aren't batched."""
+        return await self._run(rank_jobs, resume_text, job_texts, resume_vector)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._local_executor is not None:
+            self._local_executor.shutdown(wait=False, cancel_futures=True)
+            self._local_executor = None
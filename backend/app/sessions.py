@@ -0,0 +1,74 @@
+# backend\app\sessions.py
+import threading
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from cachetools import TTLCache
+
+from app.metrics import stage
+from app.text_processing import AnalyzedDocument, analyze
+
+
+class ResumeSession:
+    """One resume plus everything derived from it, each computed on first use and then reused.
+
+    Text-level views (cleaned text, keywords, inferred role) come from the analyzed document; model
+    artifacts such as TF-IDF vectors are added through `derive`, and the LLM parse through `parsed`.
+    """
+
+    def __init__(self, resume_text: str, resume_id: Optional[str] = None):
+        self.resume_id = resume_id
+        self.resume_text = resume_text
+        with stage("resume_analysis"):
+            self.document: AnalyzedDocument = analyze(resume_text)
+        self.parsed: Optional[Dict[str, Any]] = None
+        self._derived: Dict[str, Any] = {}
+
+    @property
+    def cleaned_text(self) -> str:
+        return self.document.cleaned
+
+    def derive(self, name: str, compute: Callable[[], Any]) -> Any:
+        # Two concurrent first uses may both compute; the results are identical, so either is kept.
+        if name not in self._derived:
+            self._derived[name] = compute()
+        return self._derived[name]
+
+
+class ResumeSessionStore:
+    """Uploaded resumes by id, so clients send the text once and refer to it afterwards.
+
+    The store is bounded and entries expire after `ttl_seconds` without use.
+    """
+
+    def __init__(self, max_sessions: int, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._sessions: TTLCache = TTLCache(maxsize=max_sessions, ttl=ttl_seconds)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def create(self, resume_text: str) -> ResumeSession:
+        session = ResumeSession(resume_text, resume_id=uuid.uuid4().hex)
+        with self._lock:
+            self._sessions[session.resume_id] = session
+        return session
+
+    def get(self, resume_id: str) -> Optional[ResumeSession]:
+        with self._lock:
+            session = self._sessions.get(resume_id)
+            if session is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # Re-inserting restarts the expiry clock, so sessions in use stay alive
+            self._sessions[resume_id] = session
+        return session
+
+    def delete(self, resume_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(resume_id, None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"sessions": len(self._sessions), "hits": self.hits, "misses": self.misses}
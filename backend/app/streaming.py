@@ -0,0 +1,66 @@
+# backend\app\streaming.py
+import json
+from typing import Any, List, Optional, Tuple
+
+
+class IncrementalJSONObjectParser:
+    """Parses a JSON object as it streams in and reports each top-level member once it is complete.
+
+    Text before the opening brace (e.g. a ```json fence) is skipped. Every character is scanned once,
+    so feeding the whole response chunk by chunk costs the same as parsing it in one go.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start: Optional[int] = None
+        self.finished = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consumes `chunk` and returns the (key, value) members completed by it."""
+        self._buffer += chunk
+        completed: List[Tuple[str, Any]] = []
+        buffer = self._buffer
+        for index in range(self._position, len(buffer)):
+            if self.finished:
+                break
+            char = buffer[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._member_start = index + 1
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 1:
+                    completed.extend(self._complete_member(index))
+                    self.finished = True
+                self._depth -= 1
+            elif char == "," and self._depth == 1:
+                completed.extend(self._complete_member(index))
+                self._member_start = index + 1
+        self._position = len(buffer)
+        return completed
+
+    def _complete_member(self, end: int) -> List[Tuple[str, Any]]:
+        member = self._buffer[self._member_start:end].strip()
+        if not member:
+            return []
+        return list(json.loads("{" + member + "}").items())
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encodes one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
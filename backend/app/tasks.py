@@ -0,0 +1,52 @@
+# backend\app\tasks.py
+import asyncio
+import threading
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from cachetools import TTLCache
+
+
+class BackgroundJobStore:
+    """Runs coroutines in the background and keeps their outcome, retrievable by job id.
+
+    Finished jobs go into a bounded store whose entries expire, so results nobody collects don't
+    accumulate. Running jobs are held separately until they finish: that keeps their task referenced
+    (the event loop only holds weak references) and lets a client poll a job however long it runs.
+    """
+
+    def __init__(self, max_jobs: int, ttl_seconds: float):
+        self._jobs: TTLCache = TTLCache(maxsize=max_jobs, ttl=ttl_seconds)
+        self._running: Dict[str, Dict[str, Any]] = {}
+        self._tasks: set = set()
+        self._lock = threading.Lock()
+
+    def submit(self, compute: Callable[[], Awaitable[Any]]) -> str:
+        job_id = uuid.uuid4().hex
+        job: Dict[str, Any] = {"status": "pending", "result": None, "error": None}
+        with self._lock:
+            self._running[job_id] = job
+        task = asyncio.ensure_future(self._run(job_id, job, compute))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job_id
+
+    async def _run(self, job_id: str, job: Dict[str, Any], compute: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            job["result"] = await compute()
+            job["status"] = "complete"
+        except Exception as e:
+            job["error"] = getattr(e, "detail", None) or str(e)
+            job["status"] = "failed"
+        finally:
+            if job["status"] == "pending":  # cancelled, e.g. on shutdown
+                job["error"], job["status"] = "Cancelled.", "failed"
+            with self._lock:
+                self._jobs[job_id] = self._running.pop(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._running.get(job_id) or self._jobs.get(job_id)
+        if job is None:
+            return None
+        return {"status": job["status"], "result": job["result"], "error": job["error"]}
@@ -0,0 +1,102 @@
+# backend\app\text_processing.py
+"""Text normalization and analysis shared by the API and the ml_model training scripts.
+
+Training and inference must clean text identically, so both import `clean_text` from here. Every
+pattern is compiled once at import time.
+"""
+import re
+from collections import Counter
+from functools import cached_property, lru_cache
+from typing import Dict, List, Set
+
+ROLE_KEYWORDS = [
+    "software engineer",
+    "frontend developer",
+    "backend developer",
+    "full stack developer",
+    "data scientist",
+    "machine learning engineer",
+    "product manager",
+    "project manager",
+    "business analyst",
+    "marketing manager",
+    "ui ux designer",
+    "devops engineer",
+    "mobile developer",
+    "cloud architect",
+    "cyber security engineer",
+]
+DEFAULT_ROLE = "software engineer"
+
+RESUME_STOPWORDS = {
+    "and", "the", "for", "with", "that", "this", "from", "your", "have", "has",
+    "experience", "skills", "years", "work", "team", "you", "are", "our", "job",
+    "role", "project", "projects", "company", "ability", "knowledge", "responsible"
+}
+
+# Application fields a posting asks for, keyed by the phrases that reveal them (in reporting order)
+REQUIREMENT_KEYWORDS: Dict[str, List[str]] = {
+    "cover_letter": ["cover letter", "motivation letter"],
+    "portfolio_link": ["portfolio", "github", "dribbble", "behance"],
+    "salary_expectation": ["salary expectation", "expected salary"],
+    "availability": ["availability", "notice period"],
+}
+
+# Tags and non-alphanumerics are stripped in one alternation; whitespace is collapsed by split/join.
+_STRIP_PATTERN = re.compile(r"<[^>]+>|[^a-zA-Z0-9\s]")
+_KEYWORD_PATTERN = re.compile(r"\b[a-zA-Z]{3,}\b")
+
+_ROLE_RANK = {role: rank for rank, role in enumerate(ROLE_KEYWORDS)}
+_PHRASE_FIELDS = {phrase: field for field, phrases in REQUIREMENT_KEYWORDS.items() for phrase in phrases}
+# Every role and requirement phrase, deduplicated. Checking them with C-level substring search over the
+# once-lowered text is several times faster than a regex alternation (see benchmarks/text_processing_bench.py).
+_PHRASES = tuple(dict.fromkeys([*ROLE_KEYWORDS, *_PHRASE_FIELDS]))
+
+
+def clean_text(text: str) -> str:
+    """Removes HTML tags and special characters, lower-cases and collapses whitespace."""
+    if not isinstance(text, str):
+        return ""
+    return " ".join(_STRIP_PATTERN.sub("", text).lower().split())
+
+
+class AnalyzedDocument:
+    """One resume or job description, lower-cased once; each derived view is computed on first use."""
+
+    def __init__(self, text: str):
+        self.text = text if isinstance(text, str) else ""
+        self.lowered = self.text.lower()
+
+    @cached_property
+    def cleaned(self) -> str:
+        return clean_text(self.text)
+
+    @cached_property
+    def keyword_counts(self) -> Counter:
+        return Counter([token for token in _KEYWORD_PATTERN.findall(self.lowered) if token not in RESUME_STOPWORDS])
+
+    @cached_property
+    def phrases(self) -> Set[str]:
+        """Every role / requirement phrase occurring anywhere in the text."""
+        lowered = self.lowered
+        return {phrase for phrase in _PHRASES if phrase in lowered}
+
+    def keywords(self, top_k: int = 6) -> List[str]:
+        return [word for word, _ in self.keyword_counts.most_common(top_k)]
+
+    @property
+    def primary_role(self) -> str:
+        """The first entry of ROLE_KEYWORDS that the text mentions."""
+        roles = [phrase for phrase in self.phrases if phrase in _ROLE_RANK]
+        return min(roles, key=_ROLE_RANK.__getitem__) if roles else DEFAULT_ROLE
+
+    @property
+    def required_fields(self) -> List[str]:
+        found = {_PHRASE_FIELDS[phrase] for phrase in self.phrases if phrase in _PHRASE_FIELDS}
+        return [field for field in REQUIREMENT_KEYWORDS if field in found]
+
+
+@lru_cache(maxsize=256)
+def analyze(text: str) -> AnalyzedDocument:
+    """Shared, memoized analysis so several helpers looking at the same resume scan it once."""
+    return AnalyzedDocument(text)
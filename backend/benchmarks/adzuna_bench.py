@@ -0,0 +1,105 @@
+# backend\benchmarks\adzuna_bench.py
+"""Compares the old blocking `requests.get` Adzuna call with the pooled async client.
+
+Run from the `backend/` directory:
+    python -m benchmarks.adzuna_bench --latency 0.02 --searches 100 --concurrency 25
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import requests
+
+from benchmarks.fakes import StubAdzunaServer
+
+SEARCH_ARGS = ("python developer", "Bengaluru", None, 10)
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def legacy_request(main, keywords, loc, filters, limit):
+    """The pre-pool implementation: a fresh connection per call, executed on the event loop."""
+    params = {"app_id": main.ADZUNA_APP_ID, "app_key": main.ADZUNA_APP_KEY, "what": keywords, "where": loc,
+              "results_per_page": min(50, max(limit, 10))}
+    endpoint = main.ADZUNA_ENDPOINT_TEMPLATE.format(country=main.ADZUNA_COUNTRY, page=1)
+    response = requests.get(endpoint, params=params, timeout=15)
+    response.raise_for_status()
+    return response.json()
+
+
+async def timed(coro_factory):
+    started = time.perf_counter()
+    await coro_factory()
+    return (time.perf_counter() - started) * 1000
+
+
+async def probe_event_loop(stop: asyncio.Event, lags: list):
+    """Stands in for an ATS request sharing the worker: records how late each 1ms tick fires."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append((time.perf_counter() - started) * 1000 - 1)
+
+
+async def run(main, request_fn, searches: int, concurrency: int):
+    sequential = [await timed(lambda: request_fn(main, *SEARCH_ARGS)) for _ in range(searches)]
+
+    stop, lags = asyncio.Event(), []
+    probe = asyncio.create_task(probe_event_loop(stop, lags))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded():
+        async with semaphore:
+            await request_fn(main, *SEARCH_ARGS)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(bounded() for _ in range(searches)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    return sequential, searches / elapsed, lags
+
+
+async def pooled_request(main, *args):
+    return await main._adzuna_request(*args)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub Adzuna latency per call in seconds.")
+    parser.add_argument("--searches", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=25)
+    args = parser.parse_args()
+
+    with StubAdzunaServer(latency=args.latency) as stub:
+        os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+        os.environ.setdefault("RESUME_CACHE_BACKEND", "memory")
+        os.environ.update(ADZUNA_APP_ID="bench", ADZUNA_APP_KEY="bench", ADZUNA_ENDPOINT_TEMPLATE=stub.endpoint_template)
+        import main
+        from app.http_client import PooledHTTPClient
+
+        async def pooled_run():
+            main.service_clients["http"] = PooledHTTPClient()
+            try:
+                return await run(main, pooled_request, args.searches, args.concurrency)
+            finally:
+                await main.service_clients.pop("http").aclose()
+
+        results = {
+            "legacy_requests": asyncio.run(run(main, legacy_request, args.searches, args.concurrency)),
+            "pooled_httpx": asyncio.run(pooled_run()),
+        }
+
+    print(f"{'client':<18}{'p50 ms':>9}{'p95 ms':>9}{'searches/s':>12}{'max loop lag ms':>17}")
+    for name, (sequential, throughput, lags) in results.items():
+        print(f"{name:<18}{statistics.median(sequential):>9.2f}{percentile(sequential, 0.95):>9.2f}"
+              f"{throughput:>12.1f}{max(lags, default=0):>17.1f}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,63 @@
+# backend\benchmarks\compare.py
+"""Lines up two result files of the same benchmark and prints the change in every measurement.
+
+Run from the `backend/` directory:
+    python -m benchmarks.compare benchmarks/results/load_test-A.json benchmarks/results/load_test-B.json
+"""
+import argparse
+import json
+from typing import Any, Dict, Tuple
+
+HIGHER_IS_BETTER = ("throughput_rps", "calls_per_s")
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "mean_ms")
+# Fields that describe the outcome rather than identify the row
+_OUTCOME_FIELDS = set(HIGHER_IS_BETTER + LOWER_IS_BETTER) | {"max_ms", "elapsed_s", "errors", "calls", "input_mb"}
+
+
+def row_key(row: Dict[str, Any]) -> Tuple:
+    return tuple(sorted((key, str(value)) for key, value in row.items() if key not in _OUTCOME_FIELDS))
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=5.0, help="Flag changes worse than this many percent.")
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    if baseline["benchmark"] != candidate["benchmark"]:
+        raise SystemExit(f"Can't compare a '{baseline['benchmark']}' run with a '{candidate['benchmark']}' run.")
+    for label, document in (("baseline", baseline), ("candidate", candidate)):
+        environment = document["environment"]
+        print(f"{label:<10} {document['started_at']}  commit {environment['git_commit'] or '?'}  "
+              f"{environment['cpu_count']} CPUs  python {environment['python']}")
+
+    baseline_rows = {row_key(row): row for row in baseline["results"]}
+    regressions = 0
+    for row in candidate["results"]:
+        key = row_key(row)
+        before = baseline_rows.get(key)
+        name = " ".join(value for _, value in key)
+        if before is None:
+            print(f"\n{name}: not in the baseline")
+            continue
+        print(f"\n{name}")
+        for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            if metric not in row or not before.get(metric):
+                continue
+            change = (row[metric] - before[metric]) / before[metric] * 100
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            flag = "  <-- regression" if worse > args.threshold else ""
+            regressions += bool(flag)
+            print(f"  {metric:<16}{before[metric]:>12.3f}{row[metric]:>12.3f}{change:>+9.1f}%{flag}")
+    print(f"\n{regressions} measurement(s) regressed by more than {args.threshold}%.")
+
+
+if __name__ == "__main__":
+    main_cli()
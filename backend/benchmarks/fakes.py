@@ -0,0 +1,145 @@
+# backend\benchmarks\fakes.py
+"""Deterministic offline stand-ins for the external services used by the API."""
+import asyncio
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FAKE_RESUME_JSON = {
+    "full_name": "Jane Doe",
+    "email": "jane.doe@example.com",
+    "summary": "Backend engineer with 5 years of Python experience.",
+    "categorized_skills": {"programming_languages": ["Python", "SQL"]},
+    "work_experience": [
+        {"job_title": "Software Engineer", "company": "Acme", "description": ["Built REST APIs with FastAPI."]}
+    ],
+    "education": [{"degree": "B.Tech", "institution": "Example University"}],
+}
+
+FAKE_ATS_JSON = {
+    "summary": "The resume is a reasonable match for the role.",
+    "strengths": ["Strong Python background", "API design experience"],
+    "areas_for_improvement": ["Quantify impact", "Mention cloud tooling"],
+    "keyword_analysis": {"matching_keywords": ["python", "fastapi"], "missing_keywords": ["kubernetes"]},
+    "rewrite_suggestions": [
+        {"original_bullet": "Built REST APIs with FastAPI.", "suggested_improvement": "Built 12 FastAPI services serving 2M requests/day."}
+    ],
+}
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+def _fake_payload(prompt: str) -> str:
+    if "Career Strategist" in prompt:
+        return json.dumps(FAKE_ATS_JSON)
+    return json.dumps(FAKE_RESUME_JSON)
+
+
+class FakeGenerativeModel:
+    """Mimics `genai.GenerativeModel` with a fixed latency per call.
+
+    `generate_content` blocks the calling thread for `latency` seconds, exactly like the real SDK;
+    `generate_content_async` is only exposed when `native_async=True`.
+    """
+
+    def __init__(self, latency: float = 0.5, native_async: bool = True):
+        self.latency = latency
+        self.calls = 0
+        if native_async:
+            self.generate_content_async = self._generate_content_async
+
+    def generate_content(self, prompt, generation_config=None, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        return FakeResponse(_fake_payload(prompt))
+
+    async def _generate_content_async(self, prompt, generation_config=None, stream=False, **kwargs):
+        self.calls += 1
+        if stream:
+            return FakeStream(_fake_payload(prompt), self.latency)
+        await asyncio.sleep(self.latency)
+        return FakeResponse(_fake_payload(prompt))
+
+
+class FakeStream:
+    """Async iterator over a payload split into `chunks` pieces spread evenly across `latency`."""
+
+    def __init__(self, text: str, latency: float, chunks: int = 20):
+        size = max(1, len(text) // chunks)
+        self._pieces = [text[i:i + size] for i in range(0, len(text), size)]
+        self._delay = latency / len(self._pieces)
+
+    async def __aiter__(self):
+        for piece in self._pieces:
+            await asyncio.sleep(self._delay)
+            yield FakeResponse(piece)
+
+
+# --- Stub Adzuna Server ---
+
+def make_adzuna_results(what: str, count: int, start: int = 0) -> list:
+    return [
+        {
+            "id": f"{zlib.crc32(what.encode())}-{i}",
+            "title": f"{what.title()} {i}",
+            "company": {"display_name": f"Company {i % 7}"},
+            "location": {"display_name": "Bengaluru, Karnataka"},
+            "salary_min": 600000 + i * 1000,
+            "salary_max": 900000 + i * 1000,
+            "description": f"We are hiring a {what} with Python, SQL and cloud experience. Share your portfolio and notice period.",
+            "redirect_url": f"https://jobs.example.com/{i}",
+            "created": "2025-01-01T00:00:00Z",
+        }
+        for i in range(start, start + count)
+    ]
+
+
+class _AdzunaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients can reuse connections
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        page = int(url.path.rstrip("/").rsplit("/", 1)[-1] or 1)
+        what = query.get("what", ["software engineer"])[0]
+        per_page = int(query.get("results_per_page", ["10"])[0])
+        time.sleep(self.server.latency)
+        body = json.dumps({"count": per_page * 10, "results": make_adzuna_results(what, per_page, (page - 1) * per_page)}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubAdzunaServer:
+    """Local Adzuna look-alike on a background thread. Use as a context manager."""
+
+    def __init__(self, latency: float = 0.05, port: int = 0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), _AdzunaHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def endpoint_template(self) -> str:
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}/v1/api/jobs/{{country}}/search/{{page}}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,104 @@
+# backend\benchmarks\harness.py
+"""Shared pieces of the benchmark suite: the offline app, latency summaries and JSON result files.
+
+Every benchmark writes one JSON document:
+
+    {"benchmark": ..., "started_at": ..., "environment": {...}, "parameters": {...}, "results": [...]}
+
+where each result row carries identifying fields (endpoint, concurrency, ...) plus its measurements,
+so two runs can be lined up with `python -m benchmarks.compare <baseline.json> <candidate.json>`.
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from benchmarks.fakes import FakeGenerativeModel, StubAdzunaServer
+
+DATASET = os.path.join(os.path.dirname(__file__), "..", "..", "ml_model", "UpdatedResumeDataSet.csv")
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def load_resumes(limit: int = 0) -> List[str]:
+    """Distinct resumes from the dataset in file order (the CSV repeats many of them)."""
+    resumes = pd.read_csv(DATASET)["Resume"].fillna("").drop_duplicates().tolist()
+    return resumes[:limit] if limit else resumes
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def summarize_ms(samples_ms: Sequence[float]) -> Dict[str, float]:
+    if not samples_ms:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0, "max_ms": 0.0}
+    return {
+        "p50_ms": round(percentile(samples_ms, 0.50), 3),
+        "p95_ms": round(percentile(samples_ms, 0.95), 3),
+        "p99_ms": round(percentile(samples_ms, 0.99), 3),
+        "mean_ms": round(sum(samples_ms) / len(samples_ms), 3),
+        "max_ms": round(max(samples_ms), 3),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def write_results(name: str, parameters: Dict[str, Any], results: List[Dict[str, Any]], output: str = "") -> str:
+    """Writes a result document and returns its path (default: benchmarks/results/<name>-<UTC time>.json)."""
+    started_at = datetime.now(timezone.utc)
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{name}-{started_at:%Y%m%dT%H%M%SZ}.json")
+    document = {
+        "benchmark": name,
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "environment": {
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "parameters": parameters,
+        "results": results,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    return output
+
+
+@asynccontextmanager
+async def offline_app(llm_latency: float, adzuna_latency: float, scoring: Optional[Dict[str, str]] = None) -> AsyncIterator[Any]:
+    """Yields the started `main` module wired to a fake Gemini model and a local stub Adzuna server.
+
+    The lifespan runs as it does under uvicorn, so the model bundle, scoring pool, job ranker and HTTP
+    pool are real. `scoring` overrides SCORING_* settings (e.g. {"SCORING_EXECUTOR": "process"}); it
+    takes effect on the first import of the app, i.e. once per benchmark process.
+    """
+    os.environ.update(scoring or {})
+    with StubAdzunaServer(latency=adzuna_latency) as stub:
+        os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+        os.environ.setdefault("RESUME_CACHE_BACKEND", "memory")
+        os.environ.setdefault("ATS_CACHE_BACKEND", "memory")
+        os.environ.update(ADZUNA_APP_ID="bench", ADZUNA_APP_KEY="bench", ADZUNA_ENDPOINT_TEMPLATE=stub.endpoint_template)
+        import main
+        from app.llm import AsyncLLMClient
+
+        # Also set on the module, in case it was imported (and read its configuration) by an earlier run
+        main.ADZUNA_APP_ID = main.ADZUNA_APP_KEY = "bench"
+        main.ADZUNA_ENDPOINT_TEMPLATE = stub.endpoint_template
+        main.llm_client = AsyncLLMClient(FakeGenerativeModel(latency=llm_latency))
+        async with main.lifespan(main.app):
+            yield main
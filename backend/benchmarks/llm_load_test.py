@@ -0,0 +1,64 @@
+# backend\benchmarks\llm_load_test.py
+"""Load test for the LLM-backed endpoints against a local fake Gemini model.
+
+Run from the `backend/` directory:
+    python -m benchmarks.llm_load_test --latency 0.2 --concurrency 1 10 50 200
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+os.environ.setdefault("RESUME_CACHE_BACKEND", "memory")
+
+import main  # noqa: E402
+from app.llm import AsyncLLMClient  # noqa: E402
+from app.models import ResumeInput  # noqa: E402
+from benchmarks.fakes import FakeGenerativeModel  # noqa: E402
+
+SAMPLE_RESUME = "Jane Doe\nSoftware Engineer\nBuilt REST APIs with FastAPI and Python for 5 years."
+
+
+class BlockingLLMClient(AsyncLLMClient):
+    """Reproduces the old behaviour: the sync SDK call runs directly on the event loop."""
+
+    async def generate_text(self, prompt, generation_config=None, timeout=None):
+        return self.model.generate_content(prompt, generation_config=generation_config).text
+
+
+async def run_scenario(client: AsyncLLMClient, concurrency: int) -> float:
+    client_id = id(client)
+    main.llm_client = client
+    started = time.perf_counter()
+    # Every request gets a distinct resume so the parse cache never short-circuits the LLM call.
+    await asyncio.gather(*(
+        main.parse_resume(ResumeInput(resume_text=f"{SAMPLE_RESUME} {client_id}-{i}"))
+        for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    client.close()
+    return elapsed
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake LLM latency per call in seconds.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 200])
+    args = parser.parse_args()
+
+    scenarios = {
+        "legacy_blocking": lambda: BlockingLLMClient(FakeGenerativeModel(args.latency, native_async=False)),
+        "bounded_executor": lambda: AsyncLLMClient(FakeGenerativeModel(args.latency, native_async=False)),
+        "native_async": lambda: AsyncLLMClient(FakeGenerativeModel(args.latency, native_async=True)),
+    }
+
+    print(f"{'scenario':<18}{'concurrency':>12}{'elapsed (s)':>14}{'req/s':>10}")
+    for name, factory in scenarios.items():
+        for concurrency in args.concurrency:
+            elapsed = asyncio.run(run_scenario(factory(), concurrency))
+            print(f"{name:<18}{concurrency:>12}{elapsed:>14.2f}{concurrency / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main_cli()
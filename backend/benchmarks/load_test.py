@@ -0,0 +1,131 @@
+# backend\benchmarks\load_test.py
+"""Closed-loop HTTP load test of the parse, ATS and job-search endpoints.
+
+By default the app runs in-process (through the full middleware stack) against the fake Gemini model
+and the stub Adzuna server, so results are reproducible offline. For every endpoint and concurrency
+level, `concurrency` clients each send their next request as soon as the previous one completes, and
+the run reports throughput plus p50/p95/p99 latency.
+
+Run from the `backend/` directory:
+    python -m benchmarks.load_test --concurrency 1 8 32 --requests 200 --llm-latency 0.3 --adzuna-latency 0.05
+
+Pass `--base-url http://host:8000` to load an already running server instead (its own Gemini and
+Adzuna configuration then applies). Resumes get a per-request suffix so the LLM caches miss;
+`--cache-hits` sends the dataset resumes unchanged instead.
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.fakes import make_adzuna_results
+from benchmarks.harness import load_resumes, offline_app, summarize_ms, write_results
+
+JOB_DESCRIPTIONS = [make_adzuna_results(role, 1)[0]["description"]
+                    for role in ("python developer", "data scientist", "java developer", "devops engineer")]
+
+# endpoint name -> (path, body builder taking (resume text, request number))
+ENDPOINTS: Dict[str, tuple] = {
+    "parse": ("/api/v1/resumes/parse", lambda resume, n: {"resume_text": resume}),
+    "analyze_ats": ("/api/v1/resumes/analyze-ats",
+                    lambda resume, n: {"resume_text": resume, "job_description": JOB_DESCRIPTIONS[n % len(JOB_DESCRIPTIONS)]}),
+    "analyze_ats_score": ("/api/v1/resumes/analyze-ats/score",
+                          lambda resume, n: {"resume_text": resume, "job_description": JOB_DESCRIPTIONS[n % len(JOB_DESCRIPTIONS)]}),
+    "job_search": ("/api/v1/jobs/search", lambda resume, n: {"resume_text": resume, "limit": 10}),
+}
+
+
+async def run_level(client: httpx.AsyncClient, endpoint: str, concurrency: int, requests: int,
+                    resume_for: Callable[[int], str]) -> Dict[str, Any]:
+    path, build_body = ENDPOINTS[endpoint]
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    next_request = 0
+
+    async def worker():
+        nonlocal next_request
+        while next_request < requests:
+            n = next_request
+            next_request += 1
+            started = time.perf_counter()
+            try:
+                response = await client.post(path, json=build_body(resume_for(n), n))
+                status = str(response.status_code)
+            except httpx.HTTPError as exc:
+                status = type(exc).__name__
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status != "200":
+                errors[status] = errors.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2),
+        **summarize_ms(latencies),
+    }
+
+
+async def run(args: argparse.Namespace, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
+    resumes = load_resumes(args.resumes)
+    results = []
+    print(f"{'endpoint':<20}{'conc':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for endpoint in args.endpoints:
+        for concurrency in args.concurrency:
+            run_tag = f"{endpoint}-{concurrency}"
+
+            def resume_for(n: int, run_tag=run_tag) -> str:
+                resume = resumes[n % len(resumes)]
+                return resume if args.cache_hits else f"{resume}\nReference: {run_tag}-{n}"
+
+            # One untimed request first, so connection setup and lazy initialization aren't measured
+            await run_level(client, endpoint, 1, 1, lambda n: f"{resumes[0]}\nWarm-up: {run_tag}")
+            result = await run_level(client, endpoint, concurrency, args.requests, resume_for)
+            results.append(result)
+            print(f"{endpoint:<20}{concurrency:>6}{result['throughput_rps']:>10.1f}{result['p50_ms']:>10.1f}"
+                  f"{result['p95_ms']:>10.1f}{result['p99_ms']:>10.1f}{sum(result['errors'].values()):>8}")
+    return results
+
+
+async def main_async(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    timeout = httpx.Timeout(args.timeout)
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=timeout) as client:
+            return await run(args, client)
+    scoring = {"SCORING_EXECUTOR": args.scoring_executor} if args.scoring_executor else None
+    async with offline_app(args.llm_latency, args.adzuna_latency, scoring) as main:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=timeout) as client:
+            return await run(args, client)
+
+
+def main_cli(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=100, help="Requests per endpoint and concurrency level.")
+    parser.add_argument("--resumes", type=int, default=0, help="Use only the first N distinct dataset resumes (0 = all).")
+    parser.add_argument("--cache-hits", action="store_true", help="Send dataset resumes unchanged, so repeats hit the caches.")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="Fake Gemini latency per call in seconds.")
+    parser.add_argument("--adzuna-latency", type=float, default=0.05, help="Stub Adzuna latency per call in seconds.")
+    parser.add_argument("--scoring-executor", choices=["inline", "thread", "process"], default="",
+                        help="Scoring pool executor for the offline app (default: SCORING_EXECUTOR or 'thread').")
+    parser.add_argument("--base-url", default="", help="Load a running server instead of the in-process offline app.")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Client timeout per request in seconds.")
+    parser.add_argument("--output", default="", help="Result file (default: benchmarks/results/load_test-<time>.json).")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(main_async(args))
+    parameters = {key: value for key, value in vars(args).items() if key != "output"}
+    print(f"Results written to {write_results('load_test', parameters, results, args.output)}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,89 @@
+# backend\benchmarks\micro_bench.py
+"""Per-call latency of the CPU-bound helpers behind the ATS and job-search endpoints.
+
+Each helper is called once per resume from UpdatedResumeDataSet.csv (distinct resumes, file order),
+`--repeats` times over, and awaited before the next call:
+
+    clean_text                        the resume text
+    predict_score_with_custom_model   the resume against one of a fixed set of job descriptions
+    score_jobs_against_resume         a fresh resume session against N stub job postings, for each --jobs N
+
+The scoring pool runs inline with no batching window by default, so the numbers are the CPU cost
+of one call; pass e.g. `--scoring-executor thread` to include the pool hand-off.
+
+Run from the `backend/` directory:
+    python -m benchmarks.micro_bench --repeats 3 --jobs 25 250
+"""
+import argparse
+import asyncio
+import inspect
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from benchmarks.harness import load_resumes, offline_app, summarize_ms, write_results
+from benchmarks.load_test import JOB_DESCRIPTIONS
+from benchmarks.ranking_bench import make_jobs
+
+
+async def call(fn: Callable[[str, int], Any], resume: str, index: int) -> Any:
+    result = fn(resume, index)
+    return await result if inspect.isawaitable(result) else result
+
+
+async def measure(name: str, fn: Callable[[str, int], Any], resumes: Sequence[str], repeats: int, **fields) -> Dict[str, Any]:
+    await call(fn, resumes[0], 0)  # warm-up
+    latencies: List[float] = []
+    for _ in range(repeats):
+        for index, resume in enumerate(resumes):
+            started = time.perf_counter()
+            await call(fn, resume, index)
+            latencies.append((time.perf_counter() - started) * 1000)
+    total_s = sum(latencies) / 1000
+    result = {"benchmark": name, **fields, "calls": len(latencies),
+              "calls_per_s": round(len(latencies) / total_s, 2), **summarize_ms(latencies)}
+    print(f"{name:<34}{fields.get('jobs', ''):>6}{result['calls_per_s']:>12.1f}{result['p50_ms']:>10.3f}"
+          f"{result['p95_ms']:>10.3f}{result['p99_ms']:>10.3f}")
+    return result
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    resumes = load_resumes(args.resumes)
+    print(f"{len(resumes)} resumes, {args.repeats} repeat(s)")
+    scoring = {"SCORING_EXECUTOR": args.scoring_executor, "SCORING_BATCH_WINDOW_MS": str(args.batch_window_ms)}
+    async with offline_app(llm_latency=0, adzuna_latency=0, scoring=scoring) as main:
+        from app.sessions import ResumeSession
+        from app.text_processing import clean_text
+
+        print(f"{'benchmark':<34}{'jobs':>6}{'calls/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        results = [
+            await measure("clean_text", lambda resume, i: clean_text(resume), resumes, args.repeats,
+                          input_mb=round(sum(map(len, resumes)) / 1e6, 3)),
+            await measure("predict_score_with_custom_model",
+                          lambda resume, i: main.predict_score_with_custom_model(resume, JOB_DESCRIPTIONS[i % len(JOB_DESCRIPTIONS)]),
+                          resumes, args.repeats),
+        ]
+        for count in args.jobs:
+            jobs = make_jobs(count)
+            results.append(await measure("score_jobs_against_resume",
+                                         lambda resume, i: main.score_jobs_against_resume(ResumeSession(resume), jobs),
+                                         resumes, args.repeats, jobs=count))
+    return results
+
+
+def main_cli(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--resumes", type=int, default=0, help="Use only the first N distinct dataset resumes (0 = all).")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[25, 250], help="Job postings ranked per call.")
+    parser.add_argument("--scoring-executor", choices=["inline", "thread", "process"], default="inline")
+    parser.add_argument("--batch-window-ms", type=float, default=0.0, help="Scoring pool micro-batching window.")
+    parser.add_argument("--output", default="", help="Result file (default: benchmarks/results/micro_bench-<time>.json).")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    parameters = {key: value for key, value in vars(args).items() if key != "output"}
+    print(f"Results written to {write_results('micro_bench', parameters, results, args.output)}")
+
+
+if __name__ == "__main__":
+    main_cli()
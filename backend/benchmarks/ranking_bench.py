@@ -0,0 +1,74 @@
+# backend\benchmarks\ranking_bench.py
+"""Per-request cost of job ranking: per-search vectorizer fitting vs the persistent ranking engine.
+
+Run from the `backend/` directory:
+    python -m benchmarks.ranking_bench --jobs 25 500 10000
+"""
+import argparse
+import os
+import time
+
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from app.model_bundle import load_model_bundle
+from app.models import JobPosting
+from app.ranking import JobRankingEngine, top_k_indices
+from benchmarks.fakes import make_adzuna_results
+
+DATASET = os.path.join(os.path.dirname(__file__), "..", "..", "ml_model", "UpdatedResumeDataSet.csv")
+ROLES = ["python developer", "data scientist", "devops engineer", "web designer", "java developer", "hr manager"]
+
+
+def make_jobs(count: int):
+    entries = []
+    for index in range(count):
+        what = ROLES[index % len(ROLES)]
+        entry = make_adzuna_results(what, index % 50 + 1)[-1]
+        entries.append(JobPosting(id=f"{index}", title=entry["title"], company=entry["company"]["display_name"],
+                                  description=entry["description"], url=entry["redirect_url"]))
+    return entries
+
+
+def legacy_rank(resume_text, jobs):
+    """The original implementation: fit a vectorizer per search, one cosine_similarity call per job, full sort."""
+    corpus = [resume_text] + [f"{job.title} {job.company} {job.description or ''}" for job in jobs]
+    tfidf_matrix = TfidfVectorizer(stop_words="english").fit_transform(corpus)
+    scores = [cosine_similarity(tfidf_matrix[0], tfidf_matrix[idx])[0][0] for idx in range(1, len(corpus))]
+    return sorted(range(len(jobs)), key=lambda i: scores[i], reverse=True)[:25]
+
+
+def engine_rank(engine, resume_text, jobs):
+    scores = engine.similarities(resume_text, [engine.job_text(job) for job in jobs])
+    return top_k_indices(scores, 25)
+
+
+def measure(fn, repeats: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - started) / repeats * 1000
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[25, 500, 10000])
+    parser.add_argument("--bundle", default="model_bundle")
+    parser.add_argument("--vectorizer", choices=["tfidf_resume", "tfidf_jd"], default="tfidf_resume")
+    args = parser.parse_args()
+
+    resume_text = pd.read_csv(DATASET)["Resume"].iloc[0]
+    engine = JobRankingEngine(load_model_bundle(args.bundle)[args.vectorizer])
+
+    print(f"{'jobs':>7}{'legacy ms':>12}{'engine ms':>12}{'speedup':>10}")
+    for count in args.jobs:
+        jobs = make_jobs(count)
+        repeats = max(1, 2000 // count)
+        legacy_ms = measure(lambda: legacy_rank(resume_text, jobs), repeats)
+        engine_ms = measure(lambda: engine_rank(engine, resume_text, jobs), repeats)
+        print(f"{count:>7}{legacy_ms:>12.2f}{engine_ms:>12.2f}{legacy_ms / engine_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,113 @@
+# backend\benchmarks\text_processing_bench.py
+"""Throughput of the original per-call regex helpers vs the shared text_processing module.
+
+Run from the `backend/` directory:
+    python -m benchmarks.text_processing_bench --repeats 5
+"""
+import argparse
+import os
+import re
+import time
+from collections import Counter
+
+import pandas as pd
+
+from app.text_processing import RESUME_STOPWORDS, ROLE_KEYWORDS, AnalyzedDocument, analyze, clean_text
+
+DATASET = os.path.join(os.path.dirname(__file__), "..", "..", "ml_model", "UpdatedResumeDataSet.csv")
+
+
+# --- The original implementations ---
+
+def legacy_clean_text(text):
+    if not isinstance(text, str):
+        return ""
+    text = re.sub(r'<[^>]+>', '', text)
+    text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
+    text = text.lower()
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def legacy_extract_keywords(resume_text, top_k=6):
+    tokens = re.findall(r'\b[a-zA-Z]{3,}\b', resume_text.lower())
+    filtered = [token for token in tokens if token not in RESUME_STOPWORDS]
+    return [word for word, _ in Counter(filtered).most_common(top_k)]
+
+
+def legacy_infer_primary_role(resume_text):
+    lowered = resume_text.lower()
+    for role in ROLE_KEYWORDS:
+        if role in lowered:
+            return role
+    return "software engineer"
+
+
+def legacy_infer_required_fields(description):
+    description_lower = description.lower()
+    requirements = []
+    if any(keyword in description_lower for keyword in ["cover letter", "motivation letter"]):
+        requirements.append("cover_letter")
+    if any(keyword in description_lower for keyword in ["portfolio", "github", "dribbble", "behance"]):
+        requirements.append("portfolio_link")
+    if "salary expectation" in description_lower or "expected salary" in description_lower:
+        requirements.append("salary_expectation")
+    if any(keyword in description_lower for keyword in ["availability", "notice period"]):
+        requirements.append("availability")
+    return requirements
+
+
+def legacy_analyze(text):
+    return legacy_clean_text(text), legacy_extract_keywords(text, 4), legacy_infer_primary_role(text), legacy_infer_required_fields(text)
+
+
+def shared_analyze(text):
+    document = AnalyzedDocument(text)
+    return document.cleaned, document.keywords(4), document.primary_role, document.required_fields
+
+
+def legacy_job_search(text):
+    # A cache-missing job search resolves keywords for the index lookup and again for the provider query
+    for _ in range(2):
+        legacy_extract_keywords(text, 4), legacy_infer_primary_role(text)
+
+
+def shared_job_search(text):
+    analyze.cache_clear()  # the corpus repeats resumes; measure a first-time visitor
+    for _ in range(2):
+        document = analyze(text)
+        document.keywords(4), document.primary_role
+
+
+def throughput(fn, texts, repeats: int) -> float:
+    """Megabytes of text processed per second."""
+    size_mb = sum(len(text) for text in texts) * repeats / 1e6
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for text in texts:
+            fn(text)
+    return size_mb / (time.perf_counter() - started)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = pd.read_csv(DATASET)["Resume"].fillna("").tolist()
+    mismatches = sum(legacy_analyze(text) != shared_analyze(text) for text in texts)
+    print(f"{len(texts)} resumes, {sum(map(len, texts)) / 1e6:.1f} MB; outputs differing from the original: {mismatches}")
+
+    print(f"{'stage':<22}{'legacy MB/s':>13}{'shared MB/s':>13}{'speedup':>10}")
+    for stage, legacy, shared in [
+        ("clean_text", legacy_clean_text, clean_text),
+        ("full analysis", legacy_analyze, shared_analyze),
+        ("job search keywords", legacy_job_search, shared_job_search),
+    ]:
+        legacy_rate = throughput(legacy, texts, args.repeats)
+        shared_rate = throughput(shared, texts, args.repeats)
+        print(f"{stage:<22}{legacy_rate:>13.1f}{shared_rate:>13.1f}{shared_rate / legacy_rate:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main_cli()
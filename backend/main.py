@@ -1,18 +1,21 @@
 import os
 import json
+import asyncio
+import math
 import re
-from collections import Counter
-import joblib
 import scipy.sparse as sp
 import numpy as np
-import requests
-from typing import Optional, List, Dict, Any, Tuple
+import httpx
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator, Awaitable, Callable, Collection
 from contextlib import asynccontextmanager
+from cachetools import TTLCache
 
 import google.generativeai as genai
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from dotenv import load_dotenv
+from pydantic import ValidationError
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
@@ -21,12 +24,29 @@ from app.models import (
     ResumeInput, ResumeOutput, ATSAnalysisInput, ATSAnalysisOutput,
     RewriteSuggestion, CategorizedSkills, Certification, Language,
     JobSearchInput, JobSearchResponse, JobPosting, JobSearchFilters,
-    JobApplyInput, JobApplyResponse, JobApplyAllInput
+    JobApplyInput, JobApplyResponse, JobApplyAllInput,
+    ATSBatchPair, ATSBatchInput, ATSBatchResult, ATSBatchOutput,
+    ATSScoreOutput, ATSAnalysisJobStatus, ResumeSessionOutput
 )
+from app.llm import AsyncLLMClient
+from app.http_client import PooledHTTPClient
+from app.cache import SingleFlight, StaleWhileRevalidateCache, build_cache, get_or_compute, make_cache_key
+from app.tasks import BackgroundJobStore
+from app.sessions import ResumeSession, ResumeSessionStore
+from app.streaming import IncrementalJSONObjectParser, format_sse
+from app.ranking import JobRankingEngine, top_k_indices
+from app.job_index import JobIndex, area_key
+from app.text_processing import AnalyzedDocument, analyze, clean_text
+from app.model_bundle import ModelBundleError, load_model_bundle, uses_computed_features
+from app.scoring import ScoringPool
+from app.metrics import ADZUNA_ERRORS, CONTENT_TYPE, LLM_ERRORS, REGISTRY, MetricsMiddleware, register_cache_metrics, stage
+from app.profiling import PROFILING_ADMIN_TOKEN, ProfilingMiddleware, profile_path, token_is_valid
 
 # --- GLOBAL VARIABLES for Model Artifacts ---
 # These will be loaded into memory on startup
 model_artifacts: Dict[str, Any] = {}
+# Long-lived outbound clients (connection pools) shared by every request
+service_clients: Dict[str, Any] = {}
 
 # --- FastAPI Lifespan Manager for Model Loading ---
 @asynccontextmanager
@@ -34,19 +54,40 @@ async def lifespan(app: FastAPI):
     # This code runs ONCE when the API server starts up.
     print("Server startup: Loading ML model artifacts...")
     try:
-        model_artifacts["ats_model"] = joblib.load('ats_model.joblib')
-        model_artifacts["tfidf_resume"] = joblib.load('tfidf_resume.joblib')
-        model_artifacts["tfidf_jd"] = joblib.load('tfidf_jd.joblib')
-        print("Successfully loaded all model artifacts.")
-    except FileNotFoundError as e:
-        print(f"CRITICAL ERROR: Could not find model artifact: {e}")
-        print("Ensure 'ats_model.joblib', 'tfidf_resume.joblib', and 'tfidf_jd.joblib' are in the 'backend/' directory.")
+        model_artifacts.update(load_model_bundle(MODEL_BUNDLE_PATH))
+    except ModelBundleError as e:
+        # Serving scores from a model that doesn't match its features would be silently wrong
+        print(f"CRITICAL ERROR: Refusing to start with model bundle '{MODEL_BUNDLE_PATH}': {e}")
+        raise
+    # Job ranking reuses a fitted vocabulary/IDF instead of fitting a vectorizer per search
+    model_artifacts["job_ranker"] = JobRankingEngine(model_artifacts[JOB_RANKING_VECTORIZER])
+    # Runtime-built: a precomputed TF-IDF matrix over every job we have fetched so far
+    if JOB_INDEX_ENABLED:
+        model_artifacts["job_index"] = JobIndex(
+            model_artifacts["job_ranker"], max_jobs=JOB_INDEX_MAX_JOBS, ttl_seconds=JOB_INDEX_TTL_SECONDS
+        )
+    print(f"Successfully loaded model bundle {model_artifacts['manifest']['bundle_id']}.")
+    if not uses_computed_features(model_artifacts["manifest"]):
+        print("The model predates computed keyword_score/experience_gap features; they are sent as constants until it is retrained.")
+
+    # Model scoring and job ranking run here, off the event loop; each pool worker loads its own copy of the bundle
+    scoring = ScoringPool(MODEL_BUNDLE_PATH, JOB_RANKING_VECTORIZER)
+    await scoring.start(model_artifacts)
+    service_clients["scoring"] = scoring
+    service_clients["http"] = PooledHTTPClient()
     
     yield # The server is now running
 
     # This code runs ONCE when the server shuts down.
     print("Server shutdown: Clearing model artifacts.")
     model_artifacts.clear()
+    llm_client.close()
+    if "scoring" in service_clients:
+        service_clients.pop("scoring").close()
+    if "http" in service_clients:
+        await service_clients.pop("http").aclose()
+    resume_parse_cache.close()
+    ats_analysis_cache.close()
 
 
 # --- Load environment variables from .env file ---
@@ -59,35 +100,87 @@ try:
 except KeyError:
     raise RuntimeError("GOOGLE_API_KEY not found. Please ensure it's in a .env file.")
 
+# All LLM helpers go through this client so a slow Gemini call never blocks the event loop.
+llm_client = AsyncLLMClient(llm)
+JSON_GENERATION_CONFIG = genai.types.GenerationConfig(response_mime_type="application/json")
+
 # --- Adzuna Configuration ---
 ADZUNA_APP_ID = os.environ.get("ADZUNA_APP_ID")
 ADZUNA_APP_KEY = os.environ.get("ADZUNA_APP_KEY")
 ADZUNA_COUNTRY = os.environ.get("ADZUNA_COUNTRY", "in")
-ADZUNA_ENDPOINT_TEMPLATE = "https://api.adzuna.com/v1/api/jobs/{country}/search/{page}"
-
-RESUME_STOPWORDS = {
-    "and", "the", "for", "with", "that", "this", "from", "your", "have", "has",
-    "experience", "skills", "years", "work", "team", "you", "are", "our", "job",
-    "role", "project", "projects", "company", "ability", "knowledge", "responsible"
-}
-
-ROLE_KEYWORDS = [
-    "software engineer",
-    "frontend developer",
-    "backend developer",
-    "full stack developer",
-    "data scientist",
-    "machine learning engineer",
-    "product manager",
-    "project manager",
-    "business analyst",
-    "marketing manager",
-    "ui ux designer",
-    "devops engineer",
-    "mobile developer",
-    "cloud architect",
-    "cyber security engineer",
-]
+ADZUNA_ENDPOINT_TEMPLATE = os.environ.get("ADZUNA_ENDPOINT_TEMPLATE", "https://api.adzuna.com/v1/api/jobs/{country}/search/{page}")
+ADZUNA_RESULTS_PER_PAGE = int(os.environ.get("ADZUNA_RESULTS_PER_PAGE", "50"))
+# Opt-in: fetch the fallback role's first page alongside the keyword query instead of after it comes back
+# empty, and top up short keyword results with it. Costs up to one extra provider call per search.
+ADZUNA_HEDGED_SEARCH = os.environ.get("ADZUNA_HEDGED_SEARCH", "false").lower() == "true"
+
+# Directory written by app.model_bundle (the training script produces one after every run)
+MODEL_BUNDLE_PATH = os.environ.get("MODEL_BUNDLE_PATH", "model_bundle")
+
+# Which fitted vectorizer supplies the job-ranking vocabulary: 'tfidf_resume' (5000 terms) or 'tfidf_jd'
+JOB_RANKING_VECTORIZER = os.environ.get("JOB_RANKING_VECTORIZER", "tfidf_resume")
+
+# Identical provider queries from many users share one outbound call
+adzuna_search_cache = StaleWhileRevalidateCache(
+    max_entries=int(os.environ.get("ADZUNA_CACHE_MAX_ENTRIES", "2048")),
+    fresh_seconds=float(os.environ.get("ADZUNA_CACHE_FRESH_SECONDS", "300")),
+    stale_seconds=float(os.environ.get("ADZUNA_CACHE_STALE_SECONDS", "1800")),
+    # A speculative query nobody waits for any more is aborted rather than finished into the cache
+    cancel_abandoned_loads=True,
+)
+
+# --- Local Job Index Configuration ---
+JOB_INDEX_ENABLED = os.environ.get("JOB_INDEX_ENABLED", "true").lower() == "true"
+JOB_INDEX_MAX_JOBS = int(os.environ.get("JOB_INDEX_MAX_JOBS", "50000"))
+# Postings the provider hasn't returned again within this window are dropped (they may have been withdrawn)
+JOB_INDEX_TTL_SECONDS = float(os.environ.get("JOB_INDEX_TTL_SECONDS", "86400"))
+# Index-served queries are re-fetched from the provider in the background at most this often
+job_index_refreshes = TTLCache(maxsize=4096, ttl=float(os.environ.get("JOB_INDEX_REFRESH_SECONDS", "600")))
+# The provider's match count per query, recorded at ingest, so index-served searches report the same total
+job_index_totals = TTLCache(maxsize=4096, ttl=JOB_INDEX_TTL_SECONDS)
+background_tasks: set = set()
+
+
+# --- Resume Parse Cache Configuration ---
+# The schema is serialized once; its hash versions the cache so a model change invalidates old entries.
+RESUME_SCHEMA_JSON = json.dumps(ResumeOutput.model_json_schema(), indent=2)
+RESUME_SCHEMA_VERSION = make_cache_key(RESUME_SCHEMA_JSON)[:16]
+ATS_ANALYSIS_SCHEMA_JSON = json.dumps(
+    {k: v for k, v in ATSAnalysisOutput.model_json_schema()['properties'].items() if k != 'match_score'}, indent=2
+)
+resume_parse_cache = build_cache(
+    backend=os.environ.get("RESUME_CACHE_BACKEND", "tiered"),
+    max_entries=int(os.environ.get("RESUME_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.environ.get("RESUME_CACHE_TTL_SECONDS", "86400")),
+    db_path=os.environ.get("RESUME_CACHE_DB_PATH", "resume_cache.sqlite3"),
+)
+resume_parse_flights = SingleFlight()
+
+# --- ATS Analysis Cache Configuration ---
+ats_analysis_cache = build_cache(
+    backend=os.environ.get("ATS_CACHE_BACKEND", "memory"),
+    max_entries=int(os.environ.get("ATS_CACHE_MAX_ENTRIES", "2048")),
+    ttl_seconds=float(os.environ.get("ATS_CACHE_TTL_SECONDS", "21600")),
+    db_path=os.environ.get("ATS_CACHE_DB_PATH", "ats_cache.sqlite3"),
+)
+ats_analysis_flights = SingleFlight()
+
+# Deferred LLM commentary for the score-only fast path
+ats_analysis_jobs = BackgroundJobStore(
+    max_jobs=int(os.environ.get("ATS_ANALYSIS_JOBS_MAX", "1024")),
+    ttl_seconds=float(os.environ.get("ATS_ANALYSIS_JOBS_TTL_SECONDS", "900")),
+)
+
+# --- Resume Session Configuration ---
+# Uploaded resumes and their derived artifacts, so clients refer to a resume by id after the first request
+resume_sessions = ResumeSessionStore(
+    max_sessions=int(os.environ.get("RESUME_SESSIONS_MAX", "4096")),
+    ttl_seconds=float(os.environ.get("RESUME_SESSION_TTL_SECONDS", "3600")),
+)
+
+# --- Batch ATS Limits ---
+ATS_BATCH_MAX_PAIRS = int(os.environ.get("ATS_BATCH_MAX_PAIRS", "5000"))
+ATS_BATCH_MAX_ANALYSES = int(os.environ.get("ATS_BATCH_MAX_ANALYSES", "50"))
 
 
 # --- FastAPI App Initialization with Lifespan ---
@@ -102,74 +195,115 @@ app = FastAPI(
 origins_str = os.environ.get("CORS_ORIGINS", "http://localhost:3000")
 origins = [origin.strip() for origin in origins_str.split(',')]
 app.add_middleware(CORSMiddleware, allow_origins=origins, allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+# Outside CORS, so request latency includes it and the whole streamed body. The profiling middleware,
+# when installed, is added after it and so wraps it.
+app.add_middleware(MetricsMiddleware)
+# Admin-only per-request profiling; not installed at all unless a token is configured
+if PROFILING_ADMIN_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
 
 
 # --- Helper Functions ---
 def extract_json_from_response(response_text: str) -> dict:
     """Finds and parses a JSON object from a string, ignoring markdown."""
-    match = re.search(r'```json\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-    if match:
-        json_str = match.group(1)
-    else:
-        start_index = response_text.find('{')
-        end_index = response_text.rfind('}') + 1
-        if start_index != -1 and end_index != 0:
-            json_str = response_text[start_index:end_index]
+    with stage("json_extract"):
+        match = re.search(r'```json\s*(\{.*?\})\s*```', response_text, re.DOTALL)
+        if match:
+            json_str = match.group(1)
         else:
-            raise ValueError("No valid JSON object found in the AI response.")
-    return json.loads(json_str)
-
-def clean_text(text: str) -> str:
-    """A simple function to clean text, must be IDENTICAL to the one in your ML scripts."""
-    if not isinstance(text, str):
-        return ""
-    text = re.sub(r'<[^>]+>', '', text)
-    text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
-    text = text.lower()
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+            start_index = response_text.find('{')
+            end_index = response_text.rfind('}') + 1
+            if start_index != -1 and end_index != 0:
+                json_str = response_text[start_index:end_index]
+            else:
+                LLM_ERRORS.inc(kind="invalid_json")
+                raise ValueError("No valid JSON object found in the AI response.")
+        try:
+            return json.loads(json_str)
+        except ValueError:
+            LLM_ERRORS.inc(kind="invalid_json")
+            raise
 
 # --- CUSTOM MODEL PREDICTION FUNCTION ---
-def predict_score_with_custom_model(resume_text: str, jd_text: str) -> int:
-    """Uses the loaded custom XGBoost model to predict a score."""
-    if not all(k in model_artifacts for k in ["ats_model", "tfidf_resume", "tfidf_jd"]):
+def scoring_pool() -> ScoringPool:
+    if "scoring" not in service_clients:
         raise HTTPException(status_code=503, detail="Model artifacts are not loaded. Server is not ready.")
+    return service_clients["scoring"]
 
-    cleaned_resume = clean_text(resume_text)
-    cleaned_jd = clean_text(jd_text)
-    resume_vector = model_artifacts["tfidf_resume"].transform([cleaned_resume])
-    jd_vector = model_artifacts["tfidf_jd"].transform([cleaned_jd])
-    
-    # Placeholder for re-calculating custom features on the fly
-    keyword_score = 50 
-    experience_gap = 0 
-    custom_features = np.array([[keyword_score, experience_gap]])
-    
-    X_pred = sp.hstack((resume_vector, jd_vector, custom_features), format='csr')
-    predicted_score = model_artifacts["ats_model"].predict(X_pred)[0]
-    return int(max(0, min(100, round(predicted_score))))
+
+async def predict_scores_batch(resume_texts: List[str], jd_texts: List[str], resume_vectors: Optional[sp.csr_matrix] = None) -> List[int]:
+    """Scores many (resume, JD) pairs on the scoring pool with one transform per vectorizer and a single model.predict call.
+
+    `resume_vectors`, one row per pair, skips the resume transform when the caller already has it.
+    """
+    pool = scoring_pool()
+    with stage("scoring"):
+        return await pool.predict(resume_texts, jd_texts, resume_vectors)
+
+
+async def predict_score_with_custom_model(resume_text: str, jd_text: str) -> int:
+    """Uses the loaded custom XGBoost model to predict a score."""
+    return (await predict_scores_batch([resume_text], [jd_text]))[0]
+
+
+async def predict_resume_scores(resume: ResumeSession, jd_texts: List[str]) -> List[int]:
+    """Scores one resume against many JDs, reusing the resume's TF-IDF vector kept on its session."""
+    if "tfidf_resume" not in model_artifacts:
+        raise HTTPException(status_code=503, detail="Model artifacts are not loaded. Server is not ready.")
+    with stage("tfidf_transform"):
+        resume_vector = await scoring_pool().run_local(
+            resume.derive, "tfidf_resume", lambda: model_artifacts["tfidf_resume"].transform([resume.cleaned_text])
+        )
+    rows = np.zeros(len(jd_texts), dtype=np.int64)
+    return await predict_scores_batch([resume.resume_text] * len(jd_texts), jd_texts, resume_vectors=resume_vector[rows])
+
+
+def resolve_resume(resume_text: Optional[str], resume_id: Optional[str]) -> ResumeSession:
+    """The stored session for `resume_id`, or a one-off session around `resume_text`."""
+    if resume_id:
+        resume = resume_sessions.get(resume_id)
+        if resume is None:
+            raise HTTPException(status_code=404, detail="Resume session not found or expired. Upload the resume again.")
+        return resume
+    if resume_text:
+        return ResumeSession(resume_text)
+    raise HTTPException(status_code=400, detail="Either 'resume_text' or 'resume_id' must be provided.")
+
+
+def resolve_analysis_context(job_description: Optional[str], career_level: Optional[str]) -> Tuple[str, str]:
+    """Returns (JD text for the custom model, context for the LLM) for an ATS request."""
+    if job_description:
+        return job_description, f"Job Description:\\n---\\n{job_description}\\n---"
+    if career_level:
+        return (
+            f"A typical job description for a {career_level} role requiring relevant skills and experience.",
+            f"Target Career Level: {career_level}",
+        )
+    raise HTTPException(status_code=400, detail="Either 'job_description' or 'career_level' must be provided.")
 
 
 # --- AI Parsing Functions ---
 
-def parse_resume_with_ai(resume_text: str) -> dict:
-    json_schema = ResumeOutput.model_json_schema()
-    prompt = f"""
+def build_resume_parse_prompt(resume_text: str) -> str:
+    return f"""
     You are an expert, highly meticulous resume parser...
-    JSON Schema: {json.dumps(json_schema, indent=2)}
+    JSON Schema: {RESUME_SCHEMA_JSON}
     Resume Text: --- {resume_text} ---
     """
+
+async def parse_resume_with_ai(resume_text: str) -> dict:
+    prompt = build_resume_parse_prompt(resume_text)
     try:
-        response = llm.generate_content(prompt, generation_config=genai.types.GenerationConfig(response_mime_type="application/json"))
-        return extract_json_from_response(response.text)
+        response_text = await llm_client.generate_text(prompt, generation_config=JSON_GENERATION_CONFIG)
+        return extract_json_from_response(response_text)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"An error occurred with the Gemini API or JSON parsing: {e}")
         raise HTTPException(status_code=500, detail="Error processing resume with AI model.")
 
-def generate_qualitative_analysis(resume_text: str, context: str, score: int) -> dict:
-    """Uses the LLM to generate the human-like text analysis, GROUNDED by the custom model's score."""
-    json_schema = ATSAnalysisOutput.model_json_schema()
-    prompt = f"""
+def build_qualitative_analysis_prompt(resume_text: str, context: str, score: int) -> str:
+    return f"""
     **Persona:** You are an AI Career Strategist Platform.
     
     **Task:**
@@ -187,7 +321,7 @@ def generate_qualitative_analysis(resume_text: str, context: str, score: int) ->
         c. **SELF-CORRECTION:** Before finalizing your response, you MUST review your generated `rewrite_suggestions`. If any object is missing the `suggested_improvement` field, you must add it. This is a non-negotiable rule.
 
     **JSON Schema (excluding match_score):**
-    {json.dumps({k: v for k, v in json_schema['properties'].items() if k != 'match_score'}, indent=2)}
+    {ATS_ANALYSIS_SCHEMA_JSON}
 
     **Resume Text:**
     ---
@@ -199,129 +333,214 @@ def generate_qualitative_analysis(resume_text: str, context: str, score: int) ->
     {context}
     ---
     """
+
+async def generate_qualitative_analysis(resume_text: str, context: str, score: int) -> dict:
+    """Uses the LLM to generate the human-like text analysis, GROUNDED by the custom model's score."""
+    prompt = build_qualitative_analysis_prompt(resume_text, context, score)
     try:
-        response = llm.generate_content(prompt, generation_config=genai.types.GenerationConfig(response_mime_type="application/json"))
-        return extract_json_from_response(response.text)
+        response_text = await llm_client.generate_text(prompt, generation_config=JSON_GENERATION_CONFIG)
+        return extract_json_from_response(response_text)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"An error occurred during qualitative analysis: {e}")
         raise HTTPException(status_code=500, detail="Error generating qualitative analysis with LLM.")
 
+def build_ats_analysis(score: int, qualitative_data: dict) -> ATSAnalysisOutput:
+    """Combines the custom model's score with the LLM's analysis; a `match_score` the LLM made up is dropped."""
+    try:
+        return ATSAnalysisOutput(**{**qualitative_data, "match_score": score})
+    except ValidationError as e:
+        print(f"The LLM returned an ATS analysis that does not match the schema: {e}")
+        raise HTTPException(status_code=500, detail="The AI returned an ATS analysis in an unexpected format.")
+
+def resume_parse_cache_key(resume: ResumeSession) -> str:
+    return make_cache_key(RESUME_SCHEMA_VERSION, resume.cleaned_text)
+
+def ats_analysis_cache_key(resume: ResumeSession, context: str, score: int) -> str:
+    return make_cache_key("ats", resume.cleaned_text, clean_text(context), str(score))
+
+async def generate_cached_qualitative_analysis(resume: ResumeSession, context: str, score: int) -> dict:
+    """Memoized generate_qualitative_analysis: identical (resume, context, score) triples share one LLM call."""
+    cache_key = ats_analysis_cache_key(resume, context, score)
+
+    async def analyze_and_validate() -> dict:
+        qualitative_data = await generate_qualitative_analysis(resume.resume_text, context, score)
+        qualitative_data.pop("match_score", None)
+        # Validated before caching so a malformed LLM payload is never replayed to later callers.
+        build_ats_analysis(score, qualitative_data)
+        return qualitative_data
+
+    return await get_or_compute(ats_analysis_cache, ats_analysis_flights, cache_key, analyze_and_validate)
+
+
+# --- Streaming Helpers ---
+
+async def stream_json_sections(prompt: str, finalize: Callable[[dict], Awaitable[dict]],
+                               exclude: Collection[str] = ()) -> AsyncIterator[str]:
+    """Streams an LLM JSON response as server-sent events.
+
+    Emits `progress` per chunk, `section` for each top-level field as soon as it is complete (except
+    the fields named in `exclude`), then `done` with the object returned by `finalize` (which
+    validates and caches it).
+    """
+    parser = IncrementalJSONObjectParser()
+    received: List[str] = []
+    received_chars = 0
+    try:
+        async for chunk in llm_client.stream_text(prompt, generation_config=JSON_GENERATION_CONFIG):
+            received.append(chunk)
+            received_chars += len(chunk)
+            yield format_sse("progress", {"received_chars": received_chars})
+            for name, value in parser.feed(chunk):
+                if name not in exclude:
+                    yield format_sse("section", {"name": name, "value": value})
+        yield format_sse("done", await finalize(extract_json_from_response("".join(received))))
+    except HTTPException as e:
+        yield format_sse("error", {"detail": e.detail})
+    except Exception as e:
+        print(f"An error occurred while streaming the AI response: {e}")
+        yield format_sse("error", {"detail": "Error processing the AI response."})
+
+async def replay_sections(data: dict) -> AsyncIterator[str]:
+    """Streams an already-known (cached) result using the same event sequence as a live generation."""
+    for name, value in data.items():
+        yield format_sse("section", {"name": name, "value": value})
+    yield format_sse("done", data)
+
+def event_stream_response(events: AsyncIterator[str]) -> StreamingResponse:
+    # X-Accel-Buffering stops reverse proxies from holding events back until the stream ends.
+    return StreamingResponse(events, media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 
 # --- Job Search Helper Functions ---
 
 def extract_keywords_from_resume(resume_text: str, top_k: int = 6) -> List[str]:
-    tokens = re.findall(r'\b[a-zA-Z]{3,}\b', resume_text.lower())
-    filtered = [token for token in tokens if token not in RESUME_STOPWORDS]
-    counts = Counter(filtered)
-    return [word for word, _ in counts.most_common(top_k)]
+    return analyze(resume_text).keywords(top_k)
 
 
 def infer_primary_role(resume_text: str) -> str:
-    lowered = resume_text.lower()
-    for role in ROLE_KEYWORDS:
-        if role in lowered:
-            return role
-    return "software engineer"
+    return analyze(resume_text).primary_role
 
 
 def infer_required_fields(description: str) -> List[str]:
-    description_lower = description.lower()
-    requirements = []
-    if any(keyword in description_lower for keyword in ["cover letter", "motivation letter"]):
-        requirements.append("cover_letter")
-    if any(keyword in description_lower for keyword in ["portfolio", "github", "dribbble", "behance"]):
-        requirements.append("portfolio_link")
-    if "salary expectation" in description_lower or "expected salary" in description_lower:
-        requirements.append("salary_expectation")
-    if any(keyword in description_lower for keyword in ["availability", "notice period"]):
-        requirements.append("availability")
-    return requirements
-
-
-def _adzuna_request(keywords: str, loc: Optional[str], filters: Optional[JobSearchFilters], limit: int) -> Tuple[List[JobPosting], int]:
-    if not ADZUNA_APP_ID or not ADZUNA_APP_KEY:
-        raise HTTPException(status_code=500, detail="Adzuna credentials are not configured.")
+    # Postings are analyzed once each, so they bypass the shared memo
+    return AnalyzedDocument(description).required_fields
+
+
+def _parse_adzuna_entry(entry: Dict[str, Any]) -> Tuple[JobPosting, Dict[str, Any]]:
+    """Converts one Adzuna result into a JobPosting plus the raw fields the job index filters on."""
+    job_id = str(entry.get("id") or entry.get("adref") or entry.get("redirect_url"))
+    company_data = entry.get("company") or {}
+    location_data = entry.get("location") or {}
+    salary_min = entry.get("salary_min")
+    salary_max = entry.get("salary_max")
+    salary_str = None
+    if salary_min and salary_max:
+        salary_str = f"{int(salary_min):,} - {int(salary_max):,}"
+    elif salary_min:
+        salary_str = f"From {int(salary_min):,}"
+    elif salary_max:
+        salary_str = f"Up to {int(salary_max):,}"
+
+    description = entry.get("description") or entry.get("title") or ""
+    job = JobPosting(
+        id=job_id,
+        title=entry.get("title", "Untitled Role"),
+        company=company_data.get("display_name", "Company Confidential"),
+        location=location_data.get("display_name"),
+        salary=salary_str,
+        description=description,
+        url=entry.get("redirect_url"),
+        source="Adzuna",
+        posted_at=entry.get("created"),
+        required_fields=infer_required_fields(description)
+    )
+    metadata = {
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "contract_types": [entry.get("contract_time"), entry.get("contract_type")],
+    }
+    return job, metadata
+
 
-    params = {
-        "app_id": ADZUNA_APP_ID,
-        "app_key": ADZUNA_APP_KEY,
-        "what": keywords,
-        "results_per_page": min(50, max(limit, 10)),
-        "content-type": "application/json"
+def _build_adzuna_params(keywords: str, loc: Optional[str], filters: Optional[JobSearchFilters], limit: int) -> Dict[str, Any]:
+    """Provider query parameters, normalized so equivalent searches produce identical parameter sets."""
+    params: Dict[str, Any] = {
+        "what": " ".join(keywords.lower().split()),
+        "results_per_page": min(ADZUNA_RESULTS_PER_PAGE, max(limit, 10)),
     }
 
-    if loc:
-        params["where"] = loc
+    if loc and loc.strip():
+        params["where"] = " ".join(loc.lower().split())
         if filters and filters.distance_km:
             params["distance"] = filters.distance_km
     if filters:
         if filters.employment_type:
-            params["contract"] = filters.employment_type
+            params["contract"] = filters.employment_type.lower()
         if filters.salary_min:
             params["salary_min"] = filters.salary_min
         if filters.salary_max:
             params["salary_max"] = filters.salary_max
+    return params
+
+
+def provider_query_key(params: Dict[str, Any]) -> str:
+    """Identifies a provider query independently of page and page size."""
+    query = {key: value for key, value in params.items() if key != "results_per_page"}
+    return make_cache_key(ADZUNA_COUNTRY, json.dumps(query, sort_keys=True))
 
-    endpoint = ADZUNA_ENDPOINT_TEMPLATE.format(country=ADZUNA_COUNTRY, page=1)
+
+async def _fetch_adzuna(params: Dict[str, Any], page: int = 1) -> Tuple[List[JobPosting], int]:
+    if "http" not in service_clients:
+        raise HTTPException(status_code=503, detail="HTTP client is not initialized. Server is not ready.")
+
+    endpoint = ADZUNA_ENDPOINT_TEMPLATE.format(country=ADZUNA_COUNTRY, page=page)
+    request_params = {"app_id": ADZUNA_APP_ID, "app_key": ADZUNA_APP_KEY, **params, "content-type": "application/json"}
     try:
-        response = requests.get(endpoint, params=params, timeout=15)
-        response.raise_for_status()
-    except requests.RequestException as exc:
+        with stage("adzuna_fetch"):
+            response = await service_clients["http"].get(endpoint, params=request_params)
+    except httpx.HTTPError as exc:
+        ADZUNA_ERRORS.inc(kind="status" if isinstance(exc, httpx.HTTPStatusError) else "transport")
         raise HTTPException(status_code=502, detail=f"Job search provider error: {exc}")
 
     payload = response.json()
     adzuna_results = payload.get("results", [])
 
-    jobs: List[JobPosting] = []
-    for entry in adzuna_results:
-        job_id = str(entry.get("id") or entry.get("adref") or entry.get("redirect_url"))
-        company_data = entry.get("company") or {}
-        location_data = entry.get("location") or {}
-        salary_min = entry.get("salary_min")
-        salary_max = entry.get("salary_max")
-        salary_str = None
-        if salary_min and salary_max:
-            salary_str = f"{int(salary_min):,} - {int(salary_max):,}"
-        elif salary_min:
-            salary_str = f"From {int(salary_min):,}"
-        elif salary_max:
-            salary_str = f"Up to {int(salary_max):,}"
-
-        description = entry.get("description") or entry.get("title") or ""
-        job = JobPosting(
-            id=job_id,
-            title=entry.get("title", "Untitled Role"),
-            company=company_data.get("display_name", "Company Confidential"),
-            location=location_data.get("display_name"),
-            salary=salary_str,
-            description=description,
-            url=entry.get("redirect_url"),
-            source="Adzuna",
-            posted_at=entry.get("created"),
-            required_fields=infer_required_fields(description)
-        )
-        jobs.append(job)
+    entries = [_parse_adzuna_entry(entry) for entry in adzuna_results]
+    jobs = [job for job, _ in entries]
+    total = payload.get("count", len(jobs))
+    # Every live result also feeds the local index, so later searches can be served from memory
+    if "job_index" in model_artifacts:
+        with stage("job_index_ingest"):
+            await scoring_pool().run_local(model_artifacts["job_index"].ingest, entries, area_key(params.get("where"), params.get("distance")))
+        job_index_totals[provider_query_key(params)] = total
+    return jobs, total
 
-    return jobs[:limit], payload.get("count", len(jobs))
 
+async def _adzuna_request(keywords: str, loc: Optional[str], filters: Optional[JobSearchFilters], limit: int, page: int = 1) -> Tuple[List[JobPosting], int]:
+    if not ADZUNA_APP_ID or not ADZUNA_APP_KEY:
+        raise HTTPException(status_code=500, detail="Adzuna credentials are not configured.")
 
-def fetch_jobs_from_adzuna(resume_text: str, filters: Optional[JobSearchFilters], limit: int) -> Tuple[List[JobPosting], int, JobSearchFilters]:
-    # Determine search keywords
-    fallback_role = infer_primary_role(resume_text)
-    derived_keywords = " ".join(extract_keywords_from_resume(resume_text, top_k=4)).strip()
-    target_keywords = (filters.keywords or derived_keywords or fallback_role).strip()
+    params = _build_adzuna_params(keywords, loc, filters, limit)
+    cache_key = make_cache_key(ADZUNA_COUNTRY, str(page), json.dumps(params, sort_keys=True))
+    jobs, total = await adzuna_search_cache.get(cache_key, lambda: _fetch_adzuna(params, page))
+    # Cached postings are shared between requests; callers get their own copies to score and mutate
+    return [job.model_copy() for job in jobs[:limit]], total
 
-    location = filters.location if filters else None
 
-    jobs, total = _adzuna_request(target_keywords, location, filters, limit)
+def resolve_search_keywords(document: AnalyzedDocument, filters: Optional[JobSearchFilters]) -> Tuple[str, str]:
+    """Returns (keywords to search for, fallback role) for an analyzed resume and optional user filters."""
+    fallback_role = document.primary_role
+    derived_keywords = " ".join(document.keywords(top_k=4)).strip()
+    target_keywords = ((filters.keywords if filters else None) or derived_keywords or fallback_role).strip()
+    return target_keywords, fallback_role
 
-    # If nothing returned and user didn't explicitly set keywords, try fallback role without distance filter
-    if not jobs and (not filters or not filters.keywords):
-        jobs, total = _adzuna_request(fallback_role, location, filters, limit)
-        target_keywords = fallback_role
 
-    filters_used = JobSearchFilters(
-        keywords=target_keywords or fallback_role,
+def build_filters_used(keywords: str, filters: Optional[JobSearchFilters]) -> JobSearchFilters:
+    location = filters.location if filters else None
+    return JobSearchFilters(
+        keywords=keywords,
         location=location,
         distance_km=filters.distance_km if filters and location else None,
         employment_type=filters.employment_type if filters else None,
@@ -329,26 +548,159 @@ def fetch_jobs_from_adzuna(resume_text: str, filters: Optional[JobSearchFilters]
         salary_max=filters.salary_max if filters else None,
     )
 
-    return jobs, total, filters_used
 
+def _merge_unique_jobs(job_lists: List[List[JobPosting]], limit: int) -> List[JobPosting]:
+    """Concatenates result lists in priority order, dropping repeated job ids, up to `limit` jobs."""
+    merged: Dict[str, JobPosting] = {}
+    for jobs in job_lists:
+        for job in jobs:
+            if len(merged) >= limit:
+                return list(merged.values())
+            merged.setdefault(job.id, job)
+    return list(merged.values())
+
+
+async def _adzuna_search(keywords: str, loc: Optional[str], filters: Optional[JobSearchFilters], limit: int,
+                         first_page: Optional[Awaitable[Tuple[List[JobPosting], int]]] = None) -> Tuple[List[JobPosting], int]:
+    """Fetches as many result pages as `limit` needs, all pages concurrently. `first_page` is an
+    already-started request for page 1."""
+    per_page = _build_adzuna_params(keywords, loc, filters, limit)["results_per_page"]
+    pages = await asyncio.gather(
+        first_page if first_page is not None else _adzuna_request(keywords, loc, filters, limit, page=1),
+        *(_adzuna_request(keywords, loc, filters, limit, page=page) for page in range(2, math.ceil(limit / per_page) + 1)),
+    )
+    return _merge_unique_jobs([jobs for jobs, _ in pages], limit), pages[0][1]
+
+
+async def fetch_jobs_from_adzuna(resume: ResumeSession, filters: Optional[JobSearchFilters], limit: int) -> Tuple[List[JobPosting], int, JobSearchFilters]:
+    # Determine search keywords
+    target_keywords, fallback_role = resolve_search_keywords(resume.document, filters)
+
+    location = filters.location if filters else None
+    use_fallback = (not filters or not filters.keywords) and fallback_role != target_keywords
+
+    if not ADZUNA_HEDGED_SEARCH or not use_fallback:
+        jobs, total = await _adzuna_search(target_keywords, location, filters, limit)
+        # If nothing returned and user didn't explicitly set keywords, try fallback role without distance filter
+        if not jobs and use_fallback:
+            jobs, total = await _adzuna_search(fallback_role, location, filters, limit)
+            target_keywords = fallback_role
+        return jobs, total, build_filters_used(target_keywords or fallback_role, filters)
+
+    # Hedged mode: the fallback role's first page is fetched alongside the keyword query; its other
+    # pages only once the keyword results turn out to be short
+    fallback_first = asyncio.ensure_future(_adzuna_request(fallback_role, location, filters, limit, page=1))
+    # An unused speculative failure is expected, not worth an "exception was never retrieved" warning
+    fallback_first.add_done_callback(lambda future: future.cancelled() or future.exception())
+    primary_error: Optional[HTTPException] = None
+    try:
+        try:
+            jobs, total = await _adzuna_search(target_keywords, location, filters, limit)
+        except HTTPException as exc:
+            # Keyword query failed; the fallback-role results can still answer the request
+            jobs, total, primary_error = [], 0, exc
+        if len(jobs) >= limit:
+            # Enough keyword matches: the speculative fallback query is no longer needed
+            return jobs, total, build_filters_used(target_keywords, filters)
+        try:
+            fallback_jobs, fallback_total = await _adzuna_search(fallback_role, location, filters, limit, first_page=fallback_first)
+        except HTTPException:
+            if primary_error is not None:
+                raise primary_error
+            return jobs, total, build_filters_used(target_keywords, filters)
+    finally:
+        # Aborts the provider call too, unless another search is waiting on the same page
+        fallback_first.cancel()
+
+    if not jobs:
+        return fallback_jobs, fallback_total, build_filters_used(fallback_role, filters)
+    # Keyword matches first, topped up with fallback-role jobs
+    return _merge_unique_jobs([jobs, fallback_jobs], limit), total, build_filters_used(target_keywords, filters)
+
+
+async def resume_ranking_vector(resume: ResumeSession) -> sp.csr_matrix:
+    """The resume's vector in the job-ranking vocabulary, computed once per session on the scoring pool."""
+    ranker: JobRankingEngine = model_artifacts["job_ranker"]
+    return await scoring_pool().run_local(resume.derive, "job_ranking", lambda: ranker.resume_vector(resume.resume_text))
+
+
+async def search_job_index(resume: ResumeSession, filters: Optional[JobSearchFilters], limit: int) -> Optional[Tuple[List[JobPosting], int, JobSearchFilters]]:
+    """Serves a search from the local job index, or returns None when it can't fill the page yet.
 
-def score_jobs_against_resume(resume_text: str, jobs: List[JobPosting]) -> List[JobPosting]:
+    The reported total is the provider's count for the query, as recorded when its results were
+    ingested; a query whose count isn't known (or has expired) goes to the provider. Location and
+    salary filters are applied as `IndexedJob.matches` describes.
+    """
+    if "job_index" not in model_artifacts:
+        return None
+    target_keywords, _ = resolve_search_keywords(resume.document, filters)
+    location = filters.location if filters else None
+    provider_total = job_index_totals.get(provider_query_key(_build_adzuna_params(target_keywords, location, filters, limit)))
+    if provider_total is None:
+        return None
+    with stage("job_index_search"):
+        resume_vector = await resume_ranking_vector(resume)
+        jobs, _ = await scoring_pool().run_local(
+            model_artifacts["job_index"].search,
+            resume.resume_text, target_keywords, location, filters, limit, resume_vector=resume_vector
+        )
+    if len(jobs) < limit:
+        return None
+    schedule_index_refresh(target_keywords, location, filters, limit)
+    return jobs, provider_total, build_filters_used(target_keywords, filters)
+
+
+def schedule_index_refresh(keywords: str, location: Optional[str], filters: Optional[JobSearchFilters], limit: int) -> None:
+    """Re-fetches an index-served query from the provider in the background, at most once per refresh window."""
+    refresh_key = make_cache_key(keywords.lower(), (location or "").lower(), filters.model_dump_json() if filters else "")
+    if refresh_key in job_index_refreshes:
+        return
+    job_index_refreshes[refresh_key] = True
+
+    async def refresh():
+        try:
+            await _adzuna_request(keywords, location, filters, limit)
+        except HTTPException as e:
+            print(f"Background job index refresh failed: {e.detail}")
+
+    task = asyncio.ensure_future(refresh())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+
+async def score_jobs_against_resume(resume: ResumeSession, jobs: List[JobPosting]) -> List[JobPosting]:
     if not jobs:
         return jobs
 
-    corpus = [resume_text] + [f"{job.title} {job.company} {job.description or ''}" for job in jobs]
-    try:
-        vectorizer = TfidfVectorizer(stop_words="english")
-        tfidf_matrix = vectorizer.fit_transform(corpus)
-        resume_vec = tfidf_matrix[0]
-        for idx, job in enumerate(jobs, start=1):
-            job_vec = tfidf_matrix[idx]
-            similarity = cosine_similarity(resume_vec, job_vec)[0][0]
+    if "scoring" in service_clients:
+        # Ranked on the scoring pool; the resume's vector comes from (and stays on) its session
+        with stage("job_ranking"):
+            similarities = await service_clients["scoring"].rank(
+                resume.resume_text, [JobRankingEngine.job_text(job) for job in jobs], resume_vector=await resume_ranking_vector(resume)
+            )
+        for job, similarity in zip(jobs, similarities):
             job.similarity_score = round(float(similarity), 3)
-    except ValueError:
-        for job in jobs:
-            job.similarity_score = 0.0
-    return jobs
+        return jobs
+
+    # Fallback when model artifacts are unavailable: fit a throwaway vectorizer on this search alone
+    with stage("job_ranking"):
+        corpus = [resume.resume_text] + [JobRankingEngine.job_text(job) for job in jobs]
+        try:
+            vectorizer = TfidfVectorizer(stop_words="english")
+            tfidf_matrix = vectorizer.fit_transform(corpus)
+            similarities = cosine_similarity(tfidf_matrix[1:], tfidf_matrix[0]).ravel()
+            for job, similarity in zip(jobs, similarities):
+                job.similarity_score = round(float(similarity), 3)
+        except ValueError:
+            for job in jobs:
+                job.similarity_score = 0.0
+        return jobs
+
+
+def select_top_jobs(jobs: List[JobPosting], limit: int) -> List[JobPosting]:
+    """The `limit` best-scoring jobs, best first."""
+    scores = np.array([job.similarity_score or 0 for job in jobs], dtype=float)
+    return [jobs[index] for index in top_k_indices(scores, limit)]
 
 
 # --- API Endpoints ---
@@ -356,56 +708,222 @@ def score_jobs_against_resume(resume_text: str, jobs: List[JobPosting]) -> List[
 def read_root():
     return {"message": "Welcome to the Next Hire API! 🚀"}
 
+@app.get("/api/v1/cache/stats")
+def cache_stats():
+    return {
+        "resume_parse": {**resume_parse_cache.stats(), **resume_parse_flights.stats()},
+        "ats_analysis": {**ats_analysis_cache.stats(), **ats_analysis_flights.stats()},
+        "adzuna_search": adzuna_search_cache.stats(),
+        "resume_sessions": resume_sessions.stats(),
+    }
+
+register_cache_metrics(cache_stats)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint: request and stage latency histograms, error counters, cache ratios."""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+@app.get("/api/v1/admin/profiles/{profile_id}", include_in_schema=False)
+def get_profile(profile_id: str, x_profile_token: Optional[str] = Header(default=None)):
+    """Downloads a stored request profile (see app/profiling.py); requires the profiling admin token."""
+    if not token_is_valid(x_profile_token):
+        raise HTTPException(status_code=403, detail="Invalid profiling token.")
+    path = profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return FileResponse(path, filename=os.path.basename(path))
+
+@app.post("/api/v1/resumes/sessions", response_model=ResumeSessionOutput)
+async def create_resume_session(resume_in: ResumeInput):
+    """Uploads a resume once; later requests send the returned `resume_id` instead of the full text."""
+    if not resume_in.resume_text:
+        raise HTTPException(status_code=400, detail="'resume_text' must be provided.")
+    resume = resume_sessions.create(resume_in.resume_text)
+    return ResumeSessionOutput(
+        resume_id=resume.resume_id,
+        expires_in_seconds=int(resume_sessions.ttl_seconds),
+        primary_role=resume.document.primary_role,
+        keywords=resume.document.keywords(),
+    )
+
+@app.delete("/api/v1/resumes/sessions/{resume_id}")
+async def delete_resume_session(resume_id: str):
+    if not resume_sessions.delete(resume_id):
+        raise HTTPException(status_code=404, detail="Resume session not found or expired.")
+    return {"resume_id": resume_id, "deleted": True}
+
 @app.post("/api/v1/resumes/parse", response_model=ResumeOutput)
 async def parse_resume(resume_in: ResumeInput):
-    """Receives raw resume text and returns a structured JSON analysis."""
-    parsed_data = parse_resume_with_ai(resume_in.resume_text)
-    return ResumeOutput(**parsed_data)
+    """Receives raw resume text (or a resume session id) and returns a structured JSON analysis."""
+    resume = resolve_resume(resume_in.resume_text, resume_in.resume_id)
+    if resume.parsed is not None:
+        return ResumeOutput(**resume.parsed)
+    # Identical resumes (after clean_text normalization) are served from cache without an LLM call.
+    cache_key = resume_parse_cache_key(resume)
+
+    async def parse_and_validate() -> dict:
+        parsed_data = await parse_resume_with_ai(resume.resume_text)
+        return ResumeOutput(**parsed_data).model_dump()
+
+    resume.parsed = await get_or_compute(resume_parse_cache, resume_parse_flights, cache_key, parse_and_validate)
+    return ResumeOutput(**resume.parsed)
+
+@app.post("/api/v1/resumes/parse/stream")
+async def parse_resume_stream(resume_in: ResumeInput):
+    """Server-sent-event version of /parse: each resume section is emitted as soon as it is parsed."""
+    resume = resolve_resume(resume_in.resume_text, resume_in.resume_id)
+    cache_key = resume_parse_cache_key(resume)
+    cached_data = resume.parsed or await resume_parse_cache.aget(cache_key)
+    if cached_data is not None:
+        resume.parsed = cached_data
+        return event_stream_response(replay_sections(cached_data))
+
+    async def finalize(parsed_data: dict) -> dict:
+        resume_data = ResumeOutput(**parsed_data).model_dump()
+        await resume_parse_cache.aset(cache_key, resume_data)
+        resume.parsed = resume_data
+        return resume_data
+
+    return event_stream_response(stream_json_sections(build_resume_parse_prompt(resume.resume_text), finalize))
 
 @app.post("/api/v1/resumes/analyze-ats", response_model=ATSAnalysisOutput)
 async def analyze_ats(ats_in: ATSAnalysisInput):
     """Receives resume and job context to perform a HYBRID ATS analysis."""
+    resume = resolve_resume(ats_in.resume_text, ats_in.resume_id)
+    jd_text_for_model, analysis_context = resolve_analysis_context(ats_in.job_description, ats_in.career_level)
     
-    jd_text_for_model = ""
-    analysis_context = ""
-    
-    if ats_in.job_description:
-        analysis_context = f"Job Description:\\n---\\n{ats_in.job_description}\\n---"
-        jd_text_for_model = ats_in.job_description
-    elif ats_in.career_level:
-        analysis_context = f"Target Career Level: {ats_in.career_level}"
-        jd_text_for_model = f"A typical job description for a {ats_in.career_level} role requiring relevant skills and experience."
-    else:
-        raise HTTPException(status_code=400, detail="Either 'job_description' or 'career_level' must be provided.")
+    predicted_score = (await predict_resume_scores(resume, [jd_text_for_model]))[0]
     
-    predicted_score = predict_score_with_custom_model(
-        resume_text=ats_in.resume_text,
-        jd_text=jd_text_for_model
-    )
-    
-    qualitative_data = generate_qualitative_analysis(
-        resume_text=ats_in.resume_text,
+    qualitative_data = await generate_cached_qualitative_analysis(
+        resume=resume,
         context=analysis_context,
         score=predicted_score
     )
     
-    final_response = {
-        "match_score": predicted_score,
-        **qualitative_data
-    }
-    
-    return ATSAnalysisOutput(**final_response)
+    return build_ats_analysis(predicted_score, qualitative_data)
+
+
+@app.post("/api/v1/resumes/analyze-ats/stream")
+async def analyze_ats_stream(ats_in: ATSAnalysisInput):
+    """Server-sent-event version of /analyze-ats: a `score` event first, then each analysis section as it is written."""
+    resume = resolve_resume(ats_in.resume_text, ats_in.resume_id)
+    jd_text_for_model, analysis_context = resolve_analysis_context(ats_in.job_description, ats_in.career_level)
+    predicted_score = (await predict_resume_scores(resume, [jd_text_for_model]))[0]
+    cache_key = ats_analysis_cache_key(resume, analysis_context, predicted_score)
+
+    async def finalize(qualitative_data: dict) -> dict:
+        qualitative_data.pop("match_score", None)
+        analysis = build_ats_analysis(predicted_score, qualitative_data)
+        await ats_analysis_cache.aset(cache_key, qualitative_data)
+        return analysis.model_dump()
+
+    async def events() -> AsyncIterator[str]:
+        yield format_sse("score", {"match_score": predicted_score})
+        cached_data = await ats_analysis_cache.aget(cache_key)
+        if cached_data is not None:
+            sections = replay_sections(build_ats_analysis(predicted_score, cached_data).model_dump())
+        else:
+            prompt = build_qualitative_analysis_prompt(resume.resume_text, analysis_context, predicted_score)
+            # The custom model's score (sent first) is the only one; a score the LLM made up isn't shown
+            sections = stream_json_sections(prompt, finalize, exclude=("match_score",))
+        async for event in sections:
+            yield event
+
+    return event_stream_response(events())
+
+
+@app.post("/api/v1/resumes/analyze-ats/score", response_model=ATSScoreOutput)
+async def analyze_ats_score(ats_in: ATSAnalysisInput):
+    """Returns the custom model's score immediately and generates the LLM commentary in the background."""
+    resume = resolve_resume(ats_in.resume_text, ats_in.resume_id)
+    jd_text_for_model, analysis_context = resolve_analysis_context(ats_in.job_description, ats_in.career_level)
+    predicted_score = (await predict_resume_scores(resume, [jd_text_for_model]))[0]
+
+    async def build_analysis() -> ATSAnalysisOutput:
+        qualitative_data = await generate_cached_qualitative_analysis(resume, analysis_context, predicted_score)
+        return build_ats_analysis(predicted_score, qualitative_data)
+
+    analysis_id = ats_analysis_jobs.submit(build_analysis)
+    return ATSScoreOutput(
+        match_score=predicted_score,
+        analysis_id=analysis_id,
+        analysis_status=ats_analysis_jobs.get(analysis_id)["status"]
+    )
+
+
+@app.get("/api/v1/resumes/analyze-ats/analysis/{analysis_id}", response_model=ATSAnalysisJobStatus)
+async def get_ats_analysis(analysis_id: str):
+    job = ats_analysis_jobs.get(analysis_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analysis not found or expired.")
+    return ATSAnalysisJobStatus(analysis_id=analysis_id, **job)
+
+
+def expand_batch_pairs(batch_in: ATSBatchInput, resume: Optional[ResumeSession]) -> List[ATSBatchPair]:
+    if batch_in.pairs:
+        return batch_in.pairs
+    if resume and batch_in.job_descriptions:
+        return [ATSBatchPair(resume_text=resume.resume_text, job_description=jd) for jd in batch_in.job_descriptions]
+    if batch_in.resume_texts and (batch_in.job_description or batch_in.career_level):
+        return [
+            ATSBatchPair(resume_text=text, job_description=batch_in.job_description, career_level=batch_in.career_level)
+            for text in batch_in.resume_texts
+        ]
+    raise HTTPException(
+        status_code=400,
+        detail="Provide 'pairs', 'resume_text'/'resume_id' with 'job_descriptions', or 'resume_texts' with 'job_description'/'career_level'."
+    )
+
+
+@app.post("/api/v1/resumes/analyze-ats/batch", response_model=ATSBatchOutput)
+async def analyze_ats_batch(batch_in: ATSBatchInput):
+    """Scores many resume/JD pairs with one vectorized model call and ranks them by match score."""
+    resume = resolve_resume(batch_in.resume_text, batch_in.resume_id) if batch_in.resume_text or batch_in.resume_id else None
+    pairs = expand_batch_pairs(batch_in, resume)
+    # One resume against many JDs goes through its session, so a stored resume is not re-vectorized
+    shared_resume = resume if not batch_in.pairs and batch_in.job_descriptions else None
+    if len(pairs) > ATS_BATCH_MAX_PAIRS:
+        raise HTTPException(status_code=400, detail=f"A batch may contain at most {ATS_BATCH_MAX_PAIRS} pairs.")
+    if batch_in.include_analysis and len(pairs) > ATS_BATCH_MAX_ANALYSES:
+        raise HTTPException(status_code=400, detail=f"LLM analysis is limited to {ATS_BATCH_MAX_ANALYSES} pairs per batch.")
+
+    contexts = [resolve_analysis_context(pair.job_description, pair.career_level) for pair in pairs]
+    if shared_resume:
+        scores = await predict_resume_scores(shared_resume, [jd_text for jd_text, _ in contexts])
+    else:
+        scores = await predict_scores_batch([pair.resume_text for pair in pairs], [jd_text for jd_text, _ in contexts])
+
+    analyses: List[Optional[ATSAnalysisOutput]] = [None] * len(pairs)
+    if batch_in.include_analysis:
+        qualitative = await asyncio.gather(*(
+            generate_cached_qualitative_analysis(shared_resume or ResumeSession(pair.resume_text), context, score)
+            for pair, (_, context), score in zip(pairs, contexts, scores)
+        ))
+        analyses = [build_ats_analysis(score, data) for score, data in zip(scores, qualitative)]
+
+    results = [
+        ATSBatchResult(index=index, match_score=score, analysis=analysis)
+        for index, (score, analysis) in enumerate(zip(scores, analyses))
+    ]
+    results.sort(key=lambda result: result.match_score, reverse=True)
+    return ATSBatchOutput(results=results)
 
 
 @app.post("/api/v1/jobs/search", response_model=JobSearchResponse)
 async def search_jobs(job_input: JobSearchInput):
-    jobs, total_results, filters_used = fetch_jobs_from_adzuna(
-        resume_text=job_input.resume_text,
-        filters=job_input.filters,
-        limit=job_input.limit
-    )
-    ranked_jobs = score_jobs_against_resume(job_input.resume_text, jobs)
-    ranked_jobs.sort(key=lambda job: job.similarity_score or 0, reverse=True)
+    resume = resolve_resume(job_input.resume_text, job_input.resume_id)
+    indexed = await search_job_index(resume, job_input.filters, job_input.limit)
+    if indexed is not None:
+        ranked_jobs, total_results, filters_used = indexed
+    else:
+        jobs, total_results, filters_used = await fetch_jobs_from_adzuna(
+            resume=resume,
+            filters=job_input.filters,
+            limit=job_input.limit
+        )
+        scored_jobs = await score_jobs_against_resume(resume, jobs)
+        ranked_jobs = select_top_jobs(scored_jobs, job_input.limit)
     return JobSearchResponse(
         jobs=ranked_jobs,
         total_results=total_results,
@@ -0,0 +1,40 @@
+# backend\tests\conftest.py
+import os
+import sys
+
+import pytest
+
+# Tests import the backend the way uvicorn does, with `backend/` on the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def main_module():
+    """The API module, importable offline: a placeholder Gemini key and in-memory caches."""
+    os.environ.setdefault("GOOGLE_API_KEY", "offline-tests")
+    os.environ.setdefault("RESUME_CACHE_BACKEND", "memory")
+    os.environ.setdefault("ATS_CACHE_BACKEND", "memory")
+    import main
+
+    return main
+
+
+@pytest.fixture
+def offline_api():
+    """Runs `scenario(client, main)` against the app started offline (fake Gemini, stub Adzuna)."""
+    import asyncio
+
+    import httpx
+
+    from benchmarks.harness import offline_app
+
+    def run(scenario, llm_latency: float = 0.0, adzuna_latency: float = 0.0):
+        async def wrapper():
+            async with offline_app(llm_latency, adzuna_latency) as main:
+                transport = httpx.ASGITransport(app=main.app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+                    return await scenario(client, main)
+
+        return asyncio.run(wrapper())
+
+    return run
@@ -0,0 +1,89 @@
+# backend\tests\test_ats_analysis.py
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.llm import AsyncLLMClient
+from benchmarks.fakes import FAKE_ATS_JSON, FakeGenerativeModel, FakeResponse, FakeStream
+
+
+class ScriptedModel(FakeGenerativeModel):
+    """Answers every prompt with `payload`."""
+
+    def __init__(self, payload: dict, latency: float = 0.05):
+        super().__init__(latency=latency)
+        self.payload = payload
+
+    async def _generate_content_async(self, prompt, generation_config=None, stream=False, **kwargs):
+        self.calls += 1
+        if stream:
+            return FakeStream(json.dumps(self.payload), self.latency)
+        await asyncio.sleep(self.latency)
+        return FakeResponse(json.dumps(self.payload))
+
+
+@pytest.fixture
+def fake_llm(main_module, monkeypatch):
+    def install(payload: dict) -> ScriptedModel:
+        model = ScriptedModel(payload)
+        monkeypatch.setattr(main_module, "llm_client", AsyncLLMClient(model))
+        return model
+
+    return install
+
+
+def test_concurrent_identical_analyses_share_one_llm_call(main_module, fake_llm):
+    model = fake_llm(FAKE_ATS_JSON)
+    resume = main_module.ResumeSession("Single-flight test resume: Python developer with FastAPI experience.")
+
+    async def scenario():
+        return await asyncio.gather(*(
+            main_module.generate_cached_qualitative_analysis(resume, "Senior Python developer", 71) for _ in range(10)
+        ))
+
+    results = asyncio.run(scenario())
+    assert model.calls == 1
+    assert all(result == results[0] for result in results)
+    # A later identical request is served from the cache
+    asyncio.run(main_module.generate_cached_qualitative_analysis(resume, "Senior Python developer", 71))
+    assert model.calls == 1
+
+
+def test_llm_match_score_is_ignored(main_module, fake_llm):
+    fake_llm({**FAKE_ATS_JSON, "match_score": 3})
+    resume = main_module.ResumeSession("Match-score test resume: data engineer, Spark and Airflow.")
+
+    data = asyncio.run(main_module.generate_cached_qualitative_analysis(resume, "Data engineer", 64))
+    assert "match_score" not in data
+    assert main_module.build_ats_analysis(64, data).match_score == 64
+
+
+def test_malformed_analysis_is_a_500(main_module, fake_llm):
+    fake_llm({"summary": "Missing every other field."})
+    resume = main_module.ResumeSession("Malformed test resume: QA engineer, Selenium.")
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(main_module.generate_cached_qualitative_analysis(resume, "QA engineer", 50))
+    assert error.value.status_code == 500
+
+
+def test_streamed_analysis_never_shows_the_llm_match_score(offline_api, monkeypatch):
+    async def scenario(client, main):
+        monkeypatch.setattr(main, "llm_client", AsyncLLMClient(ScriptedModel({"match_score": 3, **FAKE_ATS_JSON}, latency=0.01)))
+        response = await client.post("/api/v1/resumes/analyze-ats/stream", json={
+            "resume_text": "Stream test resume: site reliability engineer, Terraform and Prometheus.",
+            "job_description": "SRE with Kubernetes",
+        })
+        return [
+            (block.split("\n")[0].removeprefix("event: "), json.loads(block.split("\n")[1].removeprefix("data: ")))
+            for block in response.text.strip().split("\n\n")
+        ]
+
+    events = offline_api(scenario)
+    score = events[0]
+    assert score[0] == "score"
+    sections = [data["name"] for event, data in events if event == "section"]
+    assert "match_score" not in sections and "summary" in sections
+    assert events[-1][0] == "done" and events[-1][1]["match_score"] == score[1]["match_score"]
@@ -0,0 +1,65 @@
+# backend\tests\test_cache.py
+import asyncio
+
+import pytest
+
+from app.cache import CacheBackend, MemoryCache, SingleFlight, SQLiteCache, TieredCache
+
+
+def test_cache_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_sqlite_hit_touches_access_time_only_after_interval(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=10, ttl_seconds=60, touch_interval_seconds=3600)
+    cache.set("key", {"value": 1})
+    stored = cache._conn.execute("SELECT accessed_at FROM cache").fetchone()[0]
+    assert cache.get("key") == {"value": 1}
+    assert cache._conn.execute("SELECT accessed_at FROM cache").fetchone()[0] == stored
+
+    cache.touch_interval_seconds = 0
+    assert cache.get("key") == {"value": 1}
+    assert cache._conn.execute("SELECT accessed_at FROM cache").fetchone()[0] > stored
+    cache.close()
+
+
+def test_tiered_aget_promotes_disk_hits(tmp_path):
+    memory = MemoryCache(max_entries=10, ttl_seconds=60)
+    disk = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=10, ttl_seconds=60)
+    cache = TieredCache([memory, disk])
+    disk.set("key", ["on", "disk"])
+
+    assert asyncio.run(cache.aget("key")) == ["on", "disk"]
+    assert memory.get("key") == ["on", "disk"]
+    assert asyncio.run(cache.aget("missing")) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    cache.close()
+
+
+@pytest.mark.parametrize("cancel_when_abandoned", [False, True])
+def test_single_flight_cancels_abandoned_work_only_when_asked(cancel_when_abandoned):
+    async def scenario():
+        flights = SingleFlight(cancel_when_abandoned=cancel_when_abandoned)
+        started, finished = asyncio.Event(), []
+
+        async def compute():
+            started.set()
+            await asyncio.sleep(0.05)
+            finished.append(True)
+            return "value"
+
+        shared = [asyncio.ensure_future(flights.do("key", compute)) for _ in range(2)]
+        await started.wait()
+        shared[0].cancel()
+        assert await shared[1] == "value"  # one waiter leaving doesn't cancel work another still needs
+
+        alone = asyncio.ensure_future(flights.do("other", compute))
+        await asyncio.sleep(0.01)
+        alone.cancel()
+        await asyncio.sleep(0.1)
+        return len(finished), flights.stats()["in_flight"]
+
+    finished, in_flight = asyncio.run(scenario())
+    assert finished == (1 if cancel_when_abandoned else 2)
+    assert in_flight == 0
@@ -0,0 +1,50 @@
+# backend\tests\test_features.py
+import numpy as np
+import pytest
+
+from app.features import _SKILL_IDS, compute_custom_features, extract_skill_ids, extract_years_experience
+
+
+def skill_ids(*names: str):
+    return sorted({_SKILL_IDS[name] for name in names})
+
+
+@pytest.mark.parametrize("text", [
+    "Seeking a C level executive and a go-getter",
+    "Works well with the rest of the team",
+    "Joined in spring 2020; express delivery; head chef at a restaurant",
+    "Scored an R rating",
+])
+def test_everyday_words_are_not_skills(text):
+    assert extract_skill_ids(text) == []
+
+
+def test_ambiguous_skills_match_in_context():
+    text = "C/C++, Go programming, REST APIs, Spring MVC, Express.js, R programming and C#."
+    assert extract_skill_ids(text) == skill_ids("c/c++", "c++", "go programming", "rest apis", "spring mvc", "mvc",
+                                                "express.js", "r programming", "c#")
+
+
+def test_phrasings_of_one_skill_count_once():
+    assert extract_skill_ids("golang, go lang, go programming") == skill_ids("golang")
+    assert compute_custom_features(["restful and rest api services"], ["rest apis"])[0, 0] == 100
+
+
+def test_keyword_score_and_gap():
+    features = compute_custom_features(["Python and SQL developer, 6 years of experience"],
+                                       ["Need Python, SQL and Docker with 4+ years of experience"])
+    np.testing.assert_array_equal(features, [[66, 2]])
+
+
+@pytest.mark.parametrize("text, years", [
+    ("5+ years of professional experience in Python", 5),
+    ("Experience: 3-5 years", 3),
+    ("Exprience - 48 months", 4),
+    ("I have six years experience in data science", 6),
+    ("Age 25 years", 0),
+    ("Aged 30 years, 2 years of experience", 2),
+    ("Joined an over 10 years old company; 3 years of experience", 3),
+    ("Worked 4 years at Acme.", 0),
+])
+def test_years_are_read_only_from_experience_phrasing(text, years):
+    assert extract_years_experience(text) == years
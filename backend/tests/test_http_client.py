@@ -0,0 +1,39 @@
+# backend\tests\test_http_client.py
+import asyncio
+import time
+
+import httpx
+
+from app.http_client import PooledHTTPClient
+
+
+def make_client(handler, **kwargs) -> PooledHTTPClient:
+    client = PooledHTTPClient(**kwargs)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_retry_after_is_capped_and_host_slot_released_while_waiting():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "3600"})
+        return httpx.Response(200, json={"ok": True})
+
+    async def scenario():
+        client = make_client(handler, max_connections_per_host=1, max_retries=1, max_backoff=0.05)
+        started = time.perf_counter()
+        request = asyncio.ensure_future(client.get("http://provider.test/search"))
+        await asyncio.sleep(0.01)
+        slot_free_while_waiting = not client._host_semaphore("http://provider.test/").locked()
+        response = await request
+        await client.aclose()
+        return response, time.perf_counter() - started, slot_free_while_waiting
+
+    response, elapsed, slot_free_while_waiting = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert len(calls) == 2
+    assert elapsed < 1
+    assert slot_free_while_waiting
@@ -0,0 +1,71 @@
+# backend\tests\test_job_index.py
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app import job_index
+from app.job_index import JobIndex
+from app.models import JobPosting
+from app.ranking import JobRankingEngine
+
+ROLES = ["python developer", "java engineer", "data scientist", "devops engineer", "frontend developer"]
+
+
+def make_posting(number: int, role: str) -> JobPosting:
+    return JobPosting(
+        id=f"job-{number}", title=role.title(), company=f"Company {number % 7}",
+        description=f"{role} role number {number} working with python java sql cloud",
+        url=f"https://jobs.example.com/{number}",
+    )
+
+
+@pytest.fixture
+def ranker() -> JobRankingEngine:
+    vectorizer = TfidfVectorizer(stop_words="english").fit([f"{role} python java sql cloud kubernetes" for role in ROLES])
+    return JobRankingEngine(vectorizer)
+
+
+def expected_ranking(ranker, postings, resume, keywords):
+    matching = [p for p in postings if set(keywords.split()) <= job_index.tokenize(ranker.job_text(p))]
+    scores = ranker.similarities(resume, [ranker.job_text(p) for p in matching])
+    return sorted(((round(float(score), 3), p.id) for score, p in zip(scores, matching)), key=lambda item: -item[0])
+
+
+def test_search_over_many_blocks_matches_a_single_matrix(ranker):
+    index = JobIndex(ranker, max_jobs=1000, ttl_seconds=3600)
+    postings = [make_posting(n, ROLES[n % len(ROLES)]) for n in range(60)]
+    for start in range(0, 60, 5):  # 12 ingests: blocks are merged along the way
+        index.ingest([(p, {}) for p in postings[start:start + 5]])
+    # Re-ingesting replaces postings, leaving dead rows behind
+    index.ingest([(p, {}) for p in postings[:10]])
+
+    resume = "senior python developer with cloud experience"
+    jobs, total = index.search(resume, "developer", None, None, limit=100)
+    expected = expected_ranking(ranker, postings, resume, "developer")
+    assert total == len(expected)
+    assert sorted((job.similarity_score, job.id) for job in jobs) == sorted(expected)
+    # Blocks are merged as the index grows: block sizes stay roughly geometric
+    assert len(index._blocks) <= 6
+
+
+def test_eviction_keeps_the_newest_postings(ranker):
+    index = JobIndex(ranker, max_jobs=10, ttl_seconds=3600)
+    for start in range(0, 30, 5):
+        index.ingest([(make_posting(n, "python developer"), {}) for n in range(start, start + 5)])
+    jobs, total = index.search("python", "python", None, None, limit=50)
+    assert total == 10
+    assert {job.id for job in jobs} == {f"job-{n}" for n in range(20, 30)}
+
+
+def test_postings_expire_after_ttl(ranker, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(job_index.time, "time", lambda: clock[0])
+    index = JobIndex(ranker, max_jobs=100, ttl_seconds=60)
+    index.ingest([(make_posting(n, "python developer"), {}) for n in range(3)])
+    clock[0] += 45
+    index.ingest([(make_posting(n, "python developer"), {}) for n in range(2, 5)])  # job-2 seen again
+
+    clock[0] += 30  # jobs 0 and 1 were last seen 75 s ago
+    jobs, total = index.search("python", "python", None, None, limit=50)
+    assert total == 3
+    assert {job.id for job in jobs} == {"job-2", "job-3", "job-4"}
+    assert len(index) == 3
@@ -0,0 +1,108 @@
+# backend\tests\test_job_search.py
+import asyncio
+
+import pytest
+
+from benchmarks.harness import load_resumes
+
+
+def test_index_served_search_reports_the_provider_total(offline_api):
+    resume = load_resumes(1)[0]
+
+    async def scenario(client, main):
+        first = await client.post("/api/v1/jobs/search", json={"resume_text": resume, "limit": 10})
+        indexed = await main.search_job_index(main.ResumeSession(resume), None, 10)
+        second = await client.post("/api/v1/jobs/search", json={"resume_text": resume, "limit": 10})
+        return first.json(), indexed, second.json()
+
+    first, indexed, second = offline_api(scenario)
+    assert indexed is not None  # the second search is served from the local index
+    assert len(first["jobs"]) == len(second["jobs"]) == 10
+    # The stub reports ten pages of matches; the index holds only the one page fetched so far
+    assert first["total_results"] == indexed[1] == second["total_results"] == 100
+
+
+def test_limit_above_one_page_fetches_several_pages(offline_api):
+    resume = load_resumes(2)[1]
+
+    async def scenario(client, main):
+        assert main.ADZUNA_RESULTS_PER_PAGE == 50
+        response = await client.post("/api/v1/jobs/search", json={"resume_text": resume, "limit": 60})
+        return response.json()
+
+    result = offline_api(scenario)
+    jobs = result["jobs"]
+    assert len(jobs) == len({job["id"] for job in jobs}) == 60
+    # Stub ids end in the result's position across pages; page 2 starts at 50
+    assert max(int(job["id"].rsplit("-", 1)[1]) for job in jobs) >= 50
+    assert result["total_results"] == 500
+
+
+def test_apply_needs_no_resume_text(offline_api):
+    job = {"job_id": "job-1", "job_title": "Engineer", "company": "Acme", "apply_url": "https://example.com/apply/1"}
+
+    async def scenario(client, main):
+        single = await client.post("/api/v1/jobs/apply", json=job)
+        with_id = await client.post("/api/v1/jobs/apply-all", json={"resume_id": "abc", "jobs": [job, {**job, "job_id": "job-2"}]})
+        return single, with_id
+
+    single, with_id = offline_api(scenario)
+    assert single.status_code == 200 and single.json()["status"] == "submitted"
+    assert with_id.status_code == 200 and [r["job_id"] for r in with_id.json()] == ["job-1", "job-2"]
+
+
+@pytest.mark.parametrize("hedged", [False, True])
+def test_provider_calls_per_search(offline_api, monkeypatch, hedged):
+    resume = load_resumes(3)[2]
+
+    async def scenario(client, main):
+        calls = []
+        fetch = main._fetch_adzuna
+
+        async def counting_fetch(params, page=1):
+            calls.append((params["what"], page))
+            return await fetch(params, page)
+
+        monkeypatch.setattr(main, "_fetch_adzuna", counting_fetch)
+        monkeypatch.setattr(main, "ADZUNA_HEDGED_SEARCH", hedged)
+        monkeypatch.setattr(main, "adzuna_search_cache", main.StaleWhileRevalidateCache(100, 300, 0, cancel_abandoned_loads=True))
+        session = main.ResumeSession(resume)
+        keywords, fallback_role = main.resolve_search_keywords(session.document, None)
+        jobs, _, used = await main.fetch_jobs_from_adzuna(session, None, 60)
+        await asyncio.sleep(0.05)
+        return calls, keywords.lower(), fallback_role.lower(), jobs, used
+
+    calls, keywords, fallback_role, jobs, used = offline_api(scenario)
+    assert keywords != fallback_role
+    # The keyword query fills the page, so only its two pages are needed
+    assert len(jobs) == 60 and used.keywords.lower() == keywords
+    primary_calls = sorted(call for call in calls if call[0] == keywords)
+    assert primary_calls == [(keywords, 1), (keywords, 2)]
+    # Hedged searches speculatively start the fallback's first page, and no more
+    assert sorted(call for call in calls if call[0] != keywords) == ([(fallback_role, 1)] if hedged else [])
+
+
+def test_location_searches_use_only_postings_the_provider_returned_for_that_area(offline_api):
+    resume = load_resumes(6)[5]
+
+    async def scenario(client, main):
+        response = await client.post("/api/v1/jobs/search", json={
+            "resume_text": resume, "limit": 10, "filters": {"location": "Bengaluru", "distance_km": 50},
+        })
+        assert response.status_code == 200
+        session = main.ResumeSession(resume)
+        # The stub returns the same postings for every area; re-ingesting them (here for a smaller radius
+        # and nationwide) must add to the areas they were found in, not replace them
+        for filters in ({"location": "Bengaluru", "distance_km": 10}, {}):
+            await main.fetch_jobs_from_adzuna(session, main.JobSearchFilters(**filters) if filters else None, 10)
+        index = main.model_artifacts["job_index"]
+        return [
+            len(index.search(resume, main.resolve_search_keywords(session.document, None)[0], "Bengaluru",
+                             main.JobSearchFilters(location="Bengaluru", distance_km=radius), 10)[0])
+            for radius in (50, 10, 100)
+        ]
+
+    same_area, smaller_radius, never_searched = offline_api(scenario)
+    assert same_area == 10
+    assert smaller_radius == 10  # fetched for that radius above
+    assert never_searched == 0  # the index can't tell which postings lie within 100 km
@@ -0,0 +1,30 @@
+# backend\tests\test_metrics.py
+from app.metrics import STAGE_SECONDS
+from benchmarks.harness import load_resumes
+
+
+def _stage_counts():
+    return {
+        (dict(labels)["endpoint"], dict(labels)["stage"]): value
+        for name, labels, value in STAGE_SECONDS.samples() if name.endswith("_count")
+    }
+
+
+def test_pool_stages_are_labelled_with_the_requesting_endpoint(offline_api):
+    resume = load_resumes(4)[3]
+
+    async def scenario(client, main):
+        before = _stage_counts()
+        scored = await client.post("/api/v1/resumes/analyze-ats/score",
+                                   json={"resume_text": resume, "job_description": "Python developer with SQL"})
+        searched = await client.post("/api/v1/jobs/search", json={"resume_text": resume, "limit": 10})
+        assert scored.status_code == searched.status_code == 200
+        after = _stage_counts()
+        return {key: count - before.get(key, 0) for key, count in after.items() if count != before.get(key, 0)}
+
+    observed = offline_api(scenario)
+    assert observed[("/api/v1/resumes/analyze-ats/score", "model_predict")] >= 1
+    assert observed[("/api/v1/resumes/analyze-ats/score", "tfidf_transform")] >= 1
+    assert observed[("/api/v1/jobs/search", "job_ranking")] >= 1
+    assert observed[("/api/v1/jobs/search", "job_index_ingest")] >= 1
+    assert not [key for key in observed if key[0] == "scoring_worker"]
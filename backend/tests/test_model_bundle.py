@@ -0,0 +1,50 @@
+# backend\tests\test_model_bundle.py
+import os
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from app import scoring
+from app.model_bundle import BundledVectorizer, load_model_bundle, uses_computed_features
+
+ML_MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "ml_model")
+BUNDLE_DIR = os.path.join(os.path.dirname(__file__), "..", "model_bundle")
+TEXTS = [
+    "Senior Python developer: Django, FastAPI, PostgreSQL; 6 years of experience.",
+    "Data scientist — TensorFlow/PyTorch, NLP, A/B testing. Ünïcode naïve café",
+    "",
+    "the and of",  # stop words only
+    "zzzunknownterm qqqnotinvocab",
+]
+
+
+@pytest.mark.parametrize("name", ["tfidf_resume", "tfidf_jd"])
+def test_bundled_vectorizer_matches_pickled_vectorizer(name):
+    path = os.path.join(ML_MODEL_DIR, f"{name}.joblib")
+    if not os.path.exists(path):
+        pytest.skip(f"{name}.joblib has not been trained")
+    fitted = joblib.load(path)
+    bundled = BundledVectorizer(
+        np.array(fitted.get_feature_names_out(), dtype=str), np.asarray(fitted.idf_, dtype=np.float64),
+        fitted.token_pattern, ENGLISH_STOP_WORDS if fitted.stop_words == "english" else (),
+    )
+    expected = fitted.transform(TEXTS)
+    actual = bundled.transform(TEXTS)
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual.toarray(), expected.toarray(), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("computed", [False, True])
+def test_custom_features_are_computed_only_for_bundles_trained_on_them(monkeypatch, computed):
+    artifacts = load_model_bundle(BUNDLE_DIR)
+    assert not uses_computed_features(artifacts["manifest"])  # the shipped bundle predates them
+    if computed:
+        artifacts["manifest"]["feature_layout"]["custom_features_computed"] = True
+    calls = []
+    monkeypatch.setattr(scoring, "compute_custom_features",
+                        lambda resumes, jds: calls.append(len(resumes)) or np.zeros((len(resumes), 2)))
+    scores = scoring.predict_batch(artifacts, [(TEXTS[:2], [TEXTS[0], TEXTS[1]], None)])
+    assert len(scores) == 1 and len(scores[0]) == 2
+    assert calls == ([2] if computed else [])
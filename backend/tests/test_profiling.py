@@ -0,0 +1,34 @@
+# backend\tests\test_profiling.py
+import asyncio
+import pstats
+
+import httpx
+
+from app import profiling
+from app.profiling import ProfilingMiddleware
+from benchmarks.harness import load_resumes, offline_app
+
+
+def test_pstats_profile_includes_work_done_on_the_scoring_pool(main_module, monkeypatch, tmp_path):
+    # `main_module` imports the app before the token is set, so it doesn't install the middleware itself
+    monkeypatch.setattr(profiling, "PROFILING_ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(profiling, "PROFILE_OUTPUT_DIR", str(tmp_path))
+    resume = load_resumes(5)[4]
+
+    async def scenario():
+        async with offline_app(0.0, 0.0) as main:
+            assert main.scoring_pool().executor_kind == "thread"
+            transport = httpx.ASGITransport(app=ProfilingMiddleware(main.app))
+            async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+                return await client.post(
+                    "/api/v1/resumes/analyze-ats",
+                    json={"resume_text": resume, "job_description": "Data analyst with SQL and Tableau"},
+                    headers={"X-Profile": "pstats", "X-Profile-Token": "secret"},
+                )
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    path = profiling.profile_path(response.headers["x-profile-id"])
+    functions = {name for _, _, name in pstats.Stats(path).stats}
+    assert "predict_batch" in functions  # ran on a scoring pool thread
+    assert "analyze_and_validate" in functions  # ran on the event loop
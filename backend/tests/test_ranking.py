@@ -0,0 +1,27 @@
+# backend\tests\test_ranking.py
+import numpy as np
+import pytest
+
+from app.ranking import top_k_indices
+
+
+@pytest.mark.parametrize("k", [1, 3, 10, 50])
+def test_top_k_matches_a_full_stable_sort(k):
+    rng = np.random.default_rng(k)
+    scores = rng.integers(0, 5, size=40).astype(float)  # many ties
+    expected = np.argsort(-scores, kind="stable")[:k]
+    result = top_k_indices(scores, k)
+    assert len(result) == min(k, len(scores))
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_top_k_is_best_first():
+    scores = np.array([0.1, 0.9, 0.5, 0.7])
+    np.testing.assert_array_equal(top_k_indices(scores, 2), [1, 3])
+    np.testing.assert_array_equal(top_k_indices(scores, 10), [1, 3, 2, 0])
+
+
+def test_top_k_keeps_input_order_among_ties_at_the_cut():
+    scores = np.array([0.5, 0.2, 0.5, 0.9, 0.5, 0.5, 0.1, 0.5])
+    np.testing.assert_array_equal(top_k_indices(scores, 3), [3, 0, 2])
+    np.testing.assert_array_equal(top_k_indices(scores, 5), [3, 0, 2, 4, 5])
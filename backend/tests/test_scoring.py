@@ -0,0 +1,79 @@
+# backend\tests\test_scoring.py
+import asyncio
+import os
+import threading
+
+import pytest
+
+from app import scoring
+from app.model_bundle import load_model_bundle
+from app.scoring import ScoringPool
+
+BUNDLE_DIR = os.path.join(os.path.dirname(__file__), "..", "model_bundle")
+
+
+@pytest.mark.parametrize("preloaded", [False, True])
+def test_thread_workers_share_one_bundle(monkeypatch, preloaded):
+    local = load_model_bundle(BUNDLE_DIR) if preloaded else {}
+    loads = []
+    load = scoring.load_model_bundle
+    monkeypatch.setattr(scoring, "load_model_bundle", lambda path: loads.append(path) or load(path))
+
+    async def scenario():
+        pool = ScoringPool(BUNDLE_DIR, "tfidf_resume", executor="thread", workers=3)
+        await pool.start(local)
+        try:
+            barrier = threading.Barrier(3)
+
+            def worker_artifacts(artifacts):
+                barrier.wait(timeout=5)  # holds each thread until all three are busy
+                return id(artifacts["ats_model"])
+
+            models = await asyncio.gather(*(pool._run(worker_artifacts) for _ in range(3)))
+            return models, await pool.predict(["Python developer"], ["Python developer wanted"])
+        finally:
+            pool.close()
+
+    models, scores = asyncio.run(scenario())
+    assert len(loads) == (0 if preloaded else 1)
+    assert len(set(models)) == 1
+    if preloaded:
+        assert models[0] == id(local["ats_model"])
+    assert len(scores) == 1
+
+
+def test_a_failing_request_fails_only_its_own_caller_in_a_merged_batch(monkeypatch):
+    batches = []
+
+    def predict_batch(artifacts, requests):
+        batches.append(len(requests))
+        if any(texts == ["bad"] for texts, _, _ in requests):
+            raise ValueError("unscorable")
+        return [[len(texts[0])] for texts, _, _ in requests]
+
+    monkeypatch.setattr(scoring, "predict_batch", predict_batch)
+
+    async def scenario():
+        pool = ScoringPool(BUNDLE_DIR, "tfidf_resume", executor="inline", batch_window_ms=20)
+        await pool.start({})
+        return await asyncio.gather(
+            pool.predict(["good"], ["jd"]), pool.predict(["bad"], ["jd"]), pool.predict(["fine!"], ["jd"]),
+            return_exceptions=True,
+        )
+
+    good, bad, fine = asyncio.run(scenario())
+    assert good == [4] and fine == [5]
+    assert isinstance(bad, ValueError)
+    assert batches == [3, 1, 1, 1]
+
+
+def test_a_failing_batch_of_one_raises_to_its_caller(monkeypatch):
+    monkeypatch.setattr(scoring, "predict_batch", lambda artifacts, requests: 1 / 0)
+
+    async def scenario():
+        pool = ScoringPool(BUNDLE_DIR, "tfidf_resume", executor="inline")
+        await pool.start(load_model_bundle(BUNDLE_DIR))
+        return await pool.predict(["resume"], ["jd"])
+
+    with pytest.raises(ZeroDivisionError):
+        asyncio.run(scenario())
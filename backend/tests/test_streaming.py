@@ -0,0 +1,61 @@
+# backend\tests\test_streaming.py
+import json
+import random
+
+import pytest
+
+from app.streaming import IncrementalJSONObjectParser, format_sse
+
+DOCUMENT = {
+    "summary": 'Says "hi" with {braces}, [brackets], commas, and a \\ backslash.',
+    "strengths": ["one", "two, with comma", {"nested": "}{"}],
+    "score": 7,
+    "empty": {},
+}
+
+
+def feed_in_chunks(text: str, sizes) -> list:
+    parser = IncrementalJSONObjectParser()
+    members, start = [], 0
+    for size in sizes:
+        members.extend(parser.feed(text[start:start + size]))
+        start += size
+    members.extend(parser.feed(text[start:]))
+    return members
+
+
+def test_members_arrive_in_order_when_fed_whole():
+    text = "```json\n" + json.dumps(DOCUMENT) + "\n```"
+    assert feed_in_chunks(text, []) == list(DOCUMENT.items())
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_chunk_boundaries_give_the_same_members(seed):
+    text = json.dumps(DOCUMENT)
+    rng = random.Random(seed)
+    assert feed_in_chunks(text, [rng.randint(1, 5) for _ in range(len(text))]) == list(DOCUMENT.items())
+
+
+def test_escaped_quote_split_across_chunks():
+    text = '{"quote": "a \\"}, \\"b", "next": 1}'
+    split = text.index("\\") + 1  # chunk ends right after the backslash
+    assert feed_in_chunks(text, [split]) == [("quote", 'a "}, "b'), ("next", 1)]
+
+
+def test_member_is_reported_once_complete():
+    parser = IncrementalJSONObjectParser()
+    assert parser.feed('{"a": [1, 2') == []
+    assert parser.feed('], "b"') == [("a", [1, 2])]
+    assert parser.feed(': true}') == [("b", True)]
+    assert parser.finished
+    assert parser.feed(', "ignored": 1}') == []
+
+
+def test_invalid_member_raises_json_decode_error():
+    parser = IncrementalJSONObjectParser()
+    with pytest.raises(json.JSONDecodeError):
+        parser.feed('{"a": tru, "b": 1}')
+
+
+def test_format_sse():
+    assert format_sse("section", {"name": "a"}) == 'event: section\ndata: {"name": "a"}\n\n'
@@ -0,0 +1,34 @@
+# backend\tests\test_tasks.py
+import asyncio
+import gc
+
+from app.tasks import BackgroundJobStore
+
+
+def test_running_jobs_survive_store_eviction_and_collection():
+    async def scenario():
+        store = BackgroundJobStore(max_jobs=1, ttl_seconds=60)
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "slow result"
+
+        async def quick():
+            return "quick result"
+
+        slow_id = store.submit(slow)
+        quick_ids = [store.submit(quick) for _ in range(3)]  # would evict `slow` from a one-entry store
+        await asyncio.sleep(0)
+        gc.collect()
+        pending = store.get(slow_id)
+
+        release.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        return pending, store.get(slow_id), store.get(quick_ids[0])
+
+    pending, finished, evicted = asyncio.run(scenario())
+    assert pending["status"] == "pending"
+    assert finished == {"status": "complete", "result": "slow result", "error": None}
+    assert evicted is None  # only finished results are bounded
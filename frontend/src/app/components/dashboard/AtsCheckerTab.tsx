@@ -3,6 +3,7 @@
 
 import { useState } from 'react';
 import { Loader2, FileText, CheckCircle, XCircle, ThumbsUp, Lightbulb, Wand2 } from 'lucide-react';
+import { postWithResume } from '@/app/store/resumeStore';
 
 // --- Type Definitions ---
 // These now match the new, more advanced backend models
@@ -26,6 +27,23 @@ interface ATSAnalysisResult {
     rewrite_suggestions: RewriteSuggestion[];
 };
 
+// The fast path returns the model score first; the LLM commentary is polled by id
+interface ATSScoreResult {
+    match_score: number;
+    analysis_id: string;
+    analysis_status: 'pending' | 'complete' | 'failed';
+}
+
+interface ATSAnalysisJobStatus {
+    analysis_id: string;
+    status: 'pending' | 'complete' | 'failed';
+    result?: ATSAnalysisResult | null;
+    error?: string | null;
+}
+
+const ANALYSIS_POLL_INTERVAL_MS = 1000;
+const ANALYSIS_POLL_MAX_ATTEMPTS = 120;
+
 // Define the props that this component will accept
 interface AtsCheckerTabProps {
     rawResumeText: string | null;
@@ -36,36 +54,59 @@ const AtsCheckerTab: React.FC<AtsCheckerTabProps> = ({ rawResumeText }) => {
     const [atsInputType, setAtsInputType] = useState<'level' | 'description'>('level');
     const [jobDescription, setJobDescription] = useState('');
     const [atsResult, setAtsResult] = useState<ATSAnalysisResult | null>(null);
+    const [matchScore, setMatchScore] = useState<number | null>(null);
     const [isAnalyzing, setIsAnalyzing] = useState(false);
+    const [isScoring, setIsScoring] = useState(false);
+
+    // Polls the deferred LLM commentary until it completes, fails or we give up
+    const pollAnalysis = async (apiUrl: string, analysisId: string): Promise<ATSAnalysisResult> => {
+        for (let attempt = 0; attempt < ANALYSIS_POLL_MAX_ATTEMPTS; attempt++) {
+            const response = await fetch(`${apiUrl}/api/v1/resumes/analyze-ats/analysis/${analysisId}`);
+            if (!response.ok) {
+                const errorData = await response.json();
+                throw new Error(errorData.detail || 'Failed to get ATS analysis.');
+            }
+            const job: ATSAnalysisJobStatus = await response.json();
+            if (job.status === 'complete' && job.result) {
+                return job.result;
+            }
+            if (job.status === 'failed') {
+                throw new Error(job.error || 'Failed to get ATS analysis.');
+            }
+            await new Promise((resolve) => setTimeout(resolve, ANALYSIS_POLL_INTERVAL_MS));
+        }
+        throw new Error('The analysis is taking longer than expected. Please try again.');
+    };
 
     // Function to handle the API call to the backend for analysis
     const handleAnalysisRequest = async (payload: { job_description?: string; career_level?: string }) => {
         setIsAnalyzing(true);
+        setIsScoring(true);
         setAtsResult(null);
+        setMatchScore(null);
 
         const apiUrl = process.env.NEXT_PUBLIC_API_URL;
         if (!apiUrl || !rawResumeText) {
             alert("Configuration error or missing resume text.");
             setIsAnalyzing(false);
+            setIsScoring(false);
             return;
         }
 
         try {
-            const response = await fetch(`${apiUrl}/api/v1/resumes/analyze-ats`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    resume_text: rawResumeText,
-                    ...payload,
-                }),
-            });
+            const response = await postWithResume(apiUrl, '/api/v1/resumes/analyze-ats/score', payload);
 
             if (!response.ok) {
                 const errorData = await response.json();
                 throw new Error(errorData.detail || 'Failed to get ATS analysis.');
             }
 
-            const result = await response.json();
+            // Show the score right away, then fill in the AI commentary when it is ready
+            const scoreResult: ATSScoreResult = await response.json();
+            setMatchScore(scoreResult.match_score);
+            setIsScoring(false);
+
+            const result = await pollAnalysis(apiUrl, scoreResult.analysis_id);
             setAtsResult(result);
 
         } catch (error) {
@@ -73,6 +114,7 @@ const AtsCheckerTab: React.FC<AtsCheckerTabProps> = ({ rawResumeText }) => {
             alert(`Analysis failed: ${error instanceof Error ? error.message : String(error)}`);
         } finally {
             setIsAnalyzing(false);
+            setIsScoring(false);
         }
     };
 
@@ -90,10 +132,10 @@ const AtsCheckerTab: React.FC<AtsCheckerTabProps> = ({ rawResumeText }) => {
             
             {atsInputType === 'description' && (<div><p className="text-stone-500 mb-4">Paste a job description for a specific analysis.</p><textarea value={jobDescription} onChange={(e) => setJobDescription(e.target.value)} placeholder="Paste the full job description here..." className="w-full h-40 p-3 bg-gray-50 dark:bg-gray-700 border border-gray-300 dark:border-gray-600 rounded-lg focus:ring-2 focus:ring-primary focus:outline-none transition-colors" /><button onClick={() => handleAnalysisRequest({ job_description: jobDescription })} disabled={isAnalyzing || !jobDescription.trim()} className="mt-4 px-6 py-2 bg-primary text-white font-semibold rounded-lg hover:bg-primary/[0.9] transition-all duration-300 flex items-center justify-center disabled:opacity-50 disabled:cursor-not-allowed">Analyze</button></div>)}
             
-            {isAnalyzing && (<div className="flex flex-col items-center justify-center mt-8 text-center"><Loader2 className="h-8 w-8 animate-spin text-primary" /><p className="text-stone-500 mt-2">Our AI is analyzing your resume... this may take a moment.</p></div>)}
+            {isScoring && (<div className="flex flex-col items-center justify-center mt-8 text-center"><Loader2 className="h-8 w-8 animate-spin text-primary" /><p className="text-stone-500 mt-2">Our AI is analyzing your resume... this may take a moment.</p></div>)}
             
             {/* --- ENHANCED ATS RESULTS DISPLAY --- */}
-            {atsResult && (
+            {matchScore !== null && (
                 <div className="mt-8 border-t border-gray-200 dark:border-gray-700 pt-6">
                     <h3 className="text-2xl font-bold text-dark dark:text-light mb-6 text-center">Your Detailed ATS Report</h3>
                     
@@ -106,21 +148,26 @@ const AtsCheckerTab: React.FC<AtsCheckerTabProps> = ({ rawResumeText }) => {
                                         cx="60" cy="60" r="54" fill="none" strokeWidth="12"
                                         className="stroke-primary"
                                         strokeDasharray={2 * Math.PI * 54}
-                                        strokeDashoffset={2 * Math.PI * 54 * (1 - atsResult.match_score / 100)}
+                                        strokeDashoffset={2 * Math.PI * 54 * (1 - matchScore / 100)}
                                         style={{ transition: 'stroke-dashoffset 1s ease-out' }}
                                     />
                                 </svg>
                                 <div className="absolute inset-0 flex items-center justify-center">
-                                    <span className="text-4xl font-bold text-primary">{atsResult.match_score}<span className="text-2xl">%</span></span>
+                                    <span className="text-4xl font-bold text-primary">{matchScore}<span className="text-2xl">%</span></span>
                                 </div>
                             </div>
                         </div>
                         <div className="md:col-span-2 text-left">
                              <h4 className="text-lg font-semibold text-dark dark:text-light mb-2">AI Recruiter Summary</h4>
-                             <p className="text-stone-500 dark:text-stone-400 leading-relaxed">{atsResult.summary}</p>
+                             {atsResult ? (
+                                <p className="text-stone-500 dark:text-stone-400 leading-relaxed">{atsResult.summary}</p>
+                             ) : (
+                                <p className="text-stone-500 dark:text-stone-400 leading-relaxed flex items-center"><Loader2 className="h-4 w-4 animate-spin text-primary mr-2" />Writing your detailed report...</p>
+                             )}
                         </div>
                     </div>
 
+                    {atsResult && (<>
                     <div className="grid grid-cols-1 md:grid-cols-2 gap-6 mb-6">
                         <div className="bg-green-50 dark:bg-green-900/20 p-4 rounded-lg">
                             <h4 className="text-lg font-semibold text-green-800 dark:text-green-300 mb-3 flex items-center"><ThumbsUp className="mr-2"/>Key Strengths</h4>
@@ -172,6 +219,7 @@ const AtsCheckerTab: React.FC<AtsCheckerTabProps> = ({ rawResumeText }) => {
                             </div>
                         </div>
                     </div>
+                    </>)}
                 </div>
             )}
         </div>
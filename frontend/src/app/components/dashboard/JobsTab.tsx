@@ -20,7 +20,7 @@ import {
     Check,
     Sliders,
 } from 'lucide-react';
-import { useResumeStore, JobPosting, JobFilters } from '@/app/store/resumeStore';
+import { useResumeStore, JobPosting, JobFilters, postWithResume } from '@/app/store/resumeStore';
 
 interface JobSearchResponse {
     jobs: JobPosting[];
@@ -197,6 +197,7 @@ const SwipeOverlay = ({ jobs, isOpen, onClose, onApply, onBookmark, onDismiss }:
 const JobsTab = () => {
     const {
         rawResumeText,
+        resumeId,
         jobMatches,
         jobFilters,
         setJobMatches,
@@ -247,7 +248,6 @@ const JobsTab = () => {
         setJobFilters(mergedFilters);
 
         const payload = {
-            resume_text: rawResumeText,
             limit: 10,
             filters: {
                 keywords: mergedFilters.keywords?.trim() || undefined,
@@ -260,11 +260,7 @@ const JobsTab = () => {
         };
 
         try {
-            const response = await fetch(`${apiUrl}/api/v1/jobs/search`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(payload),
-            });
+            const response = await postWithResume(apiUrl, '/api/v1/jobs/search', payload);
 
             if (!response.ok) {
                 const errData = await response.json();
@@ -321,7 +317,8 @@ const JobsTab = () => {
                 job_title: activeJob.title,
                 company: activeJob.company,
                 apply_url: activeJob.url,
-                resume_text: rawResumeText,
+                // Applying doesn't read the resume; the session id (if any) just identifies it
+                resume_id: resumeId ?? undefined,
                 required_fields: activeJob.required_fields || [],
                 provided_fields: applicationFields,
             }),
@@ -368,7 +365,7 @@ const JobsTab = () => {
         setApplyAllSummary('Submitting applications...');
 
         const payload = {
-            resume_text: rawResumeText,
+            resume_id: resumeId ?? undefined,
             jobs: visibleJobs.map((job) => ({
                 job_id: job.id,
                 job_title: job.title,
@@ -79,6 +79,14 @@ export interface JobPosting {
     required_fields?: string[];
 }
 
+// Returned by POST /api/v1/resumes/sessions
+export interface ResumeSession {
+    resume_id: string;
+    expires_in_seconds: number;
+    primary_role: string;
+    keywords: string[];
+}
+
 export interface JobFilters {
     keywords?: string;
     location?: string;
@@ -92,8 +100,10 @@ export interface JobFilters {
 interface ResumeStoreState {
     resumeData: ResumeData | null;
     rawResumeText: string | null;
+    resumeId: string | null;
     setResumeData: (data: ResumeData) => void;
     setRawResumeText: (text: string) => void;
+    setResumeId: (id: string | null) => void;
     jobMatches: JobPosting[];
     jobFilters: JobFilters;
     bookmarkedJobIds: string[];
@@ -119,8 +129,11 @@ const defaultFilters: JobFilters = {
 export const useResumeStore = create<ResumeStoreState>((set, get) => ({
     resumeData: null,
     rawResumeText: null,
+    resumeId: null,
     setResumeData: (data) => set({ resumeData: data }),
-    setRawResumeText: (text) => set({ rawResumeText: text }),
+    // A new resume needs a new server-side session
+    setRawResumeText: (text) => set({ rawResumeText: text, resumeId: null }),
+    setResumeId: (id) => set({ resumeId: id }),
     jobMatches: [],
     jobFilters: defaultFilters,
     bookmarkedJobIds: [],
@@ -150,4 +163,60 @@ export const useResumeStore = create<ResumeStoreState>((set, get) => ({
             : [...state.dismissedJobIds, jobId],
     })),
     setSwipeOverlayOpen: (open) => set({ swipeOverlayOpen: open }),
-}));
\ No newline at end of file
+}));
+
+// --- Resume Session Helpers ---
+
+// Concurrent first requests share one upload instead of each creating a session
+let pendingSession: { text: string; promise: Promise<string> } | null = null;
+
+const createResumeSession = (apiUrl: string, resumeText: string): Promise<string> => {
+    if (pendingSession?.text === resumeText) {
+        return pendingSession.promise;
+    }
+    const promise = (async () => {
+        const response = await fetch(`${apiUrl}/api/v1/resumes/sessions`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ resume_text: resumeText }),
+        });
+        if (!response.ok) {
+            const errorData = await response.json();
+            throw new Error(errorData.detail || 'Failed to upload resume.');
+        }
+        const session: ResumeSession = await response.json();
+        // The resume may have been replaced while this upload was in flight; its id belongs to the old text
+        if (useResumeStore.getState().rawResumeText === resumeText) {
+            useResumeStore.getState().setResumeId(session.resume_id);
+        }
+        return session.resume_id;
+    })();
+    pendingSession = { text: resumeText, promise };
+    promise.finally(() => {
+        if (pendingSession?.promise === promise) {
+            pendingSession = null;
+        }
+    }).catch(() => undefined);
+    return promise;
+};
+
+// POSTs `body` plus the resume's session id. The resume text is uploaded only when there is no session yet,
+// or once more if the server has expired it (404), after which the request is retried.
+export const postWithResume = async (apiUrl: string, path: string, body: Record<string, unknown>): Promise<Response> => {
+    const { rawResumeText, resumeId } = useResumeStore.getState();
+    if (!rawResumeText) {
+        throw new Error('Missing resume text.');
+    }
+    const send = (id: string) => fetch(`${apiUrl}${path}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ ...body, resume_id: id }),
+    });
+
+    const response = await send(resumeId ?? await createResumeSession(apiUrl, rawResumeText));
+    if (response.status !== 404) {
+        return response;
+    }
+    useResumeStore.getState().setResumeId(null);
+    return send(await createResumeSession(apiUrl, rawResumeText));
+};
@@ -1,9 +1,17 @@
 import google.generativeai as genai
-import os
+import argparse
+import asyncio
 import json
+import os
+import random
+import sys
+import time
 import pandas as pd
 from dotenv import load_dotenv
-import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from app.llm import AsyncLLMClient
+from pipeline_io import BATCH_ROWS, PAIRS_FILENAME, ChunkWriter
 
 # --- Configuration ---
 load_dotenv()
@@ -13,13 +21,48 @@ try:
 except KeyError:
     raise RuntimeError("GOOGLE_API_KEY not found in .env file.")
 
-def generate_job_description(category: str) -> str:
-    """Generates a detailed job description for a given job category."""
-    print(f"Generating job description for category: '{category}'...")
-    
-    prompt = f"""
+MAX_CONCURRENCY = 8          # requests in flight at once
+REQUESTS_PER_MINUTE = 60     # sustained request rate allowed by the token bucket
+MAX_ATTEMPTS = 5             # tries per job description before giving up on it (until the next run)
+BACKOFF_BASE_SECONDS = 2.0
+CHECKPOINT_FILENAME = "jd_checkpoint.jsonl"
+
+# Each extra variant asks for a different kind of employer, so the variants differ in more than wording
+VARIANT_STYLES = [
+    "",
+    "Write it for a fast-growing startup.",
+    "Write it for a large multinational enterprise.",
+    "Write it for a mid-sized product company with a hybrid work model.",
+    "Write it for a consulting firm serving clients across several industries.",
+    "Write it for a government or public-sector organization.",
+]
+
+class TokenBucket:
+    """Rate limiter: allows bursts up to `capacity`, refilled at `rate` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+def build_prompt(category: str, variant: int) -> str:
+    style = VARIANT_STYLES[variant % len(VARIANT_STYLES)]
+    return f"""
     You are an expert Senior Technical Recruiter and Hiring Manager.
-    Your task is to write a single, detailed, and realistic job description for a "{category}" role.
+    Your task is to write a single, detailed, and realistic job description for a "{category}" role. {style}
 
     The job description should be comprehensive and include the following sections:
     - A brief company and role overview.
@@ -29,61 +72,104 @@ def generate_job_description(category: str) -> str:
 
     Return ONLY the job description text. Do not add any extra explanations or introductory phrases.
     """
-    
-    try:
-        response = model.generate_content(prompt)
-        return response.text.strip()
-    except Exception as e:
-        print(f"An error occurred while generating data for {category}: {e}")
-        return "Error generating job description."
+
+async def generate_job_description(client: AsyncLLMClient, bucket: TokenBucket, category: str, variant: int):
+    """Generates one job description variant, retrying with jittered exponential backoff. None on failure."""
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        await bucket.acquire()
+        try:
+            text = (await client.generate_text(build_prompt(category, variant))).strip()
+            if text:
+                print(f"Generated job description for category: '{category}' (variant {variant}).")
+                return text
+        except Exception as e:
+            print(f"Attempt {attempt} failed for {category} (variant {variant}): {e}")
+        if attempt < MAX_ATTEMPTS:
+            await asyncio.sleep(random.uniform(0, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1)))
+    return None
+
+def load_checkpoint(path: str) -> dict:
+    """(category, variant) -> job description for everything a previous run already generated."""
+    done = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line cut short when a previous run died
+                done[(record["category"], record["variant"])] = record["job_description"]
+    return done
+
+async def generate_all(categories, variants: int, checkpoint_path: str, concurrency: int, requests_per_minute: float) -> dict:
+    done = load_checkpoint(checkpoint_path)
+    pending = [(category, variant) for category in categories for variant in range(variants) if (category, variant) not in done]
+    print(f"{len(done)} job descriptions found in '{checkpoint_path}', {len(pending)} to generate.")
+
+    client = AsyncLLMClient(model, max_concurrency=concurrency)
+    bucket = TokenBucket(rate=requests_per_minute / 60, capacity=concurrency)
+
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+        async def run(category, variant):
+            text = await generate_job_description(client, bucket, category, variant)
+            if text is not None:
+                done[(category, variant)] = text
+                # Written as soon as it arrives, so an interrupted run keeps everything finished so far
+                checkpoint.write(json.dumps({"category": category, "variant": variant, "job_description": text}) + "\n")
+                checkpoint.flush()
+
+        try:
+            await asyncio.gather(*(run(category, variant) for category, variant in pending))
+        finally:
+            client.close()
+    return done
 
 def main():
     """Main function to generate JDs, merge them, and save the new dataset."""
-    
-    # --- 1. Load the Raw Resume Dataset ---
-    try:
-        raw_filename = "UpdatedResumeDataSet.csv" # Pre-configured for the second dataset
-        resume_col = "Resume"
-        category_col = "Category"
-        
-        df = pd.read_csv(raw_filename)
-        print(f"Successfully loaded '{raw_filename}' containing {len(df)} rows.")
-        
-    except FileNotFoundError:
+    parser = argparse.ArgumentParser(description="Generates job descriptions per resume category and pairs them with the resumes.")
+    parser.add_argument("--variants", type=int, default=1, help="job descriptions to generate per category")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY)
+    parser.add_argument("--requests-per-minute", type=float, default=REQUESTS_PER_MINUTE)
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILENAME)
+    args = parser.parse_args()
+
+    # --- 1. Find the Categories in the Raw Resume Dataset ---
+    raw_filename = "UpdatedResumeDataSet.csv" # Pre-configured for the second dataset
+    resume_col = "Resume"
+    category_col = "Category"
+
+    if not os.path.exists(raw_filename):
         print(f"Error: The file '{raw_filename}' was not found.")
         print("Please download the 'Resume Dataset', rename it to 'Resume.csv', and place it in this directory.")
         return
 
+    # Only the category column is needed up front; the resume text is streamed in step 3
+    unique_categories = pd.read_csv(raw_filename, usecols=[category_col])[category_col].unique()
+
     # --- 2. Generate Job Descriptions for Unique Categories ---
-    unique_categories = df[category_col].unique()
-    print(f"\nFound {len(unique_categories)} unique job categories. Generating descriptions...")
-    
-    jd_map = {}
-    for category in unique_categories:
-        jd_map[category] = generate_job_description(category)
-        # Add a small delay to avoid hitting API rate limits
-        time.sleep(1) 
-        
-    print("\nSuccessfully generated all job descriptions.")
-
-    # --- 3. Merge JDs into the main DataFrame ---
+    print(f"\nFound {len(unique_categories)} unique job categories. Generating {args.variants} description(s) each...")
+
+    jd_map = asyncio.run(generate_all(unique_categories, args.variants, args.checkpoint, args.concurrency, args.requests_per_minute))
+    missing = len(unique_categories) * args.variants - sum(1 for category, variant in jd_map if variant < args.variants)
+    if missing:
+        print(f"\n{missing} job descriptions could not be generated; rerun to retry them.")
+    else:
+        print("\nSuccessfully generated all job descriptions.")
+
+    # --- 3. Pair Resumes with JDs, One Chunk at a Time ---
+    # Every resume is paired with each variant of its category's job description
     print("Merging generated job descriptions with resumes...")
-    df['job_description'] = df[category_col].map(jd_map)
-    
-    # Clean up by removing any rows where JD generation failed
-    df = df[df['job_description'] != "Error generating job description"]
-    print(f"Dataset now contains {len(df)} rows with matched job descriptions.")
-
-    # --- 4. Save the New, Complete Dataset ---
-    output_df = df[[resume_col, 'job_description']]
-    # Rename columns to be consistent with our next script
-    output_df.rename(columns={resume_col: 'resume_text'}, inplace=True)
-
-    output_filename = "resumes_with_jd.csv"
-    output_df.to_csv(output_filename, index=False)
-    
+    jd_df = pd.DataFrame(
+        [(category, variant, text) for (category, variant), text in jd_map.items() if variant < args.variants],
+        columns=['category', 'variant', 'job_description'],
+    )
+    with ChunkWriter(PAIRS_FILENAME) as writer:
+        for chunk in pd.read_csv(raw_filename, usecols=[category_col, resume_col], chunksize=BATCH_ROWS):
+            chunk = chunk.rename(columns={resume_col: 'resume_text', category_col: 'category'})
+            writer.write(chunk.merge(jd_df, on='category', how='inner')[['resume_text', 'job_description', 'category', 'variant']])
+
     print(f"\nData generation and merging complete!")
-    print(f"New dataset with resumes and job descriptions saved to '{output_filename}'.")
+    print(f"Dataset with {writer.rows} resume/job description pairs saved to '{PAIRS_FILENAME}'.")
     print("\nYou can now proceed to the next step: using 'data_labeler.py' on this new file.")
 
 if __name__ == "__main__":
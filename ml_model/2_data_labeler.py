@@ -1,88 +1,111 @@
+import argparse
+import hashlib
+import os
+import sys
 import pandas as pd
-import re
-from sentence_transformers import SentenceTransformer, util
-import torch
+from cachetools import LRUCache
+from sentence_transformers import SentenceTransformer
 import numpy as np
 
 # --- Configuration ---
 # This is the name of the model we'll use to generate text embeddings.
 # It's a highly efficient model, perfect for this task.
 MODEL_NAME = 'all-MiniLM-L6-v2'
+ENCODE_BATCH_SIZE = 64
+EMBEDDING_CACHE_SIZE = 50000 # embeddings kept in memory, keyed by text hash
 
-# --- Helper function for cleaning text ---
-def clean_text(text):
-    """A simple function to clean text by removing special characters."""
-    if not isinstance(text, str):
-        return ""
-    text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
-    text = re.sub(r'[^a-zA-Z0-9\s]', '', text) # Remove special characters
-    text = text.lower() # Convert to lowercase
-    text = re.sub(r'\s+', ' ', text).strip() # Remove extra whitespace
-    return text
+# Text cleaning is shared with the backend so training and inference normalize text identically.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from app.text_processing import clean_text
+from pipeline_io import BATCH_ROWS, LABELS_FILENAME, PAIRS_FILENAME, ChunkWriter, iter_batches
+
+class EmbeddingCache:
+    """Encodes texts with the model, remembering embeddings by text hash so repeated texts are encoded once.
+
+    Keys are SHA-1 digests, so the cache holds 20 bytes per text instead of the text itself. Embeddings
+    are L2-normalized, which makes a dot product their cosine similarity.
+    """
+
+    def __init__(self, model, max_entries: int, batch_size: int):
+        self.model = model
+        self.batch_size = batch_size
+        self.embeddings = LRUCache(maxsize=max_entries)
+        self.encoded = 0
+
+    def encode(self, texts: list) -> np.ndarray:
+        keys = [hashlib.sha1(text.encode("utf-8")).digest() for text in texts]
+        vectors, missing = {}, {}
+        for key, text in zip(keys, texts):
+            if key in vectors or key in missing:
+                continue
+            cached = self.embeddings.get(key)
+            if cached is None:
+                missing[key] = text
+            else:
+                vectors[key] = cached
+        if missing:
+            encoded = self.model.encode(list(missing.values()), batch_size=self.batch_size,
+                                        convert_to_numpy=True, normalize_embeddings=True)
+            for key, vector in zip(missing, encoded):
+                vectors[key] = self.embeddings[key] = vector
+            self.encoded += len(missing)
+        return np.stack([vectors[key] for key in keys])
+
+def paired_cosine(resume_embeddings: np.ndarray, jd_embeddings: np.ndarray) -> np.ndarray:
+    """Cosine similarity of row i with row i only: O(N) instead of the full N x N matrix."""
+    return np.einsum("ij,ij->i", resume_embeddings, jd_embeddings)
 
 def main():
     """Main function to load, clean, and label the dataset."""
-    
-    # --- 1. Load the Raw Dataset ---
+    parser = argparse.ArgumentParser(description="Labels resume/JD pairs with a semantic-similarity match score.")
+    parser.add_argument("--chunk-rows", type=int, default=BATCH_ROWS)
+    parser.add_argument("--batch-size", type=int, default=ENCODE_BATCH_SIZE)
+    parser.add_argument("--cache-size", type=int, default=EMBEDDING_CACHE_SIZE)
+    args = parser.parse_args()
+
+    # --- 1. Open the Raw Dataset ---
     # This script is now configured to use the output of jd_generator.py
-    try:
-        raw_filename = "resumes_with_jd.csv" # <-- CONFIGURED for your new file
-        resume_col = "resume_text"
-        jd_col = "job_description"
-        
-        df = pd.read_csv(raw_filename)
-        print(f"Successfully loaded '{raw_filename}' containing {len(df)} rows.")
-        
-    except FileNotFoundError:
-        print(f"Error: The file '{raw_filename}' was not found.")
+    resume_col = "resume_text"
+    jd_col = "job_description"
+
+    if not os.path.exists(PAIRS_FILENAME):
+        print(f"Error: The file '{PAIRS_FILENAME}' was not found.")
         print("Please ensure you have successfully run 'jd_generator.py' first.")
         return
 
-    # --- 2. Clean and Prepare the Data ---
-    print("Cleaning and preparing text data...")
-    df.dropna(subset=[resume_col, jd_col], inplace=True)
-    df['cleaned_resume'] = df[resume_col].apply(clean_text)
-    df['cleaned_jd'] = df[jd_col].apply(clean_text)
-    
-    # Filter out any rows that became empty after cleaning
-    df = df[(df['cleaned_resume'] != "") & (df['cleaned_jd'] != "")]
-    print(f"Dataset reduced to {len(df)} rows after cleaning and removing empty entries.")
-
-    if len(df) == 0:
+    print(f"Loading the Sentence Transformer model ('{MODEL_NAME}'). This may take a moment...")
+    model = SentenceTransformer(MODEL_NAME)
+    cache = EmbeddingCache(model, max_entries=args.cache_size, batch_size=args.batch_size)
+
+    # --- 2. Clean, Embed and Label the Data, One Chunk at a Time ---
+    # Only the two text columns are read, a chunk at a time, and only the label column is written back
+    # (row-aligned with the pairs file), so memory stays bounded by the chunk size.
+    total_rows = labeled_rows = 0
+    with ChunkWriter(LABELS_FILENAME) as writer:
+        for df in iter_batches(PAIRS_FILENAME, [resume_col, jd_col], args.chunk_rows):
+            total_rows += len(df)
+            cleaned_resume = df[resume_col].map(clean_text)
+            cleaned_jd = df[jd_col].map(clean_text)
+
+            # Rows that are missing or became empty after cleaning get no label
+            keep = ((cleaned_resume != "") & (cleaned_jd != "")).to_numpy()
+            labels = pd.Series(pd.NA, index=range(len(df)), dtype="Int64")
+            if keep.any():
+                scores = paired_cosine(cache.encode(cleaned_resume[keep].tolist()), cache.encode(cleaned_jd[keep].tolist()))
+                # Scale the scores from [-1, 1] to [0, 100] to be our match_score label
+                labels[keep] = ((scores + 1) / 2 * 100).astype(int)
+                labeled_rows += int(keep.sum())
+            writer.write(pd.DataFrame({"match_score": labels}))
+            print(f"Labeled {labeled_rows} of {total_rows} rows read ({cache.encoded} unique texts encoded).")
+
+    if labeled_rows == 0:
         print("No valid data remains after cleaning. Exiting.")
         return
 
-    # --- 3. Label the Data using Semantic Similarity ---
-    print(f"Loading the Sentence Transformer model ('{MODEL_NAME}'). This may take a moment...")
-    model = SentenceTransformer(MODEL_NAME)
-    
-    print("Generating embeddings for resumes and job descriptions...")
-    # Convert text to embeddings (numerical vectors)
-    resume_embeddings = model.encode(df['cleaned_resume'].tolist(), convert_to_tensor=True, show_progress_bar=True)
-    jd_embeddings = model.encode(df['cleaned_jd'].tolist(), convert_to_tensor=True, show_progress_bar=True)
-    
-    print("Calculating cosine similarity scores...")
-    # Calculate cosine similarity between each pair of embeddings
-    cosine_scores = util.cos_sim(resume_embeddings, jd_embeddings)
-    
-    # The result is a matrix; we only need the diagonal (score for resume_i vs jd_i)
-    scores = np.diag(cosine_scores.cpu().numpy())
-    
-    # Scale the scores from [-1, 1] to [0, 100] to be our match_score label
-    df['match_score'] = ((scores + 1) / 2 * 100).astype(int)
-    
-    print("Similarity scoring complete.")
-
-    # --- 4. Save the Labeled Dataset ---
-    # We'll save the original text and the new score
-    output_df = df[[resume_col, jd_col, 'match_score']]
-    output_filename = "labeled_ats_data.csv"
-    output_df.to_csv(output_filename, index=False)
-    
     print(f"\nLabeling complete!")
-    print(f"Labeled dataset with {len(output_df)} rows saved to '{output_filename}'.")
+    print(f"Labels for {labeled_rows} of {total_rows} pairs saved to '{LABELS_FILENAME}'.")
     print("This file is now ready for Phase 2: Feature Engineering and Model Training.")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
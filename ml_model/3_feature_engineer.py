@@ -1,115 +1,126 @@
-import google.generativeai as genai
-import os
+import argparse
+import asyncio
+import hashlib
 import json
+import os
+import sys
+import time
 import pandas as pd
-import re
 from dotenv import load_dotenv
-import time
+
+# Features are computed by the same code the backend uses at inference time.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from app.features import compute_custom_features, extract_years_experience
+from pipeline_io import BATCH_ROWS, FEATURES_FILENAME, PAIRS_FILENAME, ChunkWriter, iter_batches
 
 # --- Configuration ---
 load_dotenv()
-try:
-    genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
-    model = genai.GenerativeModel('gemini-flash-latest')
-except KeyError:
-    raise RuntimeError("GOOGLE_API_KEY not found in .env file.")
-
-# --- Helper function to extract years of experience using AI ---
-def extract_years_experience(text: str) -> int:
-    """Uses the LLM to extract the total years of experience from a text snippet."""
-    prompt = f"""
-    Analyze the following text from a resume or job description. Your single task is to identify the total number of years of professional experience mentioned.
-    Return ONLY a single integer representing that number.
-
-    - If you see a range like "5-7 years", return the lower number (5).
-    - If you see "8+ years", return 8.
-    - If no specific number of years is mentioned (e.g., a student resume), return 0.
-
-    Text:
-    ---
-    {text}
-    ---
-
-    Years of Experience (return one integer only):
+LLM_BATCH_SIZE = 20       # texts per prompt in the optional LLM fallback
+LLM_MAX_CONCURRENCY = 4   # prompts in flight at once
+
+# --- Optional LLM fallback for years of experience ---
+def build_years_prompt(texts: list) -> str:
+    """One prompt covering a batch of texts, answered with a JSON list of integers."""
+    numbered = "\n\n".join(f"Text {i + 1}:\n---\n{text}\n---" for i, text in enumerate(texts))
+    return f"""
+    Analyze each of the following texts from resumes or job descriptions. For each one, identify the total number of years of professional experience mentioned.
+
+    - If you see a range like "5-7 years", use the lower number (5).
+    - If you see "8+ years", use 8.
+    - If no specific number of years is mentioned (e.g., a student resume), use 0.
+
+    Return ONLY a JSON list of {len(texts)} integers, one per text, in order.
+
+    {numbered}
     """
+
+async def llm_years_experience(texts: list, batch_size: int, max_concurrency: int) -> dict:
+    """Asks the LLM for the years of experience of each text, in batches with bounded concurrency."""
+    import google.generativeai as genai
+    from app.llm import AsyncLLMClient
+
     try:
-        response = model.generate_content(prompt)
-        # Clean the response to ensure it's just a number
-        cleaned_text = re.sub(r'\D', '', response.text)
-        if cleaned_text:
-            return int(cleaned_text)
-        return 0
-    except Exception:
+        genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
+    except KeyError:
+        raise RuntimeError("GOOGLE_API_KEY not found in .env file.")
+    client = AsyncLLMClient(genai.GenerativeModel('gemini-flash-latest'), max_concurrency=max_concurrency)
+    config = genai.types.GenerationConfig(response_mime_type="application/json")
+
+    async def run_batch(batch):
+        try:
+            values = json.loads(await client.generate_text(build_years_prompt(batch), config))
+            if len(values) == len(batch):
+                return [int(value) for value in values]
+        except Exception:
+            pass
         # If AI fails for any reason, default to 0
-        return 0
+        return [0] * len(batch)
 
-# --- Helper function to calculate keyword match score ---
-def calculate_keyword_score(resume_text: str, jd_text: str) -> int:
-    """Calculates a simple keyword match score."""
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
     try:
-        # Use AI to identify keywords first
-        jd_keywords_prompt = f"Extract the top 15 most important technical skills and keywords from this job description. Return them as a JSON list of strings. Job Description: {jd_text}"
-        jd_response = model.generate_content(jd_keywords_prompt, generation_config=genai.types.GenerationConfig(response_mime_type="application/json"))
-        required_keywords = set(json.loads(jd_response.text))
-
-        if not required_keywords:
-            return 50 # Default score if no keywords are found in JD
-
-        # Count how many required keywords are in the resume
-        found_keywords = sum(1 for keyword in required_keywords if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', resume_text.lower()))
-        
-        score = int((found_keywords / len(required_keywords)) * 100)
-        return score
-    except Exception:
-        return 50 # Default score on failure
+        results = await asyncio.gather(*(run_batch(batch) for batch in batches))
+    finally:
+        client.close()
+    return {text: value for batch, values in zip(batches, results) for text, value in zip(batch, values)}
+
+def apply_llm_fallback(df, features, known_years: dict, batch_size: int, max_concurrency: int):
+    """Re-derives experience_gap using LLM estimates for texts where no experience period was found.
+
+    `known_years` carries answers across chunks by text hash, so a JD shared by many chunks is asked
+    about once without keeping every text in memory.
+    """
+    years = {}
+    missing = []
+    for text in pd.unique(pd.concat([df['resume_text'], df['job_description']])):
+        key = hashlib.sha1(str(text).encode("utf-8")).digest()
+        if key not in known_years:
+            known_years[key] = extract_years_experience(text)
+            if known_years[key] == 0:
+                missing.append(text)
+        years[text] = known_years[key]
+    if missing:
+        print(f"Asking the LLM about {len(missing)} texts with no experience period found...")
+        for text, value in asyncio.run(llm_years_experience(missing, batch_size, max_concurrency)).items():
+            years[text] = known_years[hashlib.sha1(str(text).encode("utf-8")).digest()] = value
+    features['experience_gap'] = df['resume_text'].map(years).to_numpy() - df['job_description'].map(years).to_numpy()
 
 def main():
     """Main function to load data, engineer features, and save the new dataset."""
-    
-    # --- 1. Load the Labeled Dataset ---
-    try:
-        labeled_filename = "labeled_ats_data.csv"
-        df = pd.read_csv(labeled_filename)
-        df.dropna(inplace=True)
-        print(f"Successfully loaded '{labeled_filename}' containing {len(df)} rows.")
-        
-    except FileNotFoundError:
-        print(f"Error: The file '{labeled_filename}' was not found.")
-        print("Please ensure you have successfully run 'data_labeler.py' first.")
+    parser = argparse.ArgumentParser(description="Adds keyword_score and experience_gap features to the labeled dataset.")
+    parser.add_argument("--chunk-rows", type=int, default=BATCH_ROWS)
+    parser.add_argument("--llm-fallback", action="store_true",
+                        help="ask the LLM for years of experience where the regex finds none (slow, needs GOOGLE_API_KEY)")
+    parser.add_argument("--llm-batch-size", type=int, default=LLM_BATCH_SIZE)
+    parser.add_argument("--llm-concurrency", type=int, default=LLM_MAX_CONCURRENCY)
+    args = parser.parse_args()
+
+    # --- 1. Open the Paired Dataset ---
+    if not os.path.exists(PAIRS_FILENAME):
+        print(f"Error: The file '{PAIRS_FILENAME}' was not found.")
+        print("Please ensure you have successfully run 'jd_generator.py' first.")
         return
 
     # --- 2. Engineer New Features ---
-    print("\nStarting advanced feature engineering. This will take some time...")
-    
-    # Initialize new columns
-    df['keyword_score'] = 0
-    df['experience_gap'] = 0
-
-    for index, row in df.iterrows():
-        print(f"Processing row {index + 1}/{len(df)}...")
-        
-        # Feature 1: Keyword Matching Score
-        df.at[index, 'keyword_score'] = calculate_keyword_score(row['resume_text'], row['job_description'])
-        time.sleep(1) # Rate limit
-
-        # Feature 2: Experience Gap Analysis
-        jd_exp = extract_years_experience(row['job_description'])
-        time.sleep(1) # Rate limit
-        resume_exp = extract_years_experience(row['resume_text'])
-        time.sleep(1) # Rate limit
-        
-        df.at[index, 'experience_gap'] = resume_exp - jd_exp
+    # Streams the two text columns a chunk at a time and writes only the feature columns, row-aligned
+    # with the pairs file. Distinct resumes and JDs are analyzed once (see app.features.text_features).
+    print("\nStarting feature engineering...")
+    started = time.perf_counter()
+    known_years = {}
+    with ChunkWriter(FEATURES_FILENAME) as writer:
+        for df in iter_batches(PAIRS_FILENAME, ['resume_text', 'job_description'], args.chunk_rows):
+            values = compute_custom_features(df['resume_text'].tolist(), df['job_description'].tolist()).astype(int)
+            features = pd.DataFrame({'keyword_score': values[:, 0], 'experience_gap': values[:, 1]})
+            if args.llm_fallback:
+                apply_llm_fallback(df, features, known_years, args.llm_batch_size, args.llm_concurrency)
+            writer.write(features)
+    print(f"Computed features for {writer.rows} rows in {time.perf_counter() - started:.2f}s.")
+    if args.llm_fallback:
+        print("Note: LLM-filled values are not reproduced by the backend at inference time.")
 
     print("\nFeature engineering complete.")
-
-    # --- 3. Save the Feature-Rich Dataset ---
-    output_filename = "featured_ats_data.csv"
-    df.to_csv(output_filename, index=False)
-    
-    print(f"\nSuccessfully created new feature-rich dataset!")
-    print(f"Saved to '{output_filename}'.")
+    print(f"\nSuccessfully created the feature columns!")
+    print(f"Saved to '{FEATURES_FILENAME}'.")
     print("This file is now ready for the final model training step.")
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,133 @@
+"""Hyperparameter search for the ATS regressor (used by `train_model.py --search`).
+
+Candidate configurations are drawn at random and narrowed by successive halving: every survivor is
+cross-validated with a growing number of trees, and only the best 1/ETA of each round goes on to the
+next. Configurations are evaluated in parallel worker processes, all using XGBoost's `hist` tree method.
+
+The feature matrix is written once as raw CSR arrays and memory-mapped by every worker, so the
+processes share the same page-cache copy instead of each receiving a pickled matrix.
+
+Each finished configuration is also timed on a single-row predict (the backend's per-request shape)
+and its serialized size is recorded, so the leaderboard shows serving cost next to accuracy.
+"""
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import KFold
+from xgboost import XGBRegressor
+
+LEADERBOARD_FILENAME = "search_leaderboard.csv"
+SEARCH_CONFIGS = 27      # configurations sampled in the first round
+MIN_ROUNDS = 100         # trees per configuration in the first round
+ETA = 3                  # each round keeps 1/ETA of the configurations and gives them ETA times the trees
+CV_FOLDS = 3
+LATENCY_REPEATS = 50
+
+FIXED_PARAMS = {'objective': 'reg:squarederror', 'tree_method': 'hist', 'random_state': 42}
+
+# --- Shared feature matrix ---
+def share_matrix(X: sp.csr_matrix, directory: str):
+    """Writes the CSR arrays uncompressed so they can be memory-mapped."""
+    np.save(os.path.join(directory, "data.npy"), X.data)
+    np.save(os.path.join(directory, "indices.npy"), X.indices)
+    np.save(os.path.join(directory, "indptr.npy"), X.indptr)
+    with open(os.path.join(directory, "shape.json"), "w") as f:
+        json.dump(X.shape, f)
+
+def load_shared_matrix(directory: str) -> sp.csr_matrix:
+    arrays = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in ("data", "indices", "indptr")]
+    with open(os.path.join(directory, "shape.json")) as f:
+        shape = tuple(json.load(f))
+    return sp.csr_matrix(tuple(arrays), shape=shape, copy=False)
+
+# --- Worker process ---
+_worker = {}
+
+def _init_worker(directory: str, y: np.ndarray, folds: int, threads: int):
+    X = load_shared_matrix(directory)
+    splits = list(KFold(n_splits=folds, shuffle=True, random_state=42).split(y))
+    _worker.update(X=X, y=y, splits=splits, threads=threads)
+
+def _evaluate(params: dict, rounds: int) -> dict:
+    """Cross-validates one configuration with `rounds` trees; timing and size come from the last fold's model."""
+    X, y = _worker["X"], _worker["y"]
+    maes, rmses, r2s = [], [], []
+    for train_idx, val_idx in _worker["splits"]:
+        model = XGBRegressor(n_estimators=rounds, n_jobs=_worker["threads"], **FIXED_PARAMS, **params)
+        model.fit(X[train_idx], y[train_idx])
+        y_pred = model.predict(X[val_idx])
+        maes.append(mean_absolute_error(y[val_idx], y_pred))
+        rmses.append(np.sqrt(mean_squared_error(y[val_idx], y_pred)))
+        r2s.append(r2_score(y[val_idx], y_pred))
+
+    row = X[val_idx[:1]]
+    model.predict(row)  # warm-up
+    timings = []
+    for _ in range(LATENCY_REPEATS):
+        started = time.perf_counter()
+        model.predict(row)
+        timings.append(time.perf_counter() - started)
+    return {
+        'rounds': rounds,
+        'mae': float(np.mean(maes)),
+        'rmse': float(np.mean(rmses)),
+        'r2': float(np.mean(r2s)),
+        'model_bytes': len(model.get_booster().save_raw("ubj")),
+        'predict_ms': float(np.median(timings)) * 1000,
+    }
+
+# --- Search driver ---
+def sample_configs(count: int, seed: int) -> list:
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            'max_depth': int(rng.integers(3, 11)),
+            'learning_rate': float(np.exp(rng.uniform(np.log(0.01), np.log(0.3)))),
+            'subsample': float(rng.uniform(0.6, 1.0)),
+            'colsample_bytree': float(rng.uniform(0.4, 1.0)),
+            'min_child_weight': int(rng.choice([1, 2, 4, 8])),
+            'reg_lambda': float(np.exp(rng.uniform(np.log(0.1), np.log(10.0)))),
+        }
+        for _ in range(count)
+    ]
+
+def run_search(X: sp.csr_matrix, y: np.ndarray, max_rounds: int, configs: int = SEARCH_CONFIGS,
+               workers: int = None, folds: int = CV_FOLDS, seed: int = 42) -> pd.DataFrame:
+    """Successive-halving search; returns the leaderboard, best configuration first."""
+    workers = workers or os.cpu_count() or 1
+    # Splits the machine's cores between the workers rather than oversubscribing them
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    candidates = sample_configs(configs, seed)
+    results = {}
+    rounds = min(MIN_ROUNDS, max_rounds)
+
+    with tempfile.TemporaryDirectory() as directory:
+        share_matrix(sp.csr_matrix(X), directory)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(directory, y, folds, threads)) as pool:
+            survivors = list(range(len(candidates)))
+            while True:
+                print(f"Evaluating {len(survivors)} configurations with {rounds} trees ({folds}-fold CV)...")
+                started = time.perf_counter()
+                scores = pool.map(_evaluate, [candidates[i] for i in survivors], [rounds] * len(survivors))
+                for i, score in zip(survivors, scores):
+                    results[i] = score
+                print(f"  done in {time.perf_counter() - started:.1f}s; best RMSE this round "
+                      f"{min(results[i]['rmse'] for i in survivors):.3f}")
+                if len(survivors) <= 1 or rounds >= max_rounds:
+                    break
+                survivors = sorted(survivors, key=lambda i: results[i]['rmse'])[:max(1, len(survivors) // ETA)]
+                rounds = min(rounds * ETA, max_rounds)
+
+    leaderboard = pd.DataFrame([{**results[i], **candidates[i]} for i in results])
+    # Configurations that went further were judged on more trees, so they rank first
+    leaderboard = leaderboard.sort_values(['rounds', 'rmse'], ascending=[False, True]).reset_index(drop=True)
+    leaderboard.index.name = 'rank'
+    leaderboard.index += 1
+    return leaderboard
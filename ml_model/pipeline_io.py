@@ -0,0 +1,59 @@
+"""Chunked Parquet I/O shared by the ml_model pipeline stages.
+
+The resume/JD text is written once, by the JD generator, to `pairs.parquet`. Later stages read only the
+columns they need from it, in fixed-size batches, and write just their own new columns to a
+row-aligned file of their own:
+
+    pairs.parquet     resume_text, job_description, category, variant   (1_jd_generator.py)
+    labels.parquet    match_score, null where the pair was unusable      (2_data_labeler.py)
+    features.parquet  keyword_score, experience_gap                       (3_feature_engineer.py)
+
+Peak memory is set by the batch size, not the corpus size, and repeated JD text is stored once per
+Parquet page thanks to dictionary encoding.
+"""
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+PAIRS_FILENAME = "pairs.parquet"
+LABELS_FILENAME = "labels.parquet"
+FEATURES_FILENAME = "features.parquet"
+BATCH_ROWS = 2000
+
+def iter_batches(path: str, columns: list, batch_rows: int = BATCH_ROWS):
+    """Yields DataFrames of up to `batch_rows` rows holding only `columns`."""
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=batch_rows, columns=columns):
+        yield batch.to_pandas()
+
+def read_columns(path: str, columns: list) -> pd.DataFrame:
+    """Reads whole columns at once; meant for the narrow numeric ones."""
+    return pq.read_table(path, columns=columns).to_pandas()
+
+def row_count(path: str) -> int:
+    return pq.ParquetFile(path).metadata.num_rows
+
+class ChunkWriter:
+    """Appends DataFrame chunks to one Parquet file. The schema is taken from the first chunk written."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self._writer = None
+
+    def write(self, df: pd.DataFrame):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema, compression="zstd")
+        self._writer.write_table(table.cast(self._writer.schema))
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,4 +1,8 @@
-import pandas as pd
+import argparse
+import hashlib
+import json
+import os
+import sys
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.model_selection import train_test_split
 from xgboost import XGBRegressor
@@ -7,71 +11,220 @@ import joblib
 import scipy.sparse as sp
 import numpy as np
 
+# The serving bundle format is defined by the backend, which loads it
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from app.model_bundle import write_model_bundle
+from model_search import CV_FOLDS, LEADERBOARD_FILENAME, SEARCH_CONFIGS, run_search
+from pipeline_io import FEATURES_FILENAME, LABELS_FILENAME, PAIRS_FILENAME, iter_batches, read_columns, row_count
+
+# --- Configuration ---
+TFIDF_PARAMS = {'stop_words': 'english', 'max_features': 5000}
+MODEL_PARAMS = {
+    'objective': 'reg:squarederror',
+    'learning_rate': 0.05,
+    'max_depth': 6,
+    'subsample': 0.8,
+    'colsample_bytree': 0.8,
+    'random_state': 42,
+    'n_jobs': -1,
+}
+MAX_ROUNDS = 1000              # upper bound on trees; early stopping usually ends well before
+EARLY_STOPPING_ROUNDS = 50     # stop once validation RMSE hasn't improved for this many trees
+INCREMENTAL_ROUNDS = 200       # extra trees allowed when continuing from the existing model
+MIN_INCREMENTAL_ROWS = 50      # fewer new pairs can't be split into fit/validation/test sets worth boosting on
+FEATURE_CACHE_DIR = "feature_cache"
+TRAINED_ROWS_FILENAME = "trained_rows.npy"
+MODEL_BUNDLE_DIR = "model_bundle"   # what the backend serves from; copy it to backend/model_bundle
+
+def iter_texts(column: str, keep: np.ndarray):
+    """Yields the kept rows of one text column, reading the pairs file a chunk at a time."""
+    offset = 0
+    for df in iter_batches(PAIRS_FILENAME, [column]):
+        yield from df[column][keep[offset:offset + len(df)]]
+        offset += len(df)
+
+def row_keys(keep: np.ndarray) -> np.ndarray:
+    """A 64-bit fingerprint of each kept (resume, JD) pair, used to tell new rows from already-trained ones."""
+    keys = []
+    offset = 0
+    for df in iter_batches(PAIRS_FILENAME, ['resume_text', 'job_description']):
+        mask = keep[offset:offset + len(df)]
+        offset += len(df)
+        for resume, jd in zip(df['resume_text'][mask], df['job_description'][mask]):
+            keys.append(hashlib.sha1(f"{resume}\0{jd}".encode("utf-8")).digest()[:8])
+    return np.frombuffer(b"".join(keys), dtype=np.uint64)
+
+def input_fingerprint() -> str:
+    """Hash of the pipeline's data files and the vectorizer settings; names the feature cache entry."""
+    digest = hashlib.sha256(json.dumps(TFIDF_PARAMS, sort_keys=True).encode())
+    for path in (PAIRS_FILENAME, LABELS_FILENAME, FEATURES_FILENAME):
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:16]
+
+def build_feature_matrix(keep, features, tfidf_resume=None, tfidf_jd=None):
+    """TF-IDF + custom feature matrix for the kept rows. Fits new vectorizers unless fitted ones are given."""
+    if tfidf_resume is None:
+        tfidf_resume = TfidfVectorizer(**TFIDF_PARAMS)
+        tfidf_jd = TfidfVectorizer(**TFIDF_PARAMS)
+        # The vectorizers consume the text as it streams from disk, so no text column is ever held in full
+        resume_vectors = tfidf_resume.fit_transform(iter_texts('resume_text', keep))
+        jd_vectors = tfidf_jd.fit_transform(iter_texts('job_description', keep))
+    else:
+        resume_vectors = tfidf_resume.transform(iter_texts('resume_text', keep))
+        jd_vectors = tfidf_jd.transform(iter_texts('job_description', keep))
+
+    # Get our custom-engineered numerical features
+    custom_features = features[keep].values
+
+    # Combine the sparse TF-IDF matrices with our dense custom features
+    # This creates a powerful, hybrid feature matrix for the model to learn from
+    X = sp.hstack((resume_vectors, jd_vectors, custom_features), format='csr')
+    return X, tfidf_resume, tfidf_jd
+
+def load_or_build_features(keep, labels, features, cache_dir: str):
+    """Returns (X, y, vectorizers, row keys), reusing the cached matrices when the input data is unchanged."""
+    entry = os.path.join(cache_dir, input_fingerprint())
+    if os.path.exists(os.path.join(entry, "X.npz")):
+        print(f"Input data unchanged; loading cached feature matrices from '{entry}'.")
+        tfidf_resume, tfidf_jd = joblib.load(os.path.join(entry, "vectorizers.joblib"))
+        return (sp.load_npz(os.path.join(entry, "X.npz")), np.load(os.path.join(entry, "y.npy")),
+                tfidf_resume, tfidf_jd, np.load(os.path.join(entry, "row_keys.npy")))
+
+    X, tfidf_resume, tfidf_jd = build_feature_matrix(keep, features)
+    y = labels[keep].astype(int).to_numpy()
+    keys = row_keys(keep)
+    os.makedirs(entry, exist_ok=True)
+    joblib.dump((tfidf_resume, tfidf_jd), os.path.join(entry, "vectorizers.joblib"))
+    np.save(os.path.join(entry, "y.npy"), y)
+    np.save(os.path.join(entry, "row_keys.npy"), keys)
+    # Written last: its presence marks the entry as complete
+    sp.save_npz(os.path.join(entry, "X.npz"), X)
+    print(f"Cached feature matrices in '{entry}'.")
+    return X, y, tfidf_resume, tfidf_jd, keys
+
+def fit_with_early_stopping(X_train, y_train, keys_train, rounds: int, early_stopping_rounds: int, base_model=None):
+    """Boosts up to `rounds` trees, holding out 10% of the training rows to stop when RMSE stops improving.
+
+    Returns the model and the row keys it was fitted on (the held-out rows aren't among them)."""
+    X_fit, X_val, y_fit, y_val, keys_fit, _ = train_test_split(X_train, y_train, keys_train, test_size=0.1, random_state=42)
+    model = XGBRegressor(n_estimators=rounds, early_stopping_rounds=early_stopping_rounds, eval_metric='rmse', **MODEL_PARAMS)
+    booster = None
+    if base_model is not None:
+        booster = base_model.get_booster()
+        best_iteration = getattr(base_model, "best_iteration", None)
+        if best_iteration is not None:
+            # Trees after the previous best only hurt validation RMSE; continue from the best point
+            booster = booster[:best_iteration + 1]
+    model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], xgb_model=booster, verbose=False)
+    print(f"Kept {model.best_iteration + 1} trees (validation RMSE {model.best_score:.2f}).")
+    return model, keys_fit
+
 def main():
     """Main function to load featured data, train, evaluate, and save the final model."""
-    
-    # --- 1. Load the Feature-Rich Dataset ---
+    parser = argparse.ArgumentParser(description="Trains the ATS scoring model on the labeled, featured pairs.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="continue boosting the existing ats_model.joblib on pairs it hasn't been trained on")
+    parser.add_argument("--rounds", type=int, default=None,
+                        help=f"maximum trees to add (default {MAX_ROUNDS}, or {INCREMENTAL_ROUNDS} with --incremental)")
+    parser.add_argument("--early-stopping-rounds", type=int, default=EARLY_STOPPING_ROUNDS)
+    parser.add_argument("--cache-dir", default=FEATURE_CACHE_DIR)
+    parser.add_argument("--search", action="store_true",
+                        help=f"run a hyperparameter search on the training split and write '{LEADERBOARD_FILENAME}' instead of training")
+    parser.add_argument("--search-configs", type=int, default=SEARCH_CONFIGS)
+    parser.add_argument("--search-workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--cv-folds", type=int, default=CV_FOLDS)
+    args = parser.parse_args()
+    if args.search and args.incremental:
+        parser.error("--search and --incremental can't be combined")
+    rounds = args.rounds or (INCREMENTAL_ROUNDS if args.incremental else MAX_ROUNDS)
+
+    # --- 1. Load the Labels and Features ---
+    # Only the narrow numeric columns are loaded whole; the text is streamed in step 2.
     try:
-        featured_filename = "featured_ats_data.csv"
-        df = pd.read_csv(featured_filename)
-        df.dropna(subset=['resume_text', 'job_description', 'match_score'], inplace=True)
-        print(f"Successfully loaded '{featured_filename}' containing {len(df)} rows.")
-        
-    except FileNotFoundError:
-        print(f"Error: The file '{featured_filename}' was not found.")
-        print("Please ensure you have successfully run 'feature_engineer.py' first.")
+        labels = read_columns(LABELS_FILENAME, ['match_score'])['match_score']
+        features = read_columns(FEATURES_FILENAME, ['keyword_score', 'experience_gap'])
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        print("Please ensure you have successfully run 'data_labeler.py' and 'feature_engineer.py' first.")
         return
+    if not len(labels) == len(features) == row_count(PAIRS_FILENAME):
+        print(f"Error: '{LABELS_FILENAME}' and '{FEATURES_FILENAME}' don't match '{PAIRS_FILENAME}'; rerun the earlier steps.")
+        return
+    # Pairs without a label (missing or empty text) are left out
+    keep = labels.notna().to_numpy()
+    print(f"Successfully loaded {keep.sum()} labeled pairs.")
 
     # --- 2. Advanced Feature Engineering: Combining TF-IDF and Custom Features ---
     print("\nStarting final feature engineering...")
-    
-    # We still need to vectorize the text data
-    tfidf_resume = TfidfVectorizer(stop_words='english', max_features=5000)
-    tfidf_jd = TfidfVectorizer(stop_words='english', max_features=5000)
-
-    resume_vectors = tfidf_resume.fit_transform(df['resume_text'])
-    jd_vectors = tfidf_jd.fit_transform(df['job_description'])
-    
-    # Get our custom-engineered numerical features
-    custom_features = df[['keyword_score', 'experience_gap']].values
-    
-    # Combine the sparse TF-IDF matrices with our dense custom features
-    # This creates a powerful, hybrid feature matrix for the model to learn from
-    X = sp.hstack((resume_vectors, jd_vectors, custom_features), format='csr')
-    y = df['match_score']
-    
+    base_model = None
+    # Keys of pairs earlier runs fitted on; a full retrain starts the record over
+    previously_trained = np.array([], dtype=np.uint64)
+    if args.incremental:
+        # The existing model's columns are tied to its vectorizers' vocabularies, so those are reused as-is
+        try:
+            base_model = joblib.load('ats_model.joblib')
+            tfidf_resume = joblib.load('tfidf_resume.joblib')
+            tfidf_jd = joblib.load('tfidf_jd.joblib')
+            trained_rows = np.load(TRAINED_ROWS_FILENAME)
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            print("Incremental training needs the artifacts of a previous full run; run without --incremental first.")
+            return
+        keys = row_keys(keep)
+        is_new = ~np.isin(keys, trained_rows)
+        if not is_new.any():
+            print("No new labeled pairs since the last training run. Nothing to do.")
+            return
+        if is_new.sum() < MIN_INCREMENTAL_ROWS:
+            # Splitting a handful of rows three ways leaves empty (or single-row) sets to train and stop on
+            print(f"Only {is_new.sum()} new labeled pairs (fewer than {MIN_INCREMENTAL_ROWS}); "
+                  "retraining from scratch on all pairs instead.")
+            base_model = None
+            rounds = args.rounds or MAX_ROUNDS
+        else:
+            new_rows = keep.copy()
+            new_rows[keep] = is_new
+            X, _, _ = build_feature_matrix(new_rows, features, tfidf_resume, tfidf_jd)
+            y = labels[new_rows].astype(int).to_numpy()
+            X_keys = keys[is_new]
+            previously_trained = trained_rows
+            print(f"Continuing from the existing model with {len(y)} new pairs.")
+    if base_model is None:
+        X, y, tfidf_resume, tfidf_jd, X_keys = load_or_build_features(keep, labels, features, args.cache_dir)
+
     print("Feature engineering complete.")
     print(f"Final hybrid feature matrix shape: {X.shape}")
 
     # --- 3. Split Data for Training and Testing ---
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test, keys_train, _ = train_test_split(X, y, X_keys, test_size=0.2, random_state=42)
     print(f"Data split into {len(y_train)} training samples and {len(y_test)} testing samples.")
 
+    if args.search:
+        # The test split is left untouched so the chosen configuration can still be judged on it
+        print("\nSearching for the best hyperparameters...")
+        leaderboard = run_search(X_train, y_train, rounds, configs=args.search_configs,
+                                 workers=args.search_workers, folds=args.cv_folds)
+        leaderboard.to_csv(LEADERBOARD_FILENAME)
+        print(f"\n--- Top Configurations ({args.cv_folds}-fold CV) ---")
+        print(leaderboard.head(5).to_string(float_format=lambda value: f"{value:.3f}"))
+        print(f"\nFull leaderboard saved to '{LEADERBOARD_FILENAME}'.")
+        return
+
     # --- 4. Train the Final XGBoost Model ---
     print("\nTraining the final, advanced XGBoost Regressor model...")
-    
-    model = XGBRegressor(
-        objective='reg:squarederror',
-        n_estimators=1000,
-        learning_rate=0.05,
-        max_depth=6,
-        subsample=0.8,
-        colsample_bytree=0.8,
-        random_state=42,
-        n_jobs=-1
-    )
-    
-    model.fit(X_train, y_train)
+    model, fitted_keys = fit_with_early_stopping(X_train, y_train, keys_train, rounds, args.early_stopping_rounds, base_model)
     print("Model training complete.")
 
     # --- 5. Evaluate the Final Model ---
     print("\nEvaluating the final model on the test set...")
     y_pred = model.predict(X_test)
-    
+
     mae = mean_absolute_error(y_test, y_pred)
     rmse = np.sqrt(mean_squared_error(y_test, y_pred)) # Manual calculation for compatibility
     r2 = r2_score(y_test, y_pred)
-    
+
     print("\n--- Final Model Evaluation Metrics ---")
     print(f"Mean Absolute Error (MAE): {mae:.2f}")
     print(f"Root Mean Squared Error (RMSE): {rmse:.2f}")
@@ -81,14 +234,18 @@ def main():
 
     # --- 6. Save the Final Model and Vectorizers ---
     print("\nSaving the final trained model and vectorizers...")
-    
+
     joblib.dump(model, 'ats_model.joblib')
     joblib.dump(tfidf_resume, 'tfidf_resume.joblib')
     joblib.dump(tfidf_jd, 'tfidf_jd.joblib')
-    
+    # Remembers which pairs the model was fitted on, for the next --incremental run. The test and
+    # early-stopping rows aren't recorded, so a later incremental run can still train on them.
+    np.save(TRAINED_ROWS_FILENAME, np.union1d(previously_trained, fitted_keys))
+
     print("Successfully saved 'ats_model.joblib', 'tfidf_resume.joblib', and 'tfidf_jd.joblib'.")
+    manifest = write_model_bundle(MODEL_BUNDLE_DIR, model, tfidf_resume, tfidf_jd)
+    print(f"Wrote serving bundle {manifest['bundle_id']} to '{MODEL_BUNDLE_DIR}/' (copy it to 'backend/model_bundle/').")
     print("\nYour custom model is now complete and ready for integration into the live backend API.")
 
 if __name__ == "__main__":
     main()
-